@@ -0,0 +1,160 @@
+"""
+Benchmarks of the testbench harness itself.
+
+Each benchmark runs one canonical tester with a fixed RANDOM_SEED and a fixed testcase, through the regression runner but
+without its result cache and without the SPINAL_* variables of the caller environment, and reports the simulated cycles
+per wall second of its main clock (from the metrics written by simulationSpeedRecorder) and the peak RSS of the make
+process tree, which includes the simulator and the python testbench. The compiled toplevels are still shared through
+the simulator cache, so the compile time doesn't blur the measure.
+
+The measures are compared to baseline.json, which is machine specific and filled with --update-baseline. A benchmark
+fails when its cycles/second drops, or its peak RSS grows, by more than --tolerance.
+
+Usage (from tester/src/test/python) :
+    python -m benchmarks.Benchmark --update-baseline
+    python -m benchmarks.Benchmark StreamTester2
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+from spinal.common.Regression import Tester, Job, runJob, jobFailed, spinalPath
+from spinal.common.SimCache import SimCache
+
+benchmarksPath = os.path.dirname(os.path.realpath(__file__))
+
+RANDOM_SEED = "1500899963"
+
+
+class Benchmark:
+    def __init__(self, name, testerPath, clock = "clk", testcase = None, lang = "verilog"):
+        self.name = name
+        self.testerPath = testerPath
+        self.clock = clock
+        self.testcase = testcase
+        self.lang = lang
+
+    def createJob(self, workspace):
+        tester = Tester(self.name, os.path.join(spinalPath, self.testerPath), [self.lang])
+        job = Job(tester, self.lang, workspace)
+        job.env["RANDOM_SEED"] = RANDOM_SEED
+        # The soak, sweep, preload, profile, ... settings of the caller would change the measures
+        for key in os.environ:
+            if key.startswith("SPINAL_") and key not in job.env:
+                job.env[key] = None
+        if self.testcase:
+            job.env["TESTCASE"] = self.testcase
+        return job
+
+
+BENCHMARKS = [
+    Benchmark("StreamTester2", "StreamTester2"),
+    Benchmark("Axi4SharedOnChipRamTester", "Axi4SharedOnChipRamTester"),
+    Benchmark("AhbLite3CrossbarTester", "AhbLite3CrossbarTester"),
+    Benchmark("SdramCtrlTester", "SdramCtrlTester"),
+    Benchmark("RiscvTester", "RiscvTester/cached", testcase="testIsa_001"),
+]
+
+
+def clearMetrics(job):
+    for path in glob.glob(os.path.join(job.buildDir, "*.metrics.*")):
+        os.remove(path)
+
+
+def cyclesPerSecond(job, clock):
+    cycles = 0
+    wallTime = 0.0
+    for path in glob.glob(os.path.join(job.buildDir, "*.metrics.json")):
+        with open(path) as f:
+            domain = json.load(f)["domains"].get(clock)
+        if domain:
+            cycles += domain["cycles"]
+            wallTime += domain["wallTime"]
+    return round(cycles / wallTime, 1) if wallTime else None
+
+
+def runBenchmark(benchmark, workspace, timeout = None, simCache = None):
+    job = benchmark.createJob(workspace)
+    os.makedirs(job.buildDir, exist_ok=True)
+    clearMetrics(job)
+    runJob(job, timeout, None, simCache)
+    return {
+        "passed" : not jobFailed(job.suite),
+        "cyclesPerSecond" : cyclesPerSecond(job, benchmark.clock),
+        "maxRssKb" : job.maxRss,
+        "duration" : round(job.duration, 1),
+        "logFile" : job.logFile
+    }
+
+
+def compare(measure, baseline, tolerance):
+    """Return the list of the regressions of a measure against its baseline."""
+    regressions = []
+    if not measure["passed"]:
+        regressions.append("tester failed (log : %s)" % measure["logFile"])
+    if not baseline:
+        return regressions
+    if measure["cyclesPerSecond"] is None:
+        regressions.append("no cycles/second recorded")
+    elif measure["cyclesPerSecond"] < baseline["cyclesPerSecond"] * (1 - tolerance):
+        regressions.append("cycles/second %.1f < baseline %.1f" % (measure["cyclesPerSecond"], baseline["cyclesPerSecond"]))
+    if measure["maxRssKb"] > baseline["maxRssKb"] * (1 + tolerance):
+        regressions.append("peak RSS %d KB > baseline %d KB" % (measure["maxRssKb"], baseline["maxRssKb"]))
+    return regressions
+
+
+def loadBaseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the testbench harness")
+    parser.add_argument("filters", nargs="*", help="only run the benchmarks whose name contains one of these strings")
+    parser.add_argument("--workspace", default=os.path.join(os.getcwd(), "benchmarkWorkspace"), help="root of the per benchmark SIM_BUILD directories")
+    parser.add_argument("--baseline", default=os.path.join(benchmarksPath, "baseline.json"), help="baseline measures")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression of each measure")
+    parser.add_argument("--update-baseline", action="store_true", help="store the measures as the new baseline")
+    parser.add_argument("--timeout", type=float, default=None, help="kill a benchmark after this many seconds")
+    parser.add_argument("--no-sim-cache", action="store_true", help="always compile the toplevels")
+    return parser.parse_args(argv)
+
+
+def main(argv = None):
+    args = parseArgs(argv)
+    workspace = os.path.abspath(args.workspace)
+    simCache = None if args.no_sim_cache else SimCache(os.path.join(workspace, "simCache"), 1 << 30)
+    baseline = loadBaseline(args.baseline)
+    benchmarks = [b for b in BENCHMARKS if not args.filters or any(f in b.name for f in args.filters)]
+
+    failed = []
+    # Serial runs, so that the benchmarks don't compete for the CPU
+    for benchmark in benchmarks:
+        measure = runBenchmark(benchmark, workspace, args.timeout, simCache)
+        # A new baseline is only checked for the tester passing
+        regressions = compare(measure, None if args.update_baseline else baseline.get(benchmark.name), args.tolerance)
+        status = "FAIL" if regressions else ("PASS" if benchmark.name in baseline else "NEW ")
+        cycles = measure["cyclesPerSecond"]
+        print("[%s] %-30s %12s cycles/s %10d KB %7.1fs" % (status, benchmark.name, "-" if cycles is None else "%.1f" % cycles, measure["maxRssKb"], measure["duration"]))
+        for regression in regressions:
+            print("    " + regression)
+        sys.stdout.flush()
+        if regressions:
+            failed.append(benchmark.name)
+        elif args.update_baseline:
+            baseline[benchmark.name] = {"cyclesPerSecond" : cycles, "maxRssKb" : measure["maxRssKb"]}
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
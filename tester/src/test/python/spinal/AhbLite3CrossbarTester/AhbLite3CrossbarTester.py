@@ -5,7 +5,8 @@ import cocotb
 from cocotb.triggers import RisingEdge
 from cocotblib.AhbLite3 import AhbLite3MasterDriver, AhbLite3SlaveMemory, AhbLite3TraficGenerator, AhbLite3MasterReadChecker
 
-from cocotblib.misc import ClockDomainAsyncReset, Bundle, simulationSpeedPrinter
+from cocotblib.misc import ClockDomainAsyncReset, Bundle
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 class AhbLite3TraficGeneratorWithMemory(AhbLite3TraficGenerator):
@@ -52,7 +53,7 @@ def test1(dut):
 
 
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
     drivers = []
     checkers = []
@@ -5,7 +5,8 @@ import cocotb
 from cocotb.triggers import RisingEdge
 from cocotblib.AhbLite3 import AhbLite3MasterDriver, AhbLite3TraficGenerator, AhbLite3MasterReadChecker, AhbLite3Terminaison
 
-from cocotblib.misc import ClockDomainAsyncReset, Bundle, simulationSpeedPrinter
+from cocotblib.misc import ClockDomainAsyncReset, Bundle
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 class AhbLite3TraficGeneratorWithMemory(AhbLite3TraficGenerator):
@@ -46,7 +47,7 @@ def test1(dut):
     cocotbXHack()
     random.seed(0)
 
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
     # elements = [a for a in dut.AhbRam if a._name.startswith("")]
     # for e in elements:
@@ -5,7 +5,8 @@ import cocotb
 from cocotb.triggers import Edge, RisingEdge, FallingEdge, Timer
 
 from cocotblib.Apb3 import Apb3
-from cocotblib.misc import assertEquals, ClockDomainAsyncReset, simulationSpeedPrinter, waitClockedCond
+from cocotblib.misc import assertEquals, ClockDomainAsyncReset, waitClockedCond
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 @cocotb.coroutine
@@ -41,7 +42,7 @@ def test1(dut):
 
 
     cocotb.fork(genCLock(dut))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
     apb = Apb3(dut, "io_apb", dut.clk)
     apb.idle()
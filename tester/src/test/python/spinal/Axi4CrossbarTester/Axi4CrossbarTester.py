@@ -4,7 +4,8 @@ from queue import Queue
 import cocotb
 from cocotb.triggers import Timer, RisingEdge
 from cocotblib.Axi4 import Axi4
-from cocotblib.misc import ClockDomainAsyncReset, simulationSpeedPrinter, randBits, BoolRandomizer, assertEquals
+from cocotblib.misc import ClockDomainAsyncReset, randBits, BoolRandomizer, assertEquals
+from spinal.common.Metrics import simulationSpeedRecorder
 
 from cocotblib.Stream import StreamDriverSlave, StreamDriverMaster, Transaction, StreamMonitor
 
@@ -233,7 +234,7 @@ def test1(dut):
     random.seed(0)
 
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
     axiMasters = [Axi4(dut, "axiMasters_" + str(i)) for i in range(3)]
     axiSlaves = [Axi4(dut, "axiSlaves_" + str(i)) for i in range(4)]
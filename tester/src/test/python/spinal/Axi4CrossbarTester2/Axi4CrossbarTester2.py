@@ -4,7 +4,8 @@ import cocotb
 from cocotb.result import TestFailure
 from cocotblib.Axi4 import Axi4, Axi4ReadOnly, Axi4WriteOnly, Axi4Shared
 from cocotblib.Phase import PhaseManager, Infrastructure, PHASE_CHECK_SCORBOARDS
-from cocotblib.misc import ClockDomainAsyncReset, simulationSpeedPrinter
+from cocotblib.misc import ClockDomainAsyncReset
+from spinal.common.Metrics import simulationSpeedRecorder
 
 from spinal.Axi4CrossbarTester2.MasterDriver import WriteOnlyMasterDriver, ReadOnlyMasterDriver, SharedMasterDriver
 from spinal.Axi4CrossbarTester2.MasterMonitor import ReadOnlyMasterMonitor, WriteOnlyMasterMonitor, SharedMasterMonitor
@@ -46,7 +47,7 @@ def test1(dut):
     random.seed(0)
 
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
 
     phaseManager = PhaseManager()
@@ -1,11 +1,10 @@
-import random
 from queue import Queue
 
 from cocotblib.Phase import Infrastructure, PHASE_WAIT_TASKS_END
-from cocotblib.misc import randBits, BoolRandomizer
-
 from cocotblib.Stream import StreamDriverSlave, StreamDriverMaster, Transaction
 
+from spinal.common.Rng import BoolRandomizer, agentRng
+
 
 class WriteOnlyMasterDriver(Infrastructure):
     def __init__(self,name,parent,idBase,axi,dut):
@@ -15,8 +14,9 @@ class WriteOnlyMasterDriver(Infrastructure):
         self.idBase = idBase
         self.writeCmdQueue = Queue()
         self.writeDataQueue = Queue()
-        self.writeCmdIdleRand = BoolRandomizer()
-        self.writeDataIdleRand = BoolRandomizer()
+        self.writeRng = agentRng(name + ".write")
+        self.writeCmdIdleRand = BoolRandomizer(agentRng(name + ".writeCmdIdle"))
+        self.writeDataIdleRand = BoolRandomizer(agentRng(name + ".writeDataIdle"))
         self.closeIt = False
 
     def startPhase(self, phase):
@@ -31,11 +31,13 @@ class WriteOnlyMasterDriver(Infrastructure):
         return self
 
     def genRandomWriteAddress(self):
-        if random.random() < 0.1: # Random assertion of decoding error
+        rng = self.writeRng
+        if rng.random() < 0.1: # Random assertion of decoding error
             return 1 << 14
-        return randBits(12) + random.choice([0,1,3])*0x1000
+        return rng.getrandbits(12) + rng.choice([0,1,3])*0x1000
 
     def genWrite(self):
+        randBits = self.writeRng.getrandbits
         idOffset = randBits(2)
         writeCmd = Transaction()
         writeCmd.addr = self.genRandomWriteAddress()
@@ -90,7 +92,8 @@ class ReadOnlyMasterDriver(Infrastructure):
         self.axi = axi
         self.dut = dut
         self.closeIt = False
-        self.readCmdIdleRand = BoolRandomizer()
+        self.readRng = agentRng(name + ".read")
+        self.readCmdIdleRand = BoolRandomizer(agentRng(name + ".readCmdIdle"))
 
     def startPhase(self, phase):
         Infrastructure.startPhase(self, phase)
@@ -104,9 +107,10 @@ class ReadOnlyMasterDriver(Infrastructure):
         return self
 
     def genRandomReadAddress(self):
-        if random.random() < 0.1: # Random assertion of decoding error
+        rng = self.readRng
+        if rng.random() < 0.1: # Random assertion of decoding error
             return 1 << 14
-        return randBits(12) + random.choice([0,1,2])*0x1000
+        return rng.getrandbits(12) + rng.choice([0,1,2])*0x1000
 
     def genReadCmd(self):
         if self.closeIt:
@@ -114,6 +118,7 @@ class ReadOnlyMasterDriver(Infrastructure):
         if not self.readCmdIdleRand.get():
             return None
 
+        randBits = self.readRng.getrandbits
         idOffset = randBits(2)
         trans = Transaction()
         trans.addr = self.genRandomReadAddress()
@@ -134,7 +139,7 @@ class SharedMasterDriver(WriteOnlyMasterDriver, ReadOnlyMasterDriver):
     def __init__(self,name,parent,idBase,axi,dut):
         WriteOnlyMasterDriver.__init__(self,name,parent, idBase, axi, dut)
         ReadOnlyMasterDriver.__init__(self,name,parent, idBase, axi, dut)
-        self.readOrWriteRand = BoolRandomizer()
+        self.readOrWriteRand = BoolRandomizer(agentRng(name + ".readOrWrite"))
 
 
     def createInfrastructure(self):
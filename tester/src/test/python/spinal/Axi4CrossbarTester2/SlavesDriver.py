@@ -1,11 +1,10 @@
-import random
 from queue import Queue
 
 from cocotb.result import TestFailure
-from cocotblib.misc import BoolRandomizer
-
 from cocotblib.Stream import StreamDriverSlave, StreamDriverMaster, Transaction, StreamMonitor
 
+from spinal.common.Rng import BoolRandomizer, agentRng
+
 
 class ReadOnlySlaveDriver:
     def __init__(self,axi,base,size,dut):
@@ -13,7 +12,8 @@ class ReadOnlySlaveDriver:
         self.size = size
         self.base = base
         self.dut = dut
-        self.readRspRand = BoolRandomizer()
+        self.readRng = agentRng("%s@%x.read" % (type(self).__name__, base))
+        self.readRspRand = BoolRandomizer(self.readRng)
         self.readRspQueues = [Queue() for i in range(256)]
         self.nonEmptyReadRspQueues = []
         axi.r.payload.hid <= 0
@@ -47,7 +47,7 @@ class ReadOnlySlaveDriver:
             return None
         if not self.readRspRand.get():
             return None
-        queue = random.choice(self.nonEmptyReadRspQueues)
+        queue = self.readRng.choice(self.nonEmptyReadRspQueues)
         trans = queue.get()
         if queue.empty():
             self.nonEmptyReadRspQueues.remove(queue)
@@ -59,7 +59,8 @@ class WriteOnlySlaveDriver:
         self.size = size
         self.base = base
         self.dut = dut
-        self.writeRspRand = BoolRandomizer()
+        self.writeRng = agentRng("%s@%x.write" % (type(self).__name__, base))
+        self.writeRspRand = BoolRandomizer(self.writeRng)
         self.writeCmds = []
         self.writeDatas = []
         self.writeRspQueues = [Queue() for i in range(256)]
@@ -110,7 +111,7 @@ class WriteOnlySlaveDriver:
             return None
         if not self.writeRspRand.get():
             return None
-        queue = random.choice(self.nonEmptyWriteRspQueues)
+        queue = self.writeRng.choice(self.nonEmptyWriteRspQueues)
         trans = queue.get()
         if queue.empty():
             self.nonEmptyWriteRspQueues.remove(queue)
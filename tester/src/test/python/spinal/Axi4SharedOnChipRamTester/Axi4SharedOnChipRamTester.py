@@ -2,7 +2,8 @@ import random
 
 import cocotb
 from cocotblib.Phase import PhaseManager
-from cocotblib.misc import ClockDomainAsyncReset, simulationSpeedPrinter
+from cocotblib.misc import ClockDomainAsyncReset
+from spinal.common.Metrics import simulationSpeedRecorder
 
 from cocotblib.Axi4 import Axi4Shared, Axi4SharedMemoryChecker
 
@@ -15,7 +16,7 @@ def test1(dut):
     random.seed(0)
 
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
     phaseManager = PhaseManager()
     phaseManager.setWaitTasksEndTime(1000*2000)
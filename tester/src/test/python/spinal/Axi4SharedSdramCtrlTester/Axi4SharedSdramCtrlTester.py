@@ -4,7 +4,7 @@ import cocotb
 from cocotb.triggers import Timer
 from cocotblib.Axi4 import Axi4SharedMemoryChecker, Axi4Shared
 from cocotblib.Phase import PhaseManager
-from cocotblib.misc import simulationSpeedPrinter
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 @cocotb.coroutine
@@ -28,7 +28,7 @@ def test1(dut):
     cocotbXHack()
 
     cocotb.fork(ClockDomainAsyncResetCustom(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
     phaseManager = PhaseManager()
     phaseManager.setWaitTasksEndTime(1000*2000)
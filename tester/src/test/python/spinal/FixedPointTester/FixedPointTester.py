@@ -1,33 +1,40 @@
 import cocotb
-from cocotb.triggers import Timer
 
-from cocotblib.misc import randSignal, assertEquals, truncUInt, sint
+from spinal.common.OperatorTable import Operand, applyOperator
+from spinal.common.Vectors import VectorTest, vectorRng, randomInputs, signed, truncate
+
+VECTOR_COUNT = 1000
 
 
 class Ref:
-    def __init__(self,dut):
-        self.io_outSFix_0 = truncUInt(sint(dut.io_inSFix_0) + ((sint(dut.io_inSFix_1) << 2)), dut.io_outSFix_0)
-        self.io_outSFix_1 = truncUInt((sint(dut.io_inSFix_0) * sint(dut.io_inSFix_1)) >> 5, dut.io_outSFix_1)
-        self.io_outBundleA_a_sfix = truncUInt(sint(dut.io_inBundleA_a_sfix) >> 2, dut.io_outBundleA_a_sfix)
-        sfix2 = sint(dut.io_inSFix2)
-        self.io_outSFix2 = truncUInt(((sfix2 << 1) + sfix2) << 1, dut.io_outSFix2)
+    def __init__(self,dut,inputs):
+        def sint(name):
+            return signed(inputs[name], len(getattr(dut, name)))
+
+        def operand(name):
+            return inputs[name], Operand(len(getattr(dut, name)), signed=True)
+
+        # io_inSFix_1 << 2 as a wider raw operand
+        sfix1Shifted = truncate(inputs["io_inSFix_1"] << 2, len(dut.io_inSFix_1) + 2), Operand(len(dut.io_inSFix_1) + 2, signed=True)
+        self.io_outSFix_0 = truncate(applyOperator("add", *(operand("io_inSFix_0") + sfix1Shifted)), len(dut.io_outSFix_0))
+        self.io_outSFix_1 = truncate(applyOperator("mul", *(operand("io_inSFix_0") + operand("io_inSFix_1"))) >> 5, len(dut.io_outSFix_1))
+        self.io_outBundleA_a_sfix = truncate(sint("io_inBundleA_a_sfix") >> 2, len(dut.io_outBundleA_a_sfix))
+        sfix2 = sint("io_inSFix2")
+        self.io_outSFix2 = truncate(((sfix2 << 1) + sfix2) << 1, len(dut.io_outSFix2))
+
 
 @cocotb.test()
 def test1(dut):
     dut.log.info("Cocotb test boot")
     #random.seed(0)
 
-
-    for i in range(0,1000):
-        randSignal(dut.io_inSFix_0)
-        randSignal(dut.io_inSFix_1)
-        randSignal(dut.io_inBundleA_a_sfix)
-        randSignal(dut.io_inSFix2)
-        yield Timer(1000)
-        ref = Ref(dut)
-        assertEquals(ref.io_outSFix_0, dut.io_outSFix_0, "io_outSFix_0")
-        assertEquals(ref.io_outSFix_1, dut.io_outSFix_1, "io_outSFix_1")
-        assertEquals(ref.io_outSFix2, dut.io_outSFix2, "io_outSFix2")
-        assertEquals(ref.io_outBundleA_a_sfix, dut.io_outBundleA_a_sfix, "io_outBundleA_a_sfix")
+    test = VectorTest(dut, randomInputs(vectorRng(), dut, ["io_inSFix_0", "io_inSFix_1", "io_inBundleA_a_sfix", "io_inSFix2"], VECTOR_COUNT))
+    ref = Ref(dut, test.inputs)
+    test.expect("io_outSFix_0", None, ref.io_outSFix_0)
+    test.expect("io_outSFix_1", None, ref.io_outSFix_1)
+    test.expect("io_outSFix2", None, ref.io_outSFix2)
+    test.expect("io_outBundleA_a_sfix", None, ref.io_outBundleA_a_sfix)
+    yield test.run()
+    test.verify()
 
     dut.log.info("Cocotb test done")
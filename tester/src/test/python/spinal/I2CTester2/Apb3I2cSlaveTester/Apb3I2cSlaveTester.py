@@ -8,7 +8,8 @@ from cocotb.triggers import RisingEdge, FallingEdge, Event, Timer
 from cocotblib.Apb3 import Apb3
 from cocotblib.Flow import Flow
 from cocotblib.Stream import Stream
-from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, simulationSpeedPrinter, clockedWaitTrue, Bundle, SimulationTimeout
+from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, clockedWaitTrue, Bundle, SimulationTimeout
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.I2CTester2.lib.misc import OpenDrainInterconnect, I2cSoftMaster
 
 
@@ -18,7 +19,7 @@ from spinal.I2CTester2.lib.misc import OpenDrainInterconnect, I2cSoftMaster
 @cocotb.test()
 def test1(dut):
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset,100000))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
     cocotb.fork(SimulationTimeout(2000 * 2.5e6))
 
     sclInterconnect = OpenDrainInterconnect()
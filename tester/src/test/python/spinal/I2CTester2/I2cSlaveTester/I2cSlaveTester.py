@@ -7,7 +7,8 @@ from cocotb.triggers import RisingEdge, FallingEdge, Event, Timer
 
 from cocotblib.Flow import Flow
 from cocotblib.Stream import Stream
-from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, simulationSpeedPrinter, clockedWaitTrue, Bundle, SimulationTimeout
+from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, clockedWaitTrue, Bundle, SimulationTimeout
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.I2CTester2.lib.misc import OpenDrainInterconnect, I2cSoftMaster
 
 @coroutine
@@ -89,7 +90,7 @@ def i2cSlaveThread(cmdBus, rspBus, cmds, rsps, clk):
 def test1(dut):
     # random.seed(13)
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset,100000))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
 
     sclInterconnect = OpenDrainInterconnect()
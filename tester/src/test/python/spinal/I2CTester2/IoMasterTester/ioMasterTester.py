@@ -8,7 +8,8 @@ from cocotb.triggers import RisingEdge, FallingEdge, Event, Timer
 
 from cocotblib.Flow import Flow
 from cocotblib.Stream import Stream, StreamDriverMaster, Transaction
-from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, simulationSpeedPrinter, clockedWaitTrue, Bundle, randBits, randBool
+from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, clockedWaitTrue, Bundle, randBits, randBool
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.I2CTester2.lib.misc import OpenDrainInterconnect, I2cSoftMaster
 
 
@@ -227,7 +228,7 @@ class MasterThread:
 @cocotb.test()
 def test1(dut):
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset,100000))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
     baudPeriod = 2500000
     sclInterconnect = OpenDrainInterconnect()
@@ -7,7 +7,8 @@ from cocotb.triggers import RisingEdge, FallingEdge, Event
 
 from cocotblib.Flow import Flow
 from cocotblib.Stream import Stream
-from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, simulationSpeedPrinter, clockedWaitTrue, Bundle
+from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, clockedWaitTrue, Bundle
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.I2CTester2.lib.misc import OpenDrainInterconnect, I2cSoftMaster
 
 @coroutine
@@ -68,7 +69,7 @@ def i2cSlaveThread(cmdBus, rspBus, cmds, rsps, clk):
 @cocotb.test()
 def test1(dut):
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset,100000))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
 
     sclInterconnect = OpenDrainInterconnect()
@@ -1,7 +1,8 @@
 import cocotb
 from cocotb.triggers import RisingEdge
 
-from cocotblib.misc import assertEquals, ClockDomainAsyncReset, BoolRandomizer, simulationSpeedPrinter
+from cocotblib.misc import assertEquals, ClockDomainAsyncReset, BoolRandomizer
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 @cocotb.test()
@@ -24,7 +25,7 @@ def test1(dut):
             2,3,3,4,5,6,16,16,16,6,4,3,2,2,1,1,
             2,2,3,3,3,4,12,16,8,4,3,3,2,2,1,1]
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
     readyRandomizer = BoolRandomizer()
     dut.io_cmdPort_valid <= 0;
     dut.io_retPort_ready <= 1;
@@ -1,169 +1,133 @@
+import os
+
 import cocotb
-from cocotb.result import TestFailure
-from cocotb.triggers import Timer
 
-from cocotblib.misc import randSignal, truncUInt, sint, truncSInt
-import random
+import numpy as np
+
+from spinal.common.OperatorTable import Operand, applyOperator
+from spinal.common.Vectors import VectorTest, Sweep, sweepVectors, vectorRng, randomInputs, randomBits, notZero, signed
+
+VECTOR_COUNT = 2000
+
+
+def expectOperators(dut, test):
+    inputs = test.inputs
+
+    def op(name, a, b):
+        return applyOperator(name, inputs[a], Operand(len(getattr(dut, a)), a.startswith("sint")),
+                                   inputs[b], Operand(len(getattr(dut, b)), b.startswith("sint")))
+
+    uint4 = inputs["uint4"]
+    uint8 = inputs["uint8"]
+    sint4 = signed(inputs["sint4"], 4)
+    sint8 = signed(inputs["sint8"], 8)
+    sint8Raw = inputs["sint8"]
+    bits4 = inputs["bits4"]
+    bits8 = inputs["bits8"]
+    bits32 = inputs["bits32"]
+    boolA = inputs["boolA"]
+    boolB = inputs["boolB"]
+    boolC = inputs["boolC"]
+    uint4NotZero = inputs["uint4NotZero"]
+    uint8NotZero = inputs["uint8NotZero"]
+    sint4NotZero = signed(inputs["sint4NotZero"], 4)
+    sint8NotZero = signed(inputs["sint8NotZero"], 8)
 
-def check(signal,bitCount,value):
-    if len(signal) != bitCount or int(signal) != truncUInt(value, bitCount):
-        raise TestFailure("FAIL %s    %d != %d" % (signal._path, int(signal), truncUInt(value, bitCount)))
 
-def checkSigned(signal,bitCount,value):
-    if len(signal) != bitCount or sint(signal) != truncSInt(value,bitCount):
-        raise TestFailure("FAIL %s    %d != %d" % (signal._path, sint(signal), truncSInt(value,bitCount)))
 
-def notZero(x):
-    if x == 0:
-        return 1
-    else:
-        return x
+    test.expect("boolMux",1, np.where(boolC, boolA, boolB))
+    test.expect("bitsBsMux",8, np.where(boolC, bits8, bits4))
+    test.expect("uintBsMux",8, np.where(boolC, uint8, uint4))
+    test.expect("sintBsMux",8, np.where(boolC, sint8, sint4))
+    test.expect("bitsSbMux",8, np.where(boolC, bits4, bits8))
+    test.expect("uintSbMux",8, np.where(boolC, uint4, uint8))
+    test.expect("sintSbMux",8, np.where(boolC, sint4, sint8))
+    test.expect("stateNativeMux",2, np.where(boolC, 0, 1))
+    test.expect("stateBinarySequancialMux",2, np.where(boolC, 0, 1))
+    test.expect("stateBinaryOneHotMux",3, np.where(boolC, 1, 2))
 
-def randSignalNotZero(that):
-    value = random.getrandbits(len(that))
-    if(value == 0):
-        value += 1
-    that <= value
-
-@cocotb.test()
-def test1(dut):
-    dut.log.info("Cocotb test boot")
-
-    # itemDir = dut.uint4.__dict__
-    #
-    # for i in itemDir:
-    #     print '{0}  :  {1}'.format(i, itemDir[i])
-
-    for i in range(0,2000):
-        randSignal(dut.uint4)
-        randSignal(dut.uint8)
-        randSignalNotZero(dut.uint4NotZero)
-        randSignalNotZero(dut.uint8NotZero)
-        randSignal(dut.uint32)
-        randSignal(dut.sint4)
-        randSignal(dut.sint8)
-        randSignalNotZero(dut.sint4NotZero)
-        randSignalNotZero(dut.sint8NotZero)
-        randSignal(dut.sint32)
-        randSignal(dut.bits4)
-        randSignal(dut.bits8)
-        randSignal(dut.bits32)
-        randSignal(dut.boolA)
-        randSignal(dut.boolB)
-        randSignal(dut.boolC)
-        yield Timer(1000)
-        uint4 = int(dut.uint4)
-        uint8 = int(dut.uint8)
-        uint32 = int(dut.uint32)
-        sint4 = sint(dut.sint4)
-        sint8 = sint(dut.sint8)
-        sint32 = sint(dut.sint32)
-        bits4 = int(dut.bits4)
-        bits8 = int(dut.bits8)
-        bits32 = int(dut.bits32)
-        boolA = int(dut.boolA)
-        boolB = int(dut.boolB)
-        boolC = int(dut.boolC)
-        uint4NotZero =  int(dut.uint4NotZero)
-        uint8NotZero =  int(dut.uint8NotZero)
-        sint4NotZero = sint(dut.sint4NotZero)
-        sint8NotZero = sint(dut.sint8NotZero)
-
-
-
-        check(dut.boolMux,1, boolA if boolC else boolB)
-        check(dut.bitsBsMux,8, bits8 if boolC else bits4)
-        check(dut.uintBsMux,8, uint8 if boolC else uint4)
-        check(dut.sintBsMux,8, sint8 if boolC else sint4)
-        check(dut.bitsSbMux,8, bits4 if boolC else bits8)
-        check(dut.uintSbMux,8, uint4 if boolC else uint8)
-        check(dut.sintSbMux,8, sint4 if boolC else sint8)
-        check(dut.stateNativeMux            ,2, 0 if boolC else 1)
-        check(dut.stateBinarySequancialMux  ,2, 0 if boolC else 1)
-        check(dut.stateBinaryOneHotMux      ,3, 1 if boolC else 2)
-
-        check(dut.uintNot, 4, ~uint4)
-        check(dut.uintShiftLeftInt  , 12, uint8 << 4)
-        check(dut.uintShiftLeftUint , 23, uint8 << uint4)
-        check(dut.uintShiftRightInt , 4, uint8 >> 4)
-        check(dut.uintShiftRightUint, 8, uint8 >> uint4)
-        check(dut.uintShiftLeftIntFixedWidth  , 8, uint8 << 4)
-        check(dut.uintShiftLeftUintFixedWidth , 8, uint8 << uint4)
-        check(dut.uintShiftRightIntFixedWidth , 8, uint8 >> 4)
-        check(dut.uintShiftRightUintFixedWidth, 8, uint8 >> uint4)
-
-        check(dut.sintNot, 4, ~sint4)
-        checkSigned(dut.sintMinus, 4, -sint4)
-        check(dut.sintShiftLeftInt  , 12, sint8 << 4)
-        check(dut.sintShiftLeftUint , 23, sint8 << uint4)
-        check(dut.sintShiftRightInt , 4, sint8 >> 4)
-        checkSigned(dut.sintShiftRightUint, 8, sint8 >> uint4)
-        check(dut.sintShiftLeftIntFixedWidth  , 8, sint8 << 4)
-        check(dut.sintShiftLeftUintFixedWidth , 8, sint8 << uint4)
-        checkSigned(dut.sintShiftRightIntFixedWidth , 8, sint8 >> 4)
-        checkSigned(dut.sintShiftRightUintFixedWidth, 8, sint8 >> uint4)
-
-        check(dut.bitsNot, 4, ~bits4)
-        check(dut.bitsShiftLeftInt  , 12, bits8 << 4)
-        check(dut.bitsShiftLeftUint , 23, bits8 << uint4)
-        check(dut.bitsShiftRightInt , 4, bits8 >> 4)
-        check(dut.bitsShiftRightUint, 8, bits8 >> uint4)
-        check(dut.bitsShiftLeftIntFixedWidth  , 8, bits8 << 4)
-        check(dut.bitsShiftLeftUintFixedWidth , 8, bits8 << uint4)
-        check(dut.bitsShiftRightIntFixedWidth , 8, bits8 >> 4)
-        check(dut.bitsShiftRightUintFixedWidth, 8, bits8 >> uint4)
+    test.expect("uintNot", 4, ~uint4)
+    test.expect("uintShiftLeftInt", 12, uint8 << 4)
+    test.expect("uintShiftLeftUint", 23, op("shl", "uint8", "uint4"))
+    test.expect("uintShiftRightInt", 4, uint8 >> 4)
+    test.expect("uintShiftRightUint", 8, op("shr", "uint8", "uint4"))
+    test.expect("uintShiftLeftIntFixedWidth", 8, uint8 << 4)
+    test.expect("uintShiftLeftUintFixedWidth", 8, op("shl", "uint8", "uint4"))
+    test.expect("uintShiftRightIntFixedWidth", 8, uint8 >> 4)
+    test.expect("uintShiftRightUintFixedWidth", 8, op("shr", "uint8", "uint4"))
+
+    test.expect("sintNot", 4, ~sint4)
+    test.expect("sintMinus", 4, -sint4)
+    test.expect("sintShiftLeftInt", 12, sint8 << 4)
+    test.expect("sintShiftLeftUint", 23, op("shl", "sint8", "uint4"))
+    test.expect("sintShiftRightInt", 4, sint8 >> 4)
+    test.expect("sintShiftRightUint", 8, op("shr", "sint8", "uint4"))
+    test.expect("sintShiftLeftIntFixedWidth", 8, sint8 << 4)
+    test.expect("sintShiftLeftUintFixedWidth", 8, op("shl", "sint8", "uint4"))
+    test.expect("sintShiftRightIntFixedWidth", 8, sint8 >> 4)
+    test.expect("sintShiftRightUintFixedWidth", 8, op("shr", "sint8", "uint4"))
+
+    test.expect("bitsNot", 4, ~bits4)
+    test.expect("bitsShiftLeftInt", 12, bits8 << 4)
+    test.expect("bitsShiftLeftUint", 23, op("shl", "bits8", "uint4"))
+    test.expect("bitsShiftRightInt", 4, bits8 >> 4)
+    test.expect("bitsShiftRightUint", 8, op("shr", "bits8", "uint4"))
+    test.expect("bitsShiftLeftIntFixedWidth", 8, bits8 << 4)
+    test.expect("bitsShiftLeftUintFixedWidth", 8, op("shl", "bits8", "uint4"))
+    test.expect("bitsShiftRightIntFixedWidth", 8, bits8 >> 4)
+    test.expect("bitsShiftRightUintFixedWidth", 8, op("shr", "bits8", "uint4"))
 
 
 
-        check(dut.uintSbEquals,         1, uint4 == uint8)
-        check(dut.uintSbNotEquals,      1, uint4 != uint8)
+    test.expect("uintSbEquals",         1, op("eq", "uint4", "uint8"))
+    test.expect("uintSbNotEquals",      1, op("ne", "uint4", "uint8"))
 
-        check(dut.uintSbAdd, 8, uint4 + uint8)
-        check(dut.uintSbSub, 8, uint4 - uint8)
-        check(dut.uintSbMul, 12, uint4 * uint8)
-        if uint8NotZero != 0:
-            check(dut.uintSbDiv, 4, uint4 // uint8NotZero)
-            check(dut.uintSbRem, 4, uint4 % uint8NotZero)
-        check(dut.uintSbAnd, 8, uint4 & uint8)
-        check(dut.uintSbOr , 8, uint4 | uint8)
-        check(dut.uintSbXor, 8, uint4 ^ uint8)
+    test.expect("uintSbAdd", 8, op("add", "uint4", "uint8"))
+    test.expect("uintSbSub", 8, op("sub", "uint4", "uint8"))
+    test.expect("uintSbMul", 12, op("mul", "uint4", "uint8"))
+    uintSbDivisible = uint8NotZero != 0
+    test.expect("uintSbDiv", 4, op("div", "uint4", "uint8NotZero"), valid=uintSbDivisible)
+    test.expect("uintSbRem", 4, op("rem", "uint4", "uint8NotZero"), valid=uintSbDivisible)
+    test.expect("uintSbAnd", 8, op("and", "uint4", "uint8"))
+    test.expect("uintSbOr", 8, op("or", "uint4", "uint8"))
+    test.expect("uintSbXor", 8, op("xor", "uint4", "uint8"))
 
-        check(dut.uintSbSmaller      , 1, uint4 < uint8)
-        check(dut.uintSbSmallerEquals, 1, uint4 <= uint8)
-        check(dut.uintSbBigger       , 1, uint4 > uint8)
-        check(dut.uintSbBiggerEquals , 1, uint4 >= uint8)
+    test.expect("uintSbSmaller", 1, op("lt", "uint4", "uint8"))
+    test.expect("uintSbSmallerEquals", 1, op("le", "uint4", "uint8"))
+    test.expect("uintSbBigger", 1, op("gt", "uint4", "uint8"))
+    test.expect("uintSbBiggerEquals", 1, op("ge", "uint4", "uint8"))
 
 
 
 
-        check(dut.sintSbEquals, 1, sint4 == sint8)
-        check(dut.sintSbNotEquals, 1, sint4 != sint8)
+    test.expect("sintSbEquals", 1, op("eq", "sint4", "sint8"))
+    test.expect("sintSbNotEquals", 1, op("ne", "sint4", "sint8"))
 
-        checkSigned(dut.sintSbAdd, 8, sint4 + sint8)
-        checkSigned(dut.sintSbSub, 8, sint4 - sint8)
-        checkSigned(dut.sintSbMul, 12, sint4 * sint8)
-        if sint8NotZero != 0 and sint4 > 0 and sint8NotZero > 0:
-            checkSigned(dut.sintSbDiv, 4,  int(sint4//sint8NotZero))
-            checkSigned(dut.sintSbRem, 4,  int(sint4% sint8NotZero))
+    test.expect("sintSbAdd", 8, op("add", "sint4", "sint8"))
+    test.expect("sintSbSub", 8, op("sub", "sint4", "sint8"))
+    test.expect("sintSbMul", 12, op("mul", "sint4", "sint8"))
+    sintSbDivisible = (sint8NotZero != 0) & (sint4 > 0) & (sint8NotZero > 0)
+    test.expect("sintSbDiv", 4,  op("div", "sint4", "sint8NotZero"), valid=sintSbDivisible)
+    test.expect("sintSbRem", 4,  op("rem", "sint4", "sint8NotZero"), valid=sintSbDivisible)
 
-        checkSigned(dut.sintSbAnd, 8, sint4 & sint8)
-        checkSigned(dut.sintSbOr, 8, sint4 | sint8)
-        checkSigned(dut.sintSbXor, 8, sint4 ^ sint8)
+    test.expect("sintSbAnd", 8, op("and", "sint4", "sint8"))
+    test.expect("sintSbOr", 8, op("or", "sint4", "sint8"))
+    test.expect("sintSbXor", 8, op("xor", "sint4", "sint8"))
 
-        check(dut.sintSbSmaller, 1, sint4 < sint8)
-        check(dut.sintSbSmallerEquals, 1, sint4 <= sint8)
-        check(dut.sintSbBigger, 1, sint4 > sint8)
-        check(dut.sintSbBiggerEquals, 1, sint4 >= sint8)
+    test.expect("sintSbSmaller", 1, op("lt", "sint4", "sint8"))
+    test.expect("sintSbSmallerEquals", 1, op("le", "sint4", "sint8"))
+    test.expect("sintSbBigger", 1, op("gt", "sint4", "sint8"))
+    test.expect("sintSbBiggerEquals", 1, op("ge", "sint4", "sint8"))
 
 
 
 
-        check(dut.bitsSbEquals, 1, bits4 == bits8)
-        check(dut.bitsSbNotEquals, 1, bits4 != bits8)
+    test.expect("bitsSbEquals", 1, op("eq", "bits4", "bits8"))
+    test.expect("bitsSbNotEquals", 1, op("ne", "bits4", "bits8"))
 
-        check(dut.bitsSbAnd, 8, bits4 & bits8)
-        check(dut.bitsSbOr, 8, bits4 | bits8)
-        check(dut.bitsSbXor, 8, bits4 ^ bits8)
+    test.expect("bitsSbAnd", 8, op("and", "bits4", "bits8"))
+    test.expect("bitsSbOr", 8, op("or", "bits4", "bits8"))
+    test.expect("bitsSbXor", 8, op("xor", "bits4", "bits8"))
 
 
 
@@ -172,135 +136,168 @@ def test1(dut):
 
 
 
-        check(dut.uintBsEquals,         1, uint8 == uint4)
-        check(dut.uintBsNotEquals,      1, uint8 != uint4)
+    test.expect("uintBsEquals",         1, op("eq", "uint8", "uint4"))
+    test.expect("uintBsNotEquals",      1, op("ne", "uint8", "uint4"))
 
-        check(dut.uintBsAdd, 8, uint8 + uint4)
-        check(dut.uintBsSub, 8, uint8 - uint4)
-        check(dut.uintBsMul, 12, uint8 * uint4)
-        if uint4NotZero != 0:
-            check(dut.uintBsDiv, 8, uint8 // uint4NotZero)
-            check(dut.uintBsRem, 4, uint8 % uint4NotZero)
-        check(dut.uintBsAnd, 8, uint8 & uint4)
-        check(dut.uintBsOr , 8, uint8 | uint4)
-        check(dut.uintBsXor, 8, uint8 ^ uint4)
+    test.expect("uintBsAdd", 8, op("add", "uint8", "uint4"))
+    test.expect("uintBsSub", 8, op("sub", "uint8", "uint4"))
+    test.expect("uintBsMul", 12, op("mul", "uint8", "uint4"))
+    uintBsDivisible = uint4NotZero != 0
+    test.expect("uintBsDiv", 8, op("div", "uint8", "uint4NotZero"), valid=uintBsDivisible)
+    test.expect("uintBsRem", 4, op("rem", "uint8", "uint4NotZero"), valid=uintBsDivisible)
+    test.expect("uintBsAnd", 8, op("and", "uint8", "uint4"))
+    test.expect("uintBsOr", 8, op("or", "uint8", "uint4"))
+    test.expect("uintBsXor", 8, op("xor", "uint8", "uint4"))
 
-        check(dut.uintBsSmaller      , 1, uint8 < uint4)
-        check(dut.uintBsSmallerEquals, 1, uint8 <= uint4)
-        check(dut.uintBsBigger       , 1, uint8 > uint4)
-        check(dut.uintBsBiggerEquals , 1, uint8 >= uint4)
+    test.expect("uintBsSmaller", 1, op("lt", "uint8", "uint4"))
+    test.expect("uintBsSmallerEquals", 1, op("le", "uint8", "uint4"))
+    test.expect("uintBsBigger", 1, op("gt", "uint8", "uint4"))
+    test.expect("uintBsBiggerEquals", 1, op("ge", "uint8", "uint4"))
 
 
 
 
-        check(dut.sintBsEquals, 1, sint8 == sint4)
-        check(dut.sintBsNotEquals, 1, sint8 != sint4)
+    test.expect("sintBsEquals", 1, op("eq", "sint8", "sint4"))
+    test.expect("sintBsNotEquals", 1, op("ne", "sint8", "sint4"))
 
-        checkSigned(dut.sintBsAdd, 8, sint8 + sint4)
-        checkSigned(dut.sintBsSub, 8, sint8 - sint4)
-        checkSigned(dut.sintBsMul, 12, sint8 * sint4)
-        if sint4NotZero != 0 and sint8 > 0 and sint4NotZero > 0:
-            checkSigned(dut.sintBsDiv, 8,  int(sint8// sint4NotZero))
-            checkSigned(dut.sintBsRem, 4,  int(sint8%  sint4NotZero))
+    test.expect("sintBsAdd", 8, op("add", "sint8", "sint4"))
+    test.expect("sintBsSub", 8, op("sub", "sint8", "sint4"))
+    test.expect("sintBsMul", 12, op("mul", "sint8", "sint4"))
+    sintBsDivisible = (sint4NotZero != 0) & (sint8 > 0) & (sint4NotZero > 0)
+    test.expect("sintBsDiv", 8,  op("div", "sint8", "sint4NotZero"), valid=sintBsDivisible)
+    test.expect("sintBsRem", 4,  op("rem", "sint8", "sint4NotZero"), valid=sintBsDivisible)
 
-        checkSigned(dut.sintBsAnd, 8, sint8 & sint4)
-        checkSigned(dut.sintBsOr, 8, sint8 | sint4)
-        checkSigned(dut.sintBsXor, 8, sint8 ^ sint4)
+    test.expect("sintBsAnd", 8, op("and", "sint8", "sint4"))
+    test.expect("sintBsOr", 8, op("or", "sint8", "sint4"))
+    test.expect("sintBsXor", 8, op("xor", "sint8", "sint4"))
 
-        check(dut.sintBsSmaller, 1, sint8 < sint4)
-        check(dut.sintBsSmallerEquals, 1, sint8 <= sint4)
-        check(dut.sintBsBigger, 1, sint8 > sint4)
-        check(dut.sintBsBiggerEquals, 1, sint8 >= sint4)
+    test.expect("sintBsSmaller", 1, op("lt", "sint8", "sint4"))
+    test.expect("sintBsSmallerEquals", 1, op("le", "sint8", "sint4"))
+    test.expect("sintBsBigger", 1, op("gt", "sint8", "sint4"))
+    test.expect("sintBsBiggerEquals", 1, op("ge", "sint8", "sint4"))
 
 
 
 
-        check(dut.bitsBsEquals, 1, bits8 == bits4)
-        check(dut.bitsBsNotEquals, 1, bits8 != bits4)
+    test.expect("bitsBsEquals", 1, op("eq", "bits8", "bits4"))
+    test.expect("bitsBsNotEquals", 1, op("ne", "bits8", "bits4"))
 
-        check(dut.bitsBsAnd, 8, bits8 & bits4)
-        check(dut.bitsBsOr, 8, bits8 | bits4)
-        check(dut.bitsBsXor, 8, bits8 ^ bits4)
+    test.expect("bitsBsAnd", 8, op("and", "bits8", "bits4"))
+    test.expect("bitsBsOr", 8, op("or", "bits8", "bits4"))
+    test.expect("bitsBsXor", 8, op("xor", "bits8", "bits4"))
 
-        check(dut.bitsCat, 12, bits8 * 16 +  bits4)
+    test.expect("bitsCat", 12, bits8 * 16 +  bits4)
 
 
-        check(dut.boolEquals, 1, boolA == boolB)
-        check(dut.boolNotEquals, 1, boolA != boolB)
+    test.expect("boolEquals", 1, op("eq", "boolA", "boolB"))
+    test.expect("boolNotEquals", 1, op("ne", "boolA", "boolB"))
 
-        check(dut.boolAnd, 1, boolA & boolB)
-        check(dut.boolOr, 1, boolA | boolB)
-        check(dut.boolXor, 1, boolA ^ boolB)
+    test.expect("boolAnd", 1, op("and", "boolA", "boolB"))
+    test.expect("boolOr", 1, op("or", "boolA", "boolB"))
+    test.expect("boolXor", 1, op("xor", "boolA", "boolB"))
 
-        check(dut.uintAsBits,8,int(dut.uint8))
-        check(dut.uintAsSint,8,int(dut.uint8))
-        check(dut.sintAsBits,8,int(dut.sint8))
-        check(dut.sintAsUint,8,int(dut.sint8))
-        check(dut.bitsAsUint,8,int(dut.bits8))
-        check(dut.bitsAsSint,8,int(dut.bits8))
-        check(dut.boolAsBits,1,int(dut.boolA))
-        check(dut.boolAsUInt,1,int(dut.boolA))
-        check(dut.boolAsSInt,1,int(dut.boolA))
+    test.expect("uintAsBits",8,uint8)
+    test.expect("uintAsSint",8,uint8)
+    test.expect("sintAsBits",8,sint8Raw)
+    test.expect("sintAsUint",8,sint8Raw)
+    test.expect("bitsAsUint",8,bits8)
+    test.expect("bitsAsSint",8,bits8)
+    test.expect("boolAsBits",1,boolA)
+    test.expect("boolAsUInt",1,boolA)
+    test.expect("boolAsSInt",1,boolA)
 
-        check(dut.bitsResizeBigger  ,16,bits8)
-        check(dut.bitsResizeSmaller ,4 ,bits8)
-        check(dut.uintResizeBigger  ,16,uint8)
-        check(dut.uintResizeSmaller ,4 ,uint8)
-        check(dut.sintResizeBigger  ,16,sint8)
-        check(dut.sintResizeSmaller ,4 ,sint8)
+    test.expect("bitsResizeBigger",16,bits8)
+    test.expect("bitsResizeSmaller",4 ,bits8)
+    test.expect("uintResizeBigger",16,uint8)
+    test.expect("uintResizeSmaller",4 ,uint8)
+    test.expect("sintResizeBigger",16,sint8)
+    test.expect("sintResizeSmaller",4 ,sint8)
 
-        bits8StateSeq = (bits8 & 3)
-        bits8StateHO = (bits8 & 7)
+    bits8StateSeq = (bits8 & 3)
+    bits8StateHO = (bits8 & 7)
 
-        if bits8StateSeq <= 2:
-            check(dut.stateNativeBits,2,bits8)
-            check(dut.stateBinarySequancialBits, 2, bits8)
-            check(dut.stateNativeIsA,1,bits8StateSeq == 0)
-            check(dut.stateNativeIsB, 1, bits8StateSeq == 1)
-            check(dut.stateNativeIsC, 1, bits8StateSeq == 2)
-            check(dut.stateNativeIsNotA,1,bits8StateSeq != 0)
-            check(dut.stateNativeIsNotB, 1, bits8StateSeq != 1)
-            check(dut.stateNativeIsNotC, 1, bits8StateSeq != 2)
-            check(dut.stateBinarySequancialIsA,1,bits8StateSeq == 0)
-            check(dut.stateBinarySequancialIsB, 1, bits8StateSeq == 1)
-            check(dut.stateBinarySequancialIsC, 1, bits8StateSeq == 2)
-            check(dut.stateBinarySequancialIsNotA,1,bits8StateSeq != 0)
-            check(dut.stateBinarySequancialIsNotB, 1, bits8StateSeq != 1)
-            check(dut.stateBinarySequancialIsNotC, 1, bits8StateSeq != 2)
+    stateSequancialValid = bits8StateSeq <= 2
+    test.expect("stateNativeBits",2,bits8, valid=stateSequancialValid)
+    test.expect("stateBinarySequancialBits", 2, bits8, valid=stateSequancialValid)
+    test.expect("stateNativeIsA",1,bits8StateSeq == 0, valid=stateSequancialValid)
+    test.expect("stateNativeIsB", 1, bits8StateSeq == 1, valid=stateSequancialValid)
+    test.expect("stateNativeIsC", 1, bits8StateSeq == 2, valid=stateSequancialValid)
+    test.expect("stateNativeIsNotA",1,bits8StateSeq != 0, valid=stateSequancialValid)
+    test.expect("stateNativeIsNotB", 1, bits8StateSeq != 1, valid=stateSequancialValid)
+    test.expect("stateNativeIsNotC", 1, bits8StateSeq != 2, valid=stateSequancialValid)
+    test.expect("stateBinarySequancialIsA",1,bits8StateSeq == 0, valid=stateSequancialValid)
+    test.expect("stateBinarySequancialIsB", 1, bits8StateSeq == 1, valid=stateSequancialValid)
+    test.expect("stateBinarySequancialIsC", 1, bits8StateSeq == 2, valid=stateSequancialValid)
+    test.expect("stateBinarySequancialIsNotA",1,bits8StateSeq != 0, valid=stateSequancialValid)
+    test.expect("stateBinarySequancialIsNotB", 1, bits8StateSeq != 1, valid=stateSequancialValid)
+    test.expect("stateBinarySequancialIsNotC", 1, bits8StateSeq != 2, valid=stateSequancialValid)
 
-        if bits8StateHO == 1 or bits8StateHO == 2 or bits8StateHO == 4:
-            check(dut.stateBinaryOneHotBits, 3, bits8)
-            check(dut.stateBinaryOneHotIsA,1,bits8StateHO == 1)
-            check(dut.stateBinaryOneHotIsB, 1, bits8StateHO == 2)
-            check(dut.stateBinaryOneHotIsC, 1, bits8StateHO == 4)
-            check(dut.stateBinaryOneHotIsNotA,1,bits8StateHO != 1)
-            check(dut.stateBinaryOneHotIsNotB, 1, bits8StateHO != 2)
-            check(dut.stateBinaryOneHotIsNotC, 1, bits8StateHO != 4)
-
-        check(dut.bitsAggregateFixed, 8, (3 << 5) | ((bits8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
-        check(dut.uintAggregateFixed, 8, (3 << 5) | ((uint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
-        check(dut.sintAggregateFixed, 8, (3 << 5) | ((sint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
-
-
-        check(dut.bitsAggregateUnfixedWidthFixedDefault, 8, (3 << 5) | ((bits8 & 3) << 3) |(boolA << 2) | (3 << 1) | (1 << 0))
-        check(dut.uintAggregateUnfixedWidthFixedDefault, 8, (3 << 5) | ((uint8 & 3) << 3) |(boolA << 2) | (3 << 1) | (1 << 0))
-        check(dut.sintAggregateUnfixedWidthFixedDefault, 8, (3 << 5) | ((sint8 & 3) << 3) |(boolA << 2) | (3 << 1) | (1 << 0))
-
-
-        check(dut.bitsAggregateUnfixedWidthUnfixedDefault, 8, (3 << 5) | ((bits8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
-        check(dut.uintAggregateUnfixedWidthUnfixedDefault, 8, (3 << 5) | ((uint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
-        check(dut.sintAggregateUnfixedWidthUnfixedDefault, 8, (3 << 5) | ((sint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
-
-        bits27 = bits32 & ((1 << 27) - 1)
-        uint5  = uint8 & 0x1F
-        uint5mod27 = uint5 % 27
-        rotateLeftValue = (bits27 << uint5mod27) | (bits27 >> (27-uint5mod27))
-        rotateRightValue = (bits27 >> uint5mod27) | (bits27 << (27-uint5mod27))
-        check(dut.bitsRotateLeftUInt,27,rotateLeftValue)
-        check(dut.uintRotateLeftUInt, 27, rotateLeftValue)
-        check(dut.sintRotateLeftUInt, 27, rotateLeftValue)
-        check(dut.bitsRotateRightUInt,27,rotateRightValue)
-        check(dut.uintRotateRightUInt, 27, rotateRightValue)
-        check(dut.sintRotateRightUInt, 27, rotateRightValue)
+    stateOneHotValid = (bits8StateHO == 1) | (bits8StateHO == 2) | (bits8StateHO == 4)
+    test.expect("stateBinaryOneHotBits", 3, bits8, valid=stateOneHotValid)
+    test.expect("stateBinaryOneHotIsA",1,bits8StateHO == 1, valid=stateOneHotValid)
+    test.expect("stateBinaryOneHotIsB", 1, bits8StateHO == 2, valid=stateOneHotValid)
+    test.expect("stateBinaryOneHotIsC", 1, bits8StateHO == 4, valid=stateOneHotValid)
+    test.expect("stateBinaryOneHotIsNotA",1,bits8StateHO != 1, valid=stateOneHotValid)
+    test.expect("stateBinaryOneHotIsNotB", 1, bits8StateHO != 2, valid=stateOneHotValid)
+    test.expect("stateBinaryOneHotIsNotC", 1, bits8StateHO != 4, valid=stateOneHotValid)
+
+    test.expect("bitsAggregateFixed", 8, (3 << 5) | ((bits8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
+    test.expect("uintAggregateFixed", 8, (3 << 5) | ((uint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
+    test.expect("sintAggregateFixed", 8, (3 << 5) | ((sint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
+
+
+    test.expect("bitsAggregateUnfixedWidthFixedDefault", 8, (3 << 5) | ((bits8 & 3) << 3) |(boolA << 2) | (3 << 1) | (1 << 0))
+    test.expect("uintAggregateUnfixedWidthFixedDefault", 8, (3 << 5) | ((uint8 & 3) << 3) |(boolA << 2) | (3 << 1) | (1 << 0))
+    test.expect("sintAggregateUnfixedWidthFixedDefault", 8, (3 << 5) | ((sint8 & 3) << 3) |(boolA << 2) | (3 << 1) | (1 << 0))
+
+
+    test.expect("bitsAggregateUnfixedWidthUnfixedDefault", 8, (3 << 5) | ((bits8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
+    test.expect("uintAggregateUnfixedWidthUnfixedDefault", 8, (3 << 5) | ((uint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
+    test.expect("sintAggregateUnfixedWidthUnfixedDefault", 8, (3 << 5) | ((sint8 & 3) << 3) |(boolA << 2) | (boolA << 1) | (1 << 0))
+
+    bits27 = bits32 & ((1 << 27) - 1)
+    uint5  = uint8 & 0x1F
+    uint5mod27 = uint5 % 27
+    rotateLeftValue = (bits27 << uint5mod27) | (bits27 >> (27-uint5mod27))
+    rotateRightValue = (bits27 >> uint5mod27) | (bits27 << (27-uint5mod27))
+    test.expect("bitsRotateLeftUInt",27,rotateLeftValue)
+    test.expect("uintRotateLeftUInt", 27, rotateLeftValue)
+    test.expect("sintRotateLeftUInt", 27, rotateLeftValue)
+    test.expect("bitsRotateRightUInt",27,rotateRightValue)
+    test.expect("uintRotateRightUInt", 27, rotateRightValue)
+    test.expect("sintRotateRightUInt", 27, rotateRightValue)
+
+
+def sweepInputs(dut, rng, axes):
+    """Every (4 bits, 8 bits, bools) combination, shared by all the operand families. The 32 bits operands stay random."""
+    count = len(axes["narrow"])
+    inputs = randomInputs(rng, dut, ["uint32", "sint32", "bits32"], count)
+    for kind in ["uint", "sint", "bits"]:
+        inputs[kind + "4"] = axes["narrow"]
+        inputs[kind + "8"] = axes["wide"]
+    for kind in ["uint", "sint"]:
+        inputs[kind + "4NotZero"] = notZero(axes["narrow"])
+        inputs[kind + "8NotZero"] = notZero(axes["wide"])
+    for i, name in enumerate(["boolA", "boolB", "boolC"]):
+        inputs[name] = (axes["bools"] >> i) & 1
+    return inputs
 
+
+@cocotb.test()
+def test1(dut):
+    dut.log.info("Cocotb test boot")
+
+    rng = vectorRng()
+    if os.getenv("SPINAL_SWEEP"):
+        # Exhaustive, 32768 vectors
+        sweep = Sweep([("narrow", 4), ("wide", 8), ("bools", 3)])
+        yield sweepVectors(dut, sweep, lambda axes: sweepInputs(dut, rng, axes), lambda test: expectOperators(dut, test))
+    else:
+        inputs = randomInputs(rng, dut, ["uint4", "uint8", "uint32", "sint4", "sint8", "sint32", "bits4", "bits8", "bits32", "boolA", "boolB", "boolC"], VECTOR_COUNT)
+        for name in ["uint4NotZero", "uint8NotZero", "sint4NotZero", "sint8NotZero"]:
+            inputs[name] = notZero(randomBits(rng, len(getattr(dut, name)), VECTOR_COUNT))
+        test = VectorTest(dut, inputs)
+        expectOperators(dut, test)
+        yield test.run()
+        test.verify()
     dut.log.info("Cocotb test done")
@@ -1,6 +1,50 @@
+import os
+import struct
+
 import cocotb
 from cocotb.triggers import Timer
 
+from spinal.common.HexImage import hexImage
+
+
+def findMemory(module, names):
+    """Return the array handles of the first of the given memory names (a ; separated list of arrays) found in module."""
+    for name in names:
+        try:
+            return [getattr(module, part) for part in name.split(";")]
+        except AttributeError:
+            pass
+    return None
+
+
+def backdoorMemories(dut):
+    ram = findMemory(dut.uut.axi_ram, ["ram", "ram_symbol0;ram_symbol1;ram_symbol2;ram_symbol3"])
+    sdram = findMemory(dut.sdram, ["Bank0;Bank1;Bank2;Bank3"])
+    if ram is None or sdram is None:
+        return None
+    return ram, sdram
+
+
+def backdoorLoad(address,data,memories):
+    """Write a segment straight into the memory arrays, without consuming any simulation time."""
+    ram, sdram = memories
+    if address < 0x40000000:
+        assert(address & 3 == 0)
+        index = address >> 2
+        for (word,) in struct.iter_unpack("<I", data):
+            if len(ram) == 1:
+                ram[0][index].setimmediatevalue(word)
+            else:
+                for symbol, array in enumerate(ram):
+                    array[index].setimmediatevalue((word >> (symbol * 8)) & 0xFF)
+            index += 1
+    else:
+        assert(address & 1 == 0)
+        for (halfWord,) in struct.iter_unpack("<H", data):
+            bank = (address >> (1+10)) & 0x3
+            sdram[bank][((address >> 1) & 0x3FF) + (((address >> (1+10+2)) & 0x1FFF) << 10)].setimmediatevalue(halfWord)
+            address += 2
+
 
 @cocotb.coroutine
 def loadIHexCallback(address,array,dut,clk):
@@ -63,24 +107,15 @@ def loadIHex(dut,hexPath,clk,reset):
     writeDataBuffer = int(dut.uut.axi_ram.ram_port0_writeData)
 
 
-    # readIHex(hexPath,loadIHexCallback,dut)
-    with open(hexPath) as f:
-        offset = 0
-        for line in f:
-            if len(line) > 0:
-                assert line[0] == ':'
-                byteCount = int(line[1:3], 16)
-                nextAddr = int(line[3:7], 16) + offset
-                key = int(line[7:9], 16)
-                if key == 0:
-                    array = [int(line[9 + i * 2:11 + i * 2], 16) for i in range(0, byteCount)]
-                    yield loadIHexCallback(nextAddr,array,dut,clk)
-                elif key == 2:
-                    offset = int(line[9:13], 16) << 4
-                elif key == 4:
-                    offset = int(line[9:13], 16) << 16
-                else:
-                    pass
+    # SPINAL_PRELOAD=clocked forces the writes through the RAM port and the SDRAM model loader
+    memories = None if os.getenv("SPINAL_PRELOAD") == "clocked" else backdoorMemories(dut)
+    if memories is None:
+        dut._log.info("Clocked preload of %s" % hexPath)
+    for address, data in hexImage(hexPath).segments:
+        if memories:
+            backdoorLoad(address,data,memories)
+        else:
+            yield loadIHexCallback(address,data,dut,clk)
     reset <= 0
     yield Timer(5)
     reset <= 1
@@ -1,3 +1,4 @@
 VERILOG_SOURCES += $(SPINALROOT)/Pinsec.v ../common/mt48lc16m16a2.v ../common/PinsecTester_tb.v
 TOPLEVEL=PinsecTester_tb
+SPINAL_DATA_FILES += $(wildcard ../hex/*.hex)
 include ../../common/Makefile.sim
\ No newline at end of file
@@ -4,7 +4,7 @@ import cocotb
 from cocotb.result import TestFailure
 from cocotb.triggers import Timer, RisingEdge, FallingEdge
 
-from cocotblib.misc import simulationSpeedPrinter
+from spinal.common.Metrics import simulationSpeedRecorder, testMetrics
 from spinal.Pinsec.common.CoreCom import readCoreValueAssert
 from spinal.Pinsec.common.HexLoader import loadIHex
 from spinal.Pinsec.common.Misc import pinsecClockGen
@@ -57,8 +57,9 @@ def test1(dut):
     uut = dut.uut
     log = open('uartTx.log', 'w')
 
-    cocotb.fork(simulationSpeedPrinter(uut.io_axiClk))
-    yield loadIHex(dut,"../hex/dhrystone.hex",uut.io_axiClk,uut.io_asyncReset)
+    cocotb.fork(simulationSpeedRecorder(uut.io_axiClk))
+    with testMetrics().phase("loadIHex"):
+        yield loadIHex(dut,"../hex/dhrystone.hex",uut.io_axiClk,uut.io_asyncReset)
     pinsecClockGen(dut)
     cocotb.fork(uartTxBypass(uut.axi_uartCtrl.uartCtrl,uut.io_axiClk,log))
 
@@ -3,7 +3,8 @@ import random
 import cocotb
 from cocotb.triggers import Timer
 
-from cocotblib.misc import assertEquals, ClockDomainAsyncReset, Bundle, simulationSpeedPrinter, log2Up
+from cocotblib.misc import assertEquals, ClockDomainAsyncReset, Bundle, log2Up
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 
@@ -53,7 +54,7 @@ def jtagTest(dut):
     dut.log.info("Cocotb test boot")
     random.seed(0)
 
-    cocotb.fork(simulationSpeedPrinter(dut.io_axiClk))
+    cocotb.fork(simulationSpeedRecorder(dut.io_axiClk))
     yield loadIHex(dut,"e:/vm/share/pinsec_test.hex",dut.io_axiClk,dut.io_asyncReset)
     cocotb.fork(ClockDomainAsyncReset(dut.io_axiClk, dut.io_asyncReset))
 
@@ -1,7 +1,8 @@
 import cocotb
 from cocotb.triggers import Timer
 
-from cocotblib.misc import assertEquals, Bundle, simulationSpeedPrinter, log2Up
+from cocotblib.misc import assertEquals, Bundle, log2Up
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.Pinsec.common.HexLoader import loadIHex
 from spinal.Pinsec.common.Jtag import JtagMaster
 from spinal.Pinsec.common.Misc import pinsecClockGen
@@ -55,7 +56,7 @@ def jtagTest(dut):
     uut = dut.uut
     log = open('uartTx.log', 'w')
 
-    cocotb.fork(simulationSpeedPrinter(uut.io_axiClk))
+    cocotb.fork(simulationSpeedRecorder(uut.io_axiClk))
     yield loadIHex(dut,"../hex/dummy.hex",uut.io_axiClk,uut.io_asyncReset)
     pinsecClockGen(dut)
 
@@ -3,7 +3,8 @@ import random
 import cocotb
 from cocotb.triggers import Timer
 
-from cocotblib.misc import ClockDomainAsyncReset, simulationSpeedPrinter
+from cocotblib.misc import ClockDomainAsyncReset
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.Pinsec.common.HexLoader import loadIHex
 
 
@@ -35,7 +36,7 @@ def test1(dut):
     dut.log.info("Cocotb test boot")
     random.seed(0)
 
-    cocotb.fork(simulationSpeedPrinter(dut.io_axiClk))
+    cocotb.fork(simulationSpeedRecorder(dut.io_axiClk))
     yield loadIHex(dut,"../hex/timer.hex",dut.io_axiClk,dut.io_asyncReset)
     cocotb.fork(ClockDomainAsyncReset(dut.io_axiClk, dut.io_asyncReset))
 
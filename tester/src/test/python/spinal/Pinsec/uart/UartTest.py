@@ -3,7 +3,7 @@ import random
 import cocotb
 from cocotb.triggers import Timer, Edge
 
-from cocotblib.misc import simulationSpeedPrinter
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.Pinsec.common.CoreCom import readCoreValueAssert
 from spinal.Pinsec.common.HexLoader import loadIHex
 from spinal.Pinsec.common.Misc import pinsecClockGen
@@ -44,7 +44,7 @@ def test1(dut):
     cocotbXHack()
     uut = dut.uut
 
-    cocotb.fork(simulationSpeedPrinter(uut.io_axiClk))
+    cocotb.fork(simulationSpeedRecorder(uut.io_axiClk))
     yield loadIHex(dut,"../hex/uart.hex",uut.io_axiClk,uut.io_asyncReset)
     pinsecClockGen(dut)
     cocotb.fork(txToRxBypass(uut))
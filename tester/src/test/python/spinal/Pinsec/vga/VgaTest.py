@@ -3,7 +3,7 @@ import random
 import cocotb
 from cocotb.triggers import RisingEdge
 
-from cocotblib.misc import simulationSpeedPrinter
+from spinal.common.Metrics import simulationSpeedRecorder
 from spinal.Pinsec.common.HexLoader import loadIHex
 from spinal.Pinsec.common.Misc import pinsecClockGen
 
@@ -19,7 +19,7 @@ def test1(dut):
     random.seed(0)
     uut = dut.uut
 
-    cocotb.fork(simulationSpeedPrinter(uut.io_axiClk))
+    cocotb.fork(simulationSpeedRecorder(uut.io_axiClk))
     yield loadIHex(uut,"../hex/vga.hex",uut.io_axiClk,uut.io_asyncReset)
     pinsecClockGen(dut)
 
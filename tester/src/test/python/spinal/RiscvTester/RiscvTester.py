@@ -4,26 +4,15 @@ import cocotb
 from cocotb.result import TestFailure, TestSuccess
 from cocotb.triggers import Edge, RisingEdge
 
-from cocotblib.misc import randSignal, ClockDomainAsyncReset, randBoolSignal, \
-    simulationSpeedPrinter
+from cocotblib.misc import randSignal, ClockDomainAsyncReset, randBoolSignal
+from spinal.common.HexImage import loadImage
+from spinal.common.Metrics import simulationSpeedRecorder
+from spinal.common.Snapshot import SignalSnapshot
 
 
 def loadIHex(path,array):
-    with open(path) as f:
-        offset = 0
-        for line in f:
-            if len(line) > 0:
-                assert line[0] == ':'
-                byteCount = int(line[1:3],16)
-                nextAddr  = int(line[3:7],16) + offset
-                key = int(line[7:9],16)
-                if key == 0:
-                    for i in range(0,byteCount):
-                        array[nextAddr + i] = int(line[9+i*2:11+i*2],16)
-                elif key == 2:
-                    offset = int(line[9:13],16) << 4
-                else:
-                    pass
+    # The RiscvTester programs only use segment addresses
+    loadImage(path, array, linearAddress=False)
 
 
 class Tester:
@@ -72,28 +61,32 @@ class Tester:
     @cocotb.coroutine
     def driveIRsp(self):
         dut = self.dut
+        control = SignalSnapshot(dut, ["io_i_rsp_ready", "io_i_cmd_valid", "io_i_cmd_ready"])
+        cmd = SignalSnapshot(dut, ["io_i_cmd_payload_pc"])
         dut.io_i_rsp_valid <= 0
         while True:
             yield RisingEdge(dut.clk)
-            if int(dut.io_i_rsp_ready) == 1:
+            c = control.sample()
+            if c.io_i_rsp_ready == 1:
               dut.io_i_rsp_valid <= 0
               randSignal(dut.io_i_rsp_payload_instruction)
 
-            if int(dut.io_i_cmd_valid) == 1 and int(dut.io_i_cmd_ready) == 1:
+            if c.io_i_cmd_valid == 1 and c.io_i_cmd_ready == 1:
+              pc = cmd.sample().io_i_cmd_payload_pc
               dut.io_i_rsp_valid <= 1
-              dut.io_i_rsp_payload_pc <= int(dut.io_i_cmd_payload_pc)
+              dut.io_i_rsp_payload_pc <= pc
               data = 0
-              if int(dut.io_i_cmd_payload_pc) <= 0x03FFFFFF :
+              if pc <= 0x03FFFFFF :
                 for i in range(0,4):
-                  data = data | (self.rom[int(dut.io_i_cmd_payload_pc) + i] << (i*8))
+                  data = data | (self.rom[pc + i] << (i*8))
 
-              elif int(dut.io_i_cmd_payload_pc) <= 0x04007FFF :
+              elif pc <= 0x04007FFF :
                 for i in range(0, 4):
-                  data = data | (self.ram[int(dut.io_i_cmd_payload_pc and 0x00007FFF) + i] << (i*8))
+                  data = data | (self.ram[(pc and 0x00007FFF) + i] << (i*8))
               else:
                 raise TestFailure("out of range ICmd read")
 
-              if self.wrapICmdZero and int(dut.io_i_cmd_payload_pc) == 0:
+              if self.wrapICmdZero and pc == 0:
                 dut.io_i_rsp_payload_instruction <= 0xffc02e23; #01c02023   ffc02e23
               elif data == 0x00000073:
                 dut.io_i_rsp_payload_instruction <= 0xffc02e23;
@@ -106,76 +99,85 @@ class Tester:
     def driveDRsp(self):
         logg = open('log.txt', 'wb')
         dut = self.dut
+        control = SignalSnapshot(dut, ["io_d_rsp_ready", "io_d_cmd_valid", "io_d_cmd_ready", "io_iCheck_valid"])
+        cmd = SignalSnapshot(dut, ["io_d_cmd_payload_wr", "io_d_cmd_payload_address"])
+        cmdWrite = SignalSnapshot(dut, ["io_d_cmd_payload_data", "io_d_cmd_payload_size"])
+        iCheck = SignalSnapshot(dut, ["io_iCheck_payload_address", "io_iCheck_payload_data"])
         dut.io_d_rsp_valid <= 0
         counter = 0
         while True:
             yield RisingEdge(dut.clk)
             counter = counter + 1
-            if int(dut.io_d_rsp_ready) == 1 :
+            c = control.sample()
+            if c.io_d_rsp_ready == 1 :
               dut.io_d_rsp_valid <= 0
               randSignal(dut.io_d_rsp_payload)
 
-            if int(dut.io_d_cmd_valid) == 1 and  int(dut.io_d_cmd_ready) == 1 :
-              if int(dut.io_d_cmd_payload_wr) == 1 :
-                if int(dut.io_d_cmd_payload_address) == 0xF0000000 :
-                  logg.write(str(chr(int(dut.io_d_cmd_payload_data) & 0xFF)))
-                elif int(dut.io_d_cmd_payload_address) == 0xF0000004 :
+            if c.io_d_cmd_valid == 1 and  c.io_d_cmd_ready == 1 :
+              d = cmd.sample()
+              address = d.io_d_cmd_payload_address
+              if d.io_d_cmd_payload_wr == 1 :
+                w = cmdWrite.sample()
+                if address == 0xF0000000 :
+                  logg.write(str(chr(w.io_d_cmd_payload_data & 0xFF)))
+                elif address == 0xF0000004 :
                   pass
-                elif int(dut.io_d_cmd_payload_address) == 0xFFFFFFF8 :
+                elif address == 0xFFFFFFF8 :
                   pass
-                elif int(dut.io_d_cmd_payload_address) == 0xF0000010 :
+                elif address == 0xF0000010 :
                     pass
-                elif int(dut.io_d_cmd_payload_address) == 0xF0000044 :
+                elif address == 0xF0000044 :
                     pass
-                elif int(dut.io_d_cmd_payload_address) == 0xFFFFFFFC :
+                elif address == 0xFFFFFFFC :
                     pass
 
-                elif int(dut.io_d_cmd_payload_address) <= 0x03FFFFFF :
+                elif address <= 0x03FFFFFF :
                   if not self.allowRomWrite:
                     raise TestFailure("Rom was written :(")
-                  for i in range(0,1 << int(dut.io_d_cmd_payload_size)):
-                    self.rom[int(dut.io_d_cmd_payload_address) + i] = (int(dut.io_d_cmd_payload_data) >> (i*8)) & 0xFF
-                elif int(dut.io_d_cmd_payload_address) <= 0x04007FFF :
-                  # print("write %x %x" % (int(dut.io_d_cmd_payload_address),int(dut.io_d_cmd_payload_data)))
-                  for i in range(0,1 << int(dut.io_d_cmd_payload_size)):
-                      self.ram[(int(dut.io_d_cmd_payload_address) & 0x00007FFF) + i] = (int(dut.io_d_cmd_payload_data) >> (i*8)) & 0xFF
+                  for i in range(0,1 << w.io_d_cmd_payload_size):
+                    self.rom[address + i] = (w.io_d_cmd_payload_data >> (i*8)) & 0xFF
+                elif address <= 0x04007FFF :
+                  # print("write %x %x" % (address,w.io_d_cmd_payload_data))
+                  for i in range(0,1 << w.io_d_cmd_payload_size):
+                      self.ram[(address & 0x00007FFF) + i] = (w.io_d_cmd_payload_data >> (i*8)) & 0xFF
 
                 else:
-                    raise TestFailure("dCmd out of range %x" %(int(dut.io_d_cmd_payload_address)))
+                    raise TestFailure("dCmd out of range %x" %(address))
 
               else:
                 dut.io_d_rsp_valid <= 1
-                if int(dut.io_d_cmd_payload_address) == 0xF0000040 :
+                if address == 0xF0000040 :
                   dut.io_d_rsp_payload <= counter
-                elif int(dut.io_d_cmd_payload_address) == 0xF0000020 :
+                elif address == 0xF0000020 :
                   dut.io_d_rsp_payload <= 0
-                elif int(dut.io_d_cmd_payload_address) == 0xF0000000 :
+                elif address == 0xF0000000 :
                   dut.io_d_rsp_payload <= 0
-                elif int(dut.io_d_cmd_payload_address) == 0xF0000004 :
+                elif address == 0xF0000004 :
                   dut.io_d_rsp_payload <= 0xFFFF0000
-                elif int(dut.io_d_cmd_payload_address) <= 0x03FFFFFF :
+                elif address <= 0x03FFFFFF :
                     data = 0
                     for i in range(0,4):
-                        data |= self.rom[int(dut.io_d_cmd_payload_address) + i] << (i*8)
+                        data |= self.rom[address + i] << (i*8)
                     dut.io_d_rsp_payload <= data
-                elif int(dut.io_d_cmd_payload_address) <= 0x04007FFF :
+                elif address <= 0x04007FFF :
                     data = 0
                     for i in range(0, 4):
-                        data |= self.ram[(int(dut.io_d_cmd_payload_address) & 0x00007FFF) + i]  << (i*8)
-                    # print("read %x %x" % (int(dut.io_d_cmd_payload_address), int(dut.io_d_cmd_payload_data)))
+                        data |= self.ram[(address & 0x00007FFF) + i]  << (i*8)
+                    # print("read %x %x" % (address, int(dut.io_d_cmd_payload_data)))
                     dut.io_d_rsp_payload <= data
                 else:
-                    raise TestFailure("dCmd out of range %x" %(int(dut.io_d_cmd_payload_address)))
+                    raise TestFailure("dCmd out of range %x" %(address))
 
 
 
 
-            if int(dut.io_iCheck_valid) == 1 :
-              if (int(dut.io_iCheck_payload_address) & 3) != 0:
+            if c.io_iCheck_valid == 1 :
+              i = iCheck.sample()
+              if (i.io_iCheck_payload_address & 3) != 0:
                 raise TestFailure("iCmd bad allignement")
-              if int(dut.io_iCheck_payload_data) != 0x00000013 and int(dut.io_iCheck_payload_data) != 0x01c02023 and int(dut.io_iCheck_payload_data) != 0xffc02e23 :
-                for i in range(0,4):
-                  if self.rom[int(dut.io_iCheck_payload_address)+i] != ((int(dut.io_iCheck_payload_data) >> (i*8)) & 0xFF):
+              if i.io_iCheck_payload_data != 0x00000013 and i.io_iCheck_payload_data != 0x01c02023 and i.io_iCheck_payload_data != 0xffc02e23 :
+                for b in range(0,4):
+                  if self.rom[i.io_iCheck_payload_address+b] != ((i.io_iCheck_payload_data >> (b*8)) & 0xFF):
                       raise TestFailure("wrong instruction read")
 
 
@@ -183,7 +185,7 @@ class Tester:
     @cocotb.coroutine
     def do(self,iHexPath):
         loadIHex(iHexPath, self.rom)
-        cocotb.fork(simulationSpeedPrinter(self.dut.clk))
+        cocotb.fork(simulationSpeedRecorder(self.dut.clk))
         cocotb.fork(ClockDomainAsyncReset(self.dut.clk, self.dut.reset))
         cocotb.fork(self.driveMisc())
         cocotb.fork(self.driveIRsp())
@@ -3,9 +3,10 @@ from cocotb.regression import TestFactory
 from spinal.RiscvTester.RiscvTester import  isaTestsMemory, isaTestsMulDiv, isaTestsBase, testIsa
 
 from cocotblib.misc import cocotbXHack
+from spinal.common.Shard import shardTests
 from functools import reduce
 cocotbXHack()
 
 factory = TestFactory(testIsa)
-factory.add_option("iHexPath",  reduce(operator.add, [isaTestsBase, isaTestsMemory, isaTestsMulDiv]))
+factory.add_option("iHexPath",  shardTests(reduce(operator.add, [isaTestsBase, isaTestsMemory, isaTestsMulDiv])))
 factory.generate_tests()
@@ -2,8 +2,8 @@ import random
 import cocotb
 from cocotb.triggers import Timer
 
-from Verilog_VCD.Verilog_VCD import parse_vcd
 from spinal.SdramXdr.common.VcdLib import *
+from spinal.SdramXdr.common.WaveCache import waveImage
 
 
 @cocotb.test()
@@ -12,20 +12,22 @@ def test1(dut):
     from cocotblib.misc import cocotbXHack
     cocotbXHack()
 
-    forks = []
     def map(component, net, apply, delay = 0):
-        forks.append(cocotb.fork(stim(wave, component, net, apply, delay)))
+        return replay.add(component, net, apply, delay)
 
 
-    wave = parse_vcd("../../../../../../../simWorkspace/SdramXdrCtrlPlusRtlPhy/test.vcd")
     phy = "TOP.SdramXdrCtrlPlusRtlPhy"
     top = "TOP"
+    wave = waveImage("../../../../../../../simWorkspace/SdramXdrCtrlPlusRtlPhy/test.vcd")
+    replay = Replay(wave)
 
     yield Timer(0)
     phaseCount = getLastValue(wave, top, "phaseCount")
     dataRate = 2
     phaseDelay = 0
-    clockPeriod = getClockPeriod(wave, top, "clk")
+    clock = clockStats(wave, top, "clk")
+    clockPeriod = clock.period
+    dut._log.info("Trace clock : %s" % clock)
 
     cocotb.fork(genClock(dut.ck, dut.ck_n, clockPeriod//phaseCount))
 
@@ -38,7 +40,9 @@ def test1(dut):
     list(map(top, "WEn", lambda v : dut.we_n <= v))
     list(map(top, "ODT", lambda v : dut.odt <= v))
 
-    cocotb.fork(stimPulse(wave, top, "writeEnable", lambda v : cocotb.fork(genDqs(dut.dqs, dut.dqs_n, 1+v/clockPeriod*phaseCount*dataRate//2, clockPeriod//(phaseCount*dataRate)*(phaseCount*dataRate-1), clockPeriod//phaseCount))))
+    writeStarts, writeWidths = pulses(wave, top, "writeEnable")
+    dqsCycles = 1 + writeWidths*phaseCount*dataRate//(2*clockPeriod)
+    dqsDelay = clockPeriod//(phaseCount*dataRate)*(phaseCount*dataRate-1)
+    cocotb.fork(schedule(writeStarts, dqsCycles, lambda cycles : cocotb.fork(genDqs(dut.dqs, dut.dqs_n, cycles, dqsDelay, clockPeriod//phaseCount))))
 
-    for fork in forks:
-        yield fork
+    yield cocotb.fork(replay.run())
@@ -6,7 +6,8 @@ from cocotb.triggers import Timer
 from cocotblib.Apb3 import Apb3
 from cocotblib.Phase import PhaseManager, Infrastructure, PHASE_WAIT_TASKS_END
 from cocotblib.Scorboard import ScorboardInOrder
-from cocotblib.misc import simulationSpeedPrinter, randBits, BoolRandomizer
+from cocotblib.misc import randBits, BoolRandomizer
+from spinal.common.Metrics import simulationSpeedRecorder
 
 from cocotblib.Stream import StreamDriverSlave, StreamDriverMaster, Transaction, StreamMonitor, Stream
 from spinal.SdramXdr.common.Tester import Bmb, BmbMemoryTester
@@ -68,7 +69,7 @@ def test1(dut):
     cocotbXHack()
 
     cocotb.fork(ClockDomainAsyncResetCustom(3300, dut.clk0, dut.serdesClk0, dut.serdesClk90, dut.rst0))
-    cocotb.fork(simulationSpeedPrinter(dut.clk0))
+    cocotb.fork(simulationSpeedRecorder(dut.clk0))
 
 
 
@@ -2,8 +2,8 @@ import random
 import cocotb
 from cocotb.triggers import Timer
 
-from Verilog_VCD.Verilog_VCD import parse_vcd
 from spinal.SdramXdr.common.VcdLib import *
+from spinal.SdramXdr.common.WaveCache import waveImage
 
 
 @cocotb.test()
@@ -12,12 +12,12 @@ def test1(dut):
     from cocotblib.misc import cocotbXHack
     cocotbXHack()
 
-    forks = []
     def map(component, net, apply, delay = 0):
-        forks.append(cocotb.fork(stim(wave, component, net, apply, delay)))
+        return replay.add(component, net, apply, delay)
 
-    wave = parse_vcd("../../../../../../../simWorkspace/SdramXdrCtrlPlusRtlPhy/test.vcd")
     top = "TOP"
+    wave = waveImage("../../../../../../../simWorkspace/SdramXdrCtrlPlusRtlPhy/test.vcd")
+    replay = Replay(wave)
 
     yield Timer(0)
     phaseCount = getLastValue(wave, top, "phaseCount")
@@ -34,5 +34,4 @@ def test1(dut):
     list(map(top, "WEn", lambda v : dut.We_n <= v))
 
 
-    for fork in forks:
-        yield fork
+    yield cocotb.fork(replay.run())
@@ -6,7 +6,8 @@ from cocotb.triggers import Timer
 from cocotblib.Apb3 import Apb3
 from cocotblib.Phase import PhaseManager, Infrastructure, PHASE_WAIT_TASKS_END
 from cocotblib.Scorboard import ScorboardInOrder
-from cocotblib.misc import simulationSpeedPrinter, randBits, BoolRandomizer
+from cocotblib.misc import randBits, BoolRandomizer
+from spinal.common.Metrics import simulationSpeedRecorder
 
 from cocotblib.Stream import StreamDriverSlave, StreamDriverMaster, Transaction, StreamMonitor, Stream
 from spinal.SdramXdr.common.Tester import Bmb, BmbMemoryTester
@@ -33,7 +34,7 @@ def test1(dut):
     cocotbXHack()
 
     cocotb.fork(ClockDomainAsyncResetCustom(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
 
 
@@ -1,63 +1,371 @@
+import heapq
 import random
+import sys
+from array import array
+from collections import deque
+
 import cocotb
+import numpy as np
 from cocotb.triggers import Timer
 
 from Verilog_VCD.Verilog_VCD import parse_vcd
 
 
+UNKNOWN_BITS = str.maketrans("xXzZuUwW-", "000000000")
+
+
+def vcdValue(value):
+    """Integer of a VCD value, its x and z bits read as 0, a real value being truncated to 64 bits."""
+    try:
+        return int(value, 2)
+    except ValueError:
+        pass
+    try:
+        return int(value.translate(UNKNOWN_BITS), 2)
+    except ValueError:
+        return int(float(value)) & 0xFFFFFFFFFFFFFFFF
+
+
+class VcdNet:
+    """One net of a parse_vcd wave, its values are converted on first use."""
+    def __init__(self, net, netinfo):
+        self.hier = net["hier"]
+        self.name = net["name"]
+        self.tv = netinfo["tv"]
+        self._times = None
+        self._values = None
+
+    @property
+    def times(self):
+        if self._times is None:
+            self._times = array("q", (t for t, v in self.tv))
+        return self._times
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = [vcdValue(v) for t, v in self.tv]
+        return self._values
+
+    def changes(self):
+        return zip(self.times, self.values)
+
+    def head(self, count):
+        return [(t, vcdValue(v)) for t, v in self.tv[:count]]
+
+
+def prefixIndex(nets):
+    byPrefix = {}
+    for net in nets:
+        for length in range(len(net.name) + 1):
+            byPrefix.setdefault((net.hier, net.name[:length]), []).append(net)
+    return byPrefix
+
+
+class VcdIndex:
+    """Nets of a parse_vcd wave by (hier, name prefix), in the order the linear scans used to find them."""
+    def __init__(self, wave):
+        self.byPrefix = prefixIndex(VcdNet(net, netinfo) for netinfo in list(wave.values()) for net in netinfo['nets'])
+
+    def nets(self, componentName, netName):
+        return self.byPrefix.get((componentName, netName), [])
+
+    def net(self, componentName, netName):
+        nets = self.nets(componentName, netName)
+        return nets[0] if nets else None
+
+
+class StreamedNet:
+    def __init__(self, stream, hier, name, code, size = 1):
+        self.stream = stream
+        self.hier = hier
+        self.name = name
+        self.code = code
+        self.size = size
+        self.queues = []
+        self._head = []
+
+    def changes(self):
+        """(time, value) of the net in time order, read along with the other replayed nets."""
+        if not self.queues:
+            raise Exception("%s.%s isn't replayed, give it to the VcdStream" % (self.hier, self.name))
+        queue = self.queues.pop(0)
+        advance = self.stream.advance
+        while True:
+            while not queue:
+                if not advance():
+                    return
+            t, v = queue.popleft()
+            yield t, vcdValue(v)
+
+    def head(self, count):
+        """First changes of the net, read by a separate scan which stops as soon as they are found."""
+        if len(self._head) < count:
+            self._head = []
+            for t, code, v in self.stream.body():
+                if code == self.code:
+                    self._head.append((t, vcdValue(v)))
+                    if len(self._head) == count:
+                        break
+        return self._head[:count]
+
+
+class VcdStream:
+    """
+    Lazy alternative to parse_vcd for traces too big to be loaded. Only the header is parsed up front, the value
+    changes are read by a single pass over the file, shared by the replayed nets, which are the ones matching the
+    (hier, name prefix) of the replayed list, once per entry matching them. Each of them buffers the changes read ahead
+    of its consumer, so the memory stays proportional to the replayed nets and to how far apart in time their consumers
+    are.
+    """
+    def __init__(self, path, replayed = ()):
+        self.path = path
+        self.declared = []
+        with open(path, "rb") as f:
+            self.bodyOffset = self.readHeader(f)
+        self.byPrefix = prefixIndex(self.declared)
+        self.queues = {}
+        for componentName, netName in replayed:
+            for net in self.byPrefix.get((componentName, netName), []):
+                queue = deque()
+                net.queues.append(queue)
+                self.queues.setdefault(net.code, []).append(queue)
+        self.reader = None
+
+    def readHeader(self, f):
+        scopes = []
+        tokens = []
+        for line in iter(f.readline, b""):
+            tokens.extend(line.decode("ascii", "replace").split())
+            if not tokens or tokens[-1] != "$end":
+                continue
+            keyword = tokens[0]
+            if keyword == "$scope":
+                scopes.append(tokens[2])
+            elif keyword == "$upscope":
+                scopes.pop()
+            elif keyword == "$var":
+                # Same naming as parse_vcd, the reference followed by its bit range if any
+                self.declared.append(StreamedNet(self, ".".join(scopes), "".join(tokens[4:-1]), tokens[3].encode(), int(tokens[2])))
+            elif keyword == "$enddefinitions":
+                return f.tell()
+            tokens = []
+        raise Exception("%s : no $enddefinitions" % self.path)
+
+    def body(self):
+        """(time, code, value string) of every value change, in file order."""
+        with open(self.path, "rb") as f:
+            f.seek(self.bodyOffset)
+            time = 0
+            comment = False
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if comment:
+                    comment = not line.endswith(b"$end")
+                    continue
+                first = line[:1]
+                if first == b"#":
+                    time = int(line[1:])
+                elif first in b"bBrR":
+                    value, code = line[1:].split()
+                    yield time, code, value.decode()
+                elif first == b"$":
+                    comment = line.startswith(b"$comment") and not line.endswith(b"$end")
+                else:
+                    yield time, line[1:], first.decode()
+
+    def advance(self):
+        """Read the next change of a replayed net, return False at the end of the file."""
+        if self.reader is None:
+            self.reader = self.body()
+        queues = self.queues
+        for t, code, v in self.reader:
+            targets = queues.get(code)
+            if targets:
+                for queue in targets:
+                    queue.append((t, v))
+                return True
+        return False
+
+    def nets(self, componentName, netName):
+        return self.byPrefix.get((componentName, netName), [])
+
+    def net(self, componentName, netName):
+        nets = self.nets(componentName, netName)
+        return nets[0] if nets else None
+
+
+def vcdIndex(wave):
+    """
+    Index of the wave. A parse_vcd dictionary is indexed again at every call, so the callers doing many lookups keep
+    their own VcdIndex, VcdStream or WaveImage and give it instead.
+    """
+    if hasattr(wave, "byPrefix"):
+        return wave
+    return VcdIndex(wave)
+
+
 @cocotb.coroutine
 def stim(wave, componentName, netName, apply, delay = 0):
     yield Timer(delay)
-    for netinfo in list(wave.values()):
-        for net in netinfo['nets']:
-            if net["hier"] == componentName:
-                if net["name"].startswith(netName):
-                    time = 0
-                    for t, v in netinfo['tv']:
-                        yield Timer(t-time)
-                        apply(int(v, 2))
-                        time = t
+    for net in vcdIndex(wave).nets(componentName, netName):
+        time = 0
+        for t, v in net.changes():
+            yield Timer(t-time)
+            apply(v)
+            time = t
+
+def delayedChanges(nets, delay, order):
+    """(time, order, value) of the nets replayed one after the other from delay, like stim does."""
+    offset = delay
+    for net in nets:
+        t = 0
+        for t, v in net.changes():
+            yield offset + t, order, v
+        offset += t
+
+
+class Replay:
+    """
+    Replay of many nets from a single coroutine. The changes of all the nets are merged by time, and the ones due at the
+    same time are applied together after a single Timer, instead of one Timer per change of each net.
+    """
+    def __init__(self, wave):
+        self.index = vcdIndex(wave)
+        self.sources = []
+        self.applies = []
+
+    def add(self, componentName, netName, apply, delay = 0):
+        """Same arguments as stim, return the replayed nets."""
+        nets = self.index.nets(componentName, netName)
+        self.sources.append(delayedChanges(nets, delay, len(self.applies)))
+        self.applies.append(apply)
+        return nets
+
+    @cocotb.coroutine
+    def run(self):
+        applies = self.applies
+        time = None
+        for t, order, v in heapq.merge(*self.sources):
+            if t != time:
+                yield Timer(t - (time or 0))
+                time = t
+            applies[order](v)
+
+def netLevels(net):
+    """
+    Times of the changes of a net and their level as numpy arrays, the level being the value clamped to 2. The streamed
+    nets are read by a separate scan, so they don't have to be replayed.
+    """
+    if not hasattr(net, "times"):
+        changes = net.head(sys.maxsize)
+        return np.array([t for t, v in changes], dtype=np.int64), np.array([min(v, 2) for t, v in changes], dtype=np.int8)
+    times = np.asarray(net.times, dtype=np.int64)
+    values = net.values
+    if isinstance(values, np.ndarray) and values.ndim == 2:
+        # Little endian bytes of the nets wider than 64 bits
+        levels = np.where(values[:, 1:].any(axis=1), 2, np.minimum(values[:, 0], 2))
+    elif isinstance(values, np.ndarray):
+        levels = np.minimum(values, 2)
+    else:
+        levels = np.array([min(v, 2) for v in values])
+    return times, levels.astype(np.int8)
+
+
+def levelEdges(times, levels, rising):
+    """Times where the level goes from 0 to 1 (or 1 to 0), the net being 0 before its first change."""
+    previous = np.concatenate(([0], levels[:-1]))
+    before, after = (0, 1) if rising else (1, 0)
+    return times[(previous == before) & (levels == after)]
+
+
+def netPulses(net):
+    """Start time and width of the pulses of a net, a pulse being a change to 1 followed by a change to 0."""
+    times, levels = netLevels(net)
+    ends = np.flatnonzero((levels[1:] == 0) & (levels[:-1] == 1)) + 1
+    return times[ends - 1], times[ends] - times[ends - 1]
+
+
+def pulses(wave, componentName, netName):
+    """
+    Start time and width of the pulses of all the nets matching the prefix. Like stim, the nets are replayed one after
+    the other : the pulses of a net start from the last pulse start of the previous ones.
+    """
+    allStarts = [np.zeros(0, dtype=np.int64)]
+    allWidths = [np.zeros(0, dtype=np.int64)]
+    offset = 0
+    for net in vcdIndex(wave).nets(componentName, netName):
+        starts, widths = netPulses(net)
+        allStarts.append(starts + offset)
+        allWidths.append(widths)
+        if len(starts):
+            offset += int(starts[-1])
+    return np.concatenate(allStarts), np.concatenate(allWidths)
+
+
+class ClockStats:
+    """Period (median of the rising to rising intervals), jitter and duty cycle of a clock net."""
+    def __init__(self, rising, falling):
+        periods = np.diff(rising)
+        median = float(np.median(periods))
+        self.cycles = len(periods)
+        self.period = int(round(median))
+        self.jitter = float(np.std(periods))
+        self.peakJitter = float(np.max(np.abs(periods - median)))
+        # High time of each cycle, from its rising edge to the next falling edge
+        following = np.searchsorted(falling, rising[:-1])
+        valid = following < len(falling)
+        highs = falling[following[valid]] - rising[:-1][valid]
+        self.duty = float(np.median(highs)) / median if len(highs) and median else 0.0
+
+    def __repr__(self):
+        return "period %d over %d cycles, jitter %.2f (peak %.2f), duty %.3f" % (self.period, self.cycles, self.jitter, self.peakJitter, self.duty)
+
+
+def clockStats(wave, componentName, netName):
+    """ClockStats of the net, None if it doesn't exist or has less than two rising edges."""
+    net = vcdIndex(wave).net(componentName, netName)
+    if net is None:
+        return None
+    times, levels = netLevels(net)
+    rising = levelEdges(times, levels, True)
+    if len(rising) < 2:
+        return None
+    return ClockStats(rising, levelEdges(times, levels, False))
+
+
+@cocotb.coroutine
+def schedule(times, values, apply):
+    """Apply each value at its time (numpy arrays or lists), starting from the current time."""
+    time = 0
+    for t, v in zip(np.asarray(times).tolist(), np.asarray(values).tolist()):
+        yield Timer(t - time)
+        apply(v)
+        time = t
 
 @cocotb.coroutine
 def stimPulse(wave, componentName, netName, apply):
-    for netinfo in list(wave.values()):
-        for net in netinfo['nets']:
-            if net["hier"] == componentName:
-                if net["name"].startswith(netName):
-                    time = 0
-                    previousV = 0
-                    previousT = 0
-                    for t, v in netinfo['tv']:
-                        current = int(v, 2)
-                        if current == 0 and previousV == 1:
-                            yield Timer(previousT - time)
-                            apply(t - previousT)
-                            time = previousT
-                        previousT = t
-                        previousV = current
+    starts, widths = pulses(wave, componentName, netName)
+    time = 0
+    for t, width in zip(starts.tolist(), widths.tolist()):
+        yield Timer(t - time)
+        apply(width)
+        time = t
 
 def getClockPeriod(wave, componentName, netName):
-    for netinfo in list(wave.values()):
-        for net in netinfo['nets']:
-            if net["hier"] == componentName:
-                if net["name"].startswith(netName):
-                    return netinfo['tv'][102][0]-netinfo['tv'][100][0]
+    stats = clockStats(wave, componentName, netName)
+    if stats is not None:
+        return stats.period
 
 def countSignal(wave, componentName, prefix, postfix):
-    count = 0
-    for netinfo in list(wave.values()):
-        for net in netinfo['nets']:
-            if net["hier"] == componentName:
-                if net["name"].startswith(prefix) and net["name"].endswith(postfix):
-                    count += 1
-    return count
+    return sum(1 for net in vcdIndex(wave).nets(componentName, prefix) if net.name.endswith(postfix))
 
 def getLastValue(wave, componentName, netName):
-    for netinfo in list(wave.values()):
-        for net in netinfo['nets']:
-            if net["hier"] == componentName:
-                if net["name"].startswith(netName):
-                    return int(netinfo['tv'][0][1], 2)
+    net = vcdIndex(wave).net(componentName, netName)
+    if net is not None:
+        return net.head(1)[0][1]
     raise Exception("????")
 
 @cocotb.coroutine
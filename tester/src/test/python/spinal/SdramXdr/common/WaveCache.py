@@ -0,0 +1,317 @@
+"""
+Columnar binary cache of the VCD traces replayed by the SdramXdr model testers.
+
+The same test.vcd is replayed against the DDR2, DDR3 and SDR models again and again, and parsing its text was paid by
+every run. The first time a trace is loaded, it is converted into a wave image holding for each net a column of times
+(int64) and a column of packed values (uint64, or little endian bytes for the nets wider than 64 bits), stored in
+SPINAL_WAVE_CACHE (<tmp>/spinalWaveCache by default) under the hash of its content. Later loads memory-map the image,
+so only the pages of the replayed nets are ever read. The hash of a trace is itself remembered under its path, mtime
+and size, so an unchanged trace isn't read at all.
+
+The conversion is a single pass over the trace which spools the columns to disk every SPOOL_ENTRIES changes, so its
+memory doesn't grow with the trace. The images are evicted in least recently used order once the cache grows beyond
+SPINAL_WAVE_CACHE_SIZE (8192 MB by default).
+
+The x and z bits of the trace are stored as 0, and the real values are truncated to integers.
+
+The image has the same nets(), net() lookups as a VcdIndex, and can be given to the VcdLib helpers as the wave.
+
+Usage :
+    wave = waveImage("../../../../../../../simWorkspace/SdramXdrCtrlPlusRtlPhy/test.vcd")
+    cocotb.fork(stim(wave, "TOP", "ADDR", lambda v : dut.addr <= v))
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+from array import array
+
+import numpy as np
+
+from spinal.SdramXdr.common.VcdLib import VcdStream, prefixIndex, vcdValue
+
+MAGIC = b"SPXWAVE1"
+HEADER = struct.Struct("<8sQ")
+CHUNK = 4096
+SPOOL_ENTRIES = 1 << 20
+
+
+def valuesArray(width, count, buffer, offset = 0):
+    if width == 8:
+        return np.frombuffer(buffer, dtype="<u8", count=count, offset=offset)
+    return np.frombuffer(buffer, dtype=np.uint8, count=count * width, offset=offset).reshape(count, width)
+
+
+class WaveNet:
+    """One net of a wave image, its columns are numpy views of the mapped file."""
+    def __init__(self, hier, name, times, values):
+        self.hier = hier
+        self.name = name
+        self.times = times
+        self.values = values
+
+    def value(self, index):
+        values = self.values
+        if values.ndim == 1:
+            return int(values[index])
+        return int.from_bytes(values[index].tobytes(), "little")
+
+    def changes(self):
+        times = self.times
+        values = self.values
+        for start in range(0, len(times), CHUNK):
+            chunkTimes = times[start:start + CHUNK].tolist()
+            if values.ndim == 1:
+                chunkValues = values[start:start + CHUNK].tolist()
+            else:
+                chunkValues = [int.from_bytes(row.tobytes(), "little") for row in values[start:start + CHUNK]]
+            yield from zip(chunkTimes, chunkValues)
+
+    def head(self, count):
+        return [(int(self.times[index]), self.value(index)) for index in range(min(count, len(self.times)))]
+
+
+class WaveImage:
+    def __init__(self, nets, buffer = None):
+        self.buffer = buffer
+        self.byPrefix = prefixIndex(nets)
+
+    def nets(self, componentName, netName):
+        return self.byPrefix.get((componentName, netName), [])
+
+    def net(self, componentName, netName):
+        nets = self.nets(componentName, netName)
+        return nets[0] if nets else None
+
+
+class Column:
+    """Times and values of one identifier code, spooled to two files so the conversion memory stays bounded."""
+    def __init__(self, spoolPath, width):
+        self.spoolPath = spoolPath
+        self.width = width
+        self.count = 0
+        self.times = array("q")
+        self.values = array("Q") if width == 8 else bytearray()
+        self.mask = (1 << (8 * width)) - 1
+
+    def append(self, t, value):
+        self.times.append(t)
+        value &= self.mask
+        if self.width == 8:
+            self.values.append(value)
+        else:
+            self.values += value.to_bytes(self.width, "little")
+        self.count += 1
+
+    def buffered(self):
+        return len(self.times)
+
+    def spool(self):
+        if not self.times:
+            return
+        with open(self.spoolPath + ".t", "ab") as f:
+            f.write(self.times.tobytes())
+        with open(self.spoolPath + ".v", "ab") as f:
+            f.write(self.values if self.width != 8 else self.values.tobytes())
+        self.times = array("q")
+        self.values = array("Q") if self.width == 8 else bytearray()
+
+    def copyTo(self, f):
+        """Write the spooled times then values, return the number of bytes written."""
+        written = 0
+        for suffix in (".t", ".v"):
+            if os.path.exists(self.spoolPath + suffix):
+                with open(self.spoolPath + suffix, "rb") as spool:
+                    shutil.copyfileobj(spool, f, 1 << 20)
+                written += os.path.getsize(self.spoolPath + suffix)
+        return written
+
+
+def convertTrace(vcdPath, imagePath):
+    """Convert a VCD file into a wave image, in a single pass holding at most SPOOL_ENTRIES changes in memory."""
+    stream = VcdStream(vcdPath)
+    spoolDir = imagePath + ".%d.%d.spool" % (os.getpid(), threading.get_ident())
+    os.makedirs(spoolDir)
+    try:
+        widths = {}
+        for net in stream.declared:
+            widths[net.code] = max(widths.get(net.code, 8), (net.size + 7) // 8)
+        columns = {code : Column(os.path.join(spoolDir, str(index)), width) for index, (code, width) in enumerate(widths.items())}
+        buffered = 0
+        for t, code, v in stream.body():
+            column = columns.get(code)
+            if column is None:
+                continue
+            column.append(t, vcdValue(v))
+            buffered += 1
+            if buffered == SPOOL_ENTRIES:
+                for column in columns.values():
+                    column.spool()
+                buffered = 0
+        for column in columns.values():
+            column.spool()
+        writeImage(imagePath, stream.declared, columns)
+    finally:
+        shutil.rmtree(spoolDir, ignore_errors=True)
+
+
+def writeImage(path, declared, columns):
+    codes = {code : index for index, code in enumerate(columns)}
+    layout = []
+    offset = 0
+    for column in columns.values():
+        layout.append({"times" : offset, "values" : offset + 8 * column.count, "count" : column.count, "width" : column.width})
+        offset += 8 * column.count + column.width * column.count
+        offset += -offset % 8
+    header = json.dumps({
+        "nets" : [[net.hier, net.name, codes[net.code]] for net in declared],
+        "columns" : layout
+    }).encode()
+    header += b" " * (-(HEADER.size + len(header)) % 8)
+    tmp = path + ".%d.%d.tmp" % (os.getpid(), threading.get_ident())
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            for column in columns.values():
+                written = column.copyTo(f)
+                f.write(b"\0" * (-written % 8))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def mapImage(path):
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, headerSize = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("%s isn't a wave image" % path)
+    header = json.loads(bytes(buffer[HEADER.size:HEADER.size + headerSize]))
+    base = HEADER.size + headerSize
+    columns = []
+    for column in header["columns"]:
+        count = column["count"]
+        times = np.frombuffer(buffer, dtype="<i8", count=count, offset=base + column["times"])
+        columns.append((times, valuesArray(column["width"], count, buffer, base + column["values"])))
+    return WaveImage([WaveNet(hier, name, *columns[index]) for hier, name, index in header["nets"]], buffer)
+
+
+def cachePath():
+    return os.getenv("SPINAL_WAVE_CACHE", os.path.join(tempfile.gettempdir(), "spinalWaveCache"))
+
+
+def cacheSize():
+    return int(os.getenv("SPINAL_WAVE_CACHE_SIZE", "8192")) << 20
+
+
+def touch(path):
+    """Mark a cached image as recently used, for the eviction."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict(keep):
+    """Remove the least recently used images beyond the size cap, and the trace hashes pointing to removed images."""
+    images = []
+    for name in os.listdir(cachePath()):
+        entry = os.path.join(cachePath(), name)
+        if name.endswith(".wave") and entry != keep:
+            try:
+                images.append((os.path.getmtime(entry), os.path.getsize(entry), entry))
+            except OSError:
+                pass
+    total = sum(size for _, size, _ in images) + (os.path.getsize(keep) if os.path.exists(keep) else 0)
+    for _, size, entry in sorted(images):
+        if total <= cacheSize():
+            break
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
+        total -= size
+    for name in os.listdir(cachePath()):
+        if not name.endswith(".key"):
+            continue
+        entry = os.path.join(cachePath(), name)
+        try:
+            with open(entry) as f:
+                digest = f.read().strip()
+            if not os.path.exists(os.path.join(cachePath(), digest + ".wave")):
+                os.remove(entry)
+        except OSError:
+            pass
+
+
+def hashFile(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def contentHash(path, stat):
+    """Hash of the trace content, remembered under its path, mtime and size."""
+    statKey = hashlib.sha256(("%s %d %d" % (path, stat.st_mtime_ns, stat.st_size)).encode()).hexdigest()
+    statPath = os.path.join(cachePath(), statKey + ".key")
+    try:
+        with open(statPath) as f:
+            digest = f.read().strip()
+        if len(digest) == 64:
+            return digest
+    except OSError:
+        pass
+    digest = hashFile(path)
+    try:
+        os.makedirs(cachePath(), exist_ok=True)
+        tmp = statPath + ".%d.%d.tmp" % (os.getpid(), threading.get_ident())
+        with open(tmp, "w") as f:
+            f.write(digest)
+        os.replace(tmp, statPath)
+    except OSError:
+        pass
+    return digest
+
+
+imagesByFile = {}
+
+
+def waveImage(path):
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    memoKey = (path, stat.st_mtime_ns, stat.st_size)
+    image = imagesByFile.get(memoKey)
+    if image is not None:
+        return image
+
+    imagePath = os.path.join(cachePath(), contentHash(path, stat) + ".wave")
+    try:
+        image = mapImage(imagePath)
+        touch(imagePath)
+    except (OSError, ValueError, struct.error):
+        try:
+            os.makedirs(cachePath(), exist_ok=True)
+            convertTrace(path, imagePath)
+            evict(imagePath)
+            image = mapImage(imagePath)
+        except OSError:
+            # No usable cache directory, convert into a temporary image which lives as long as its mapping
+            fd, imagePath = tempfile.mkstemp(suffix=".wave")
+            os.close(fd)
+            try:
+                convertTrace(path, imagePath)
+                image = mapImage(imagePath)
+            finally:
+                os.remove(imagePath)
+    imagesByFile[memoKey] = image
+    return image
@@ -11,8 +11,9 @@ from cocotblib.Apb3 import Apb3
 from cocotblib.Flow import Flow
 from cocotblib.Spi import SpiMaster
 from cocotblib.Stream import Stream, StreamDriverMaster, Transaction
-from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, simulationSpeedPrinter, clockedWaitTrue, Bundle, randBits, randBool, SimulationTimeout, TimerClk, testBit, \
+from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, clockedWaitTrue, Bundle, randBits, randBool, SimulationTimeout, TimerClk, testBit, \
     setBit
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 class SlaveCmdData:
@@ -240,7 +241,7 @@ def spiSlaveAgent(spi, queue, clk):
 @cocotb.test()
 def test1(dut):
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset,1000))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
     cocotb.fork(SimulationTimeout(1000*20e3))
 
     apb = Apb3(dut, "io_apb", dut.clk)
@@ -11,7 +11,8 @@ from cocotblib.Apb3 import Apb3
 from cocotblib.Flow import Flow
 from cocotblib.Spi import SpiMaster, SpiSlave, SpiSlaveMaster
 from cocotblib.Stream import Stream, StreamDriverMaster, Transaction
-from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, simulationSpeedPrinter, clockedWaitTrue, Bundle, randBits, randBool, SimulationTimeout, TimerClk, testBit
+from cocotblib.misc import assertEquals, randInt, ClockDomainAsyncReset, clockedWaitTrue, Bundle, randBits, randBool, SimulationTimeout, TimerClk, testBit
+from spinal.common.Metrics import simulationSpeedRecorder
 
 
 
@@ -153,7 +154,7 @@ def restart(dut):
 @cocotb.test()
 def test1(dut):
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset,1000))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
     cocotb.fork(SimulationTimeout(1000*20e3))
 
     apb = Apb3(dut, "io_apb", dut.clk)
@@ -1,66 +1,70 @@
 import random
-from queue import Queue
 
 import cocotb
 from cocotb.result import TestFailure
-from cocotb.triggers import RisingEdge, FallingEdge
 
-from cocotblib.misc import randSignal, assertEquals, ClockDomainAsyncReset, BoolRandomizer, StreamRandomizer,StreamReader, FlowRandomizer
-from functools import reduce
+from cocotblib.misc import assertEquals, ClockDomainAsyncReset
 
+from spinal.common.ClockDispatcher import ClockDispatcher
+from spinal.common.Completion import Completion
+from spinal.common.Rng import BoolRandomizer, agentRng
+from spinal.common.Scoreboard import Scoreboard, Packing
+from spinal.common.Soak import SoakReport, soakCount, soaking, backlogLimit
+from spinal.common.StreamAgents import StreamRandomizer, StreamReader, FlowRandomizer
 
-class FifoPacket:
-    def __init__(self,a,b):
-        self.a = a
-        self.b = b
 
 class Fifo:
-    def __init__(self,dut):
-        self.queue = Queue()
+    def __init__(self,dut,dispatcher):
+        self.packing = Packing([len(dut.io_slave0_payload_a), len(dut.io_slave0_payload_b)])
+        self.queue = Scoreboard(self.packing.width, "Fifo", limit=backlogLimit())
+        self.done = Completion(soakCount(1000), "Fifo")
         self.dut = dut
+        self.dispatcher = dispatcher
+        self.widths = dispatcher.widths
+        self.pushRng = agentRng("io_slave0")
+        self.validRandomizer = BoolRandomizer(self.pushRng)
+        self.readyRandomizer = BoolRandomizer(agentRng("io_master0"))
+        self.readyValue = 0
 
     @cocotb.coroutine
     def run(self):
-        cocotb.fork(self.push())
-        yield self.pop()
+        self.dut.io_slave0_valid <= 0
+        self.dut.io_master0_ready <= 0
+        self.dispatcher.onRisingEdge(self.push)
+        self.dispatcher.onRisingEdge(self.pop)
+        yield self.done.wait()
 
-    @cocotb.coroutine
     def push(self):
         dut = self.dut
-        queue = self.queue
-        validRandomizer = BoolRandomizer()
-        dut.io_slave0_valid <= 0
-        while True:
-            yield RisingEdge(dut.clk)
-            if int(dut.io_slave0_valid) == 1 and int(dut.io_slave0_ready) == 1:
-                queue.put(FifoPacket(int(dut.io_slave0_payload_a), int(dut.io_slave0_payload_b)))
-            dut.io_slave0_valid <= validRandomizer.get()
-            randSignal(dut.io_slave0_payload_a)
-            randSignal(dut.io_slave0_payload_b)
+        widths = self.widths
+        if int(dut.io_slave0_valid) == 1 and int(dut.io_slave0_ready) == 1:
+            self.queue.put(self.packing.pack(dut.io_slave0_payload_a, dut.io_slave0_payload_b))
+        dut.io_slave0_valid <= self.validRandomizer.get()
+        widths.rand(dut.io_slave0_payload_a, self.pushRng)
+        widths.rand(dut.io_slave0_payload_b, self.pushRng)
 
-    @cocotb.coroutine
     def pop(self):
         dut = self.dut
-        queue = self.queue
-        readyRandomizer = BoolRandomizer()
-        dut.io_master0_ready <= 0
-        for i in range(0,1000):
-            while True:
-                yield RisingEdge(dut.clk)
-                dut.io_master0_ready <= readyRandomizer.get()
-                if int(dut.io_master0_valid) == 1 and int(dut.io_master0_ready) == 1:
-                    break
-            pop = queue.get()
-            assertEquals(pop.a, dut.io_master0_payload_a,"io_master0_payload_a")
-            assertEquals(pop.b, dut.io_master0_payload_b, "io_master0_payload_b")
+        fire = self.readyValue and int(dut.io_master0_valid) == 1
+        self.readyValue = self.readyRandomizer.get()
+        dut.io_master0_ready <= self.readyValue
+        if fire:
+            a, b = self.packing.unpack(self.queue.get())
+            assertEquals(a, dut.io_master0_payload_a,"io_master0_payload_a")
+            assertEquals(b, dut.io_master0_payload_b, "io_master0_payload_b")
+            self.done.increment()
+            if self.done.done():
+                # The ready is then left as is, like when the pop coroutine ended
+                self.dispatcher.remove(self.pop)
 
 
 
 class Fork:
-    def __init__(self,dut):
-        self.queues = [Queue() for i in range(0,3)]
-        self.counters = [0 for i in range (0,3)]
+    def __init__(self,dut,dispatcher):
+        self.queues = [Scoreboard(len(dut.forkInput_payload), "Fork output %d" % i, limit=backlogLimit()) for i in range(0,3)]
+        self.done = [Completion(soakCount(1000) + 1, "Fork output %d" % i) for i in range(0,3)]
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInput(self,payload,handle):
         for queue in self.queues:
@@ -68,25 +72,26 @@ class Fork:
 
     def onOutput(self,payload,portId):
         assertEquals(payload,self.queues[portId].get(),"fork error")
-        self.counters[portId] += 1
+        self.done[portId].increment()
 
     @cocotb.coroutine
     def run(self):
-        cocotb.fork(StreamRandomizer("forkInput", self.onInput,None, self.dut, self.dut.clk))
+        StreamRandomizer("forkInput", self.onInput,None, self.dut, self.dispatcher)
         for idx in range(0,3):
-            cocotb.fork(StreamReader("forkOutputs_" + str(idx), self.onOutput, idx, self.dut, self.dut.clk))
+            StreamReader("forkOutputs_" + str(idx), self.onOutput, idx, self.dut, self.dispatcher)
 
-        while not reduce(lambda x,y: x and y, [x > 1000 for x in self.counters]):
-            yield RisingEdge(self.dut.clk)
+        for done in self.done:
+            yield done.wait()
 
 
 
 class DispatcherInOrder:
-    def __init__(self,dut):
-        self.queue = Queue()
-        self.counter = 0
+    def __init__(self,dut,dispatcher):
+        self.queue = Scoreboard(len(dut.dispatcherInOrderInput_payload), "DispatcherInOrder", limit=backlogLimit())
+        self.done = Completion(soakCount(1000), "DispatcherInOrder")
         self.nextPort = 0
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInput(self,payload,handle):
         self.queue.put(payload)
@@ -95,22 +100,22 @@ class DispatcherInOrder:
         assertEquals(payload,self.queue.get(),"DispatcherInOrder payload error")
         assertEquals(portId,self.nextPort,"DispatcherInOrder order error")
         self.nextPort = (self.nextPort + 1) % 3
-        self.counter += 1
+        self.done.increment()
 
     @cocotb.coroutine
     def run(self):
-        cocotb.fork(StreamRandomizer("dispatcherInOrderInput", self.onInput,None, self.dut, self.dut.clk))
+        StreamRandomizer("dispatcherInOrderInput", self.onInput,None, self.dut, self.dispatcher)
         for idx in range(0,3):
-            cocotb.fork(StreamReader("dispatcherInOrderOutputs_" + str(idx), self.onOutput, idx, self.dut, self.dut.clk))
+            StreamReader("dispatcherInOrderOutputs_" + str(idx), self.onOutput, idx, self.dut, self.dispatcher)
 
-        while self.counter < 1000:
-            yield RisingEdge(self.dut.clk)
+        yield self.done.wait()
 
 class StreamFlowArbiter:
-    def __init__(self,dut):
-        self.inputStreamCounter = 0
-        self.inputFlowCounter = 0
+    def __init__(self,dut,dispatcher):
+        self.inputStreamDone = Completion(soakCount(1000) + 1, "StreamFlowArbiter stream")
+        self.inputFlowDone = Completion(soakCount(1000) + 1, "StreamFlowArbiter flow")
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInputStream(self,payload,handle):
         pass
@@ -118,34 +123,40 @@ class StreamFlowArbiter:
     def onInputFlow(self,payload,handle):
         pass
 
+    def check(self):
+        dut = self.dut
+        if int(dut.streamFlowArbiterOutput_valid) == 1:
+            if int(dut.streamFlowArbiterInputFlow_valid) == 1:
+                assertEquals(dut.streamFlowArbiterOutput_payload,dut.streamFlowArbiterInputFlow_payload,"StreamFlowArbiter payload error")
+                assertEquals(0, dut.streamFlowArbiterInputStream_ready, "StreamFlowArbiter arbitration error")
+                self.inputFlowDone.increment()
+            else:
+                assertEquals(dut.streamFlowArbiterOutput_payload,dut.streamFlowArbiterInputStream_payload,"StreamFlowArbiter payload error")
+                assertEquals(0, dut.streamFlowArbiterInputFlow_valid, "StreamFlowArbiter arbitration error")
+                self.inputStreamDone.increment()
+        if self.inputFlowDone.done() and self.inputStreamDone.done():
+            self.dispatcher.remove(self.check)
 
     @cocotb.coroutine
     def run(self):
         dut = self.dut
-        cocotb.fork(StreamRandomizer("streamFlowArbiterInputStream", self.onInputStream, None, dut, dut.clk))
-        cocotb.fork(FlowRandomizer("streamFlowArbiterInputFlow", self.onInputFlow, None, dut, dut.clk))
+        StreamRandomizer("streamFlowArbiterInputStream", self.onInputStream, None, dut, self.dispatcher)
+        FlowRandomizer("streamFlowArbiterInputFlow", self.onInputFlow, None, dut, self.dispatcher)
+        self.dispatcher.onRisingEdge(self.check)
 
-        while not (self.inputFlowCounter > 1000 and self.inputStreamCounter > 1000):
-            yield RisingEdge(dut.clk)
-            if int(dut.streamFlowArbiterOutput_valid) == 1:
-                if int(dut.streamFlowArbiterInputFlow_valid) == 1:
-                    assertEquals(dut.streamFlowArbiterOutput_payload,dut.streamFlowArbiterInputFlow_payload,"StreamFlowArbiter payload error")
-                    assertEquals(0, dut.streamFlowArbiterInputStream_ready, "StreamFlowArbiter arbitration error")
-                    self.inputFlowCounter += 1
-                else:
-                    assertEquals(dut.streamFlowArbiterOutput_payload,dut.streamFlowArbiterInputStream_payload,"StreamFlowArbiter payload error")
-                    assertEquals(0, dut.streamFlowArbiterInputFlow_valid, "StreamFlowArbiter arbitration error")
-                    self.inputStreamCounter += 1
+        yield self.inputFlowDone.wait()
+        yield self.inputStreamDone.wait()
 
 
 
 
 class ArbiterInOrder:
-    def __init__(self,dut):
-        self.queues = [Queue() for i in range(0,3)]
-        self.counter = 0
+    def __init__(self,dut,dispatcher):
+        self.queues = [Scoreboard(len(getattr(dut, "arbiterInOrderInputs_%d_payload" % i)), "ArbiterInOrder input %d" % i, limit=backlogLimit()) for i in range(0,3)]
+        self.done = Completion(soakCount(1000), "ArbiterInOrder")
         self.nextPort = 0
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInput(self,payload,portId):
         self.queues[portId].put(payload)
@@ -153,63 +164,60 @@ class ArbiterInOrder:
     def onOutput(self,payload,portId):
         assertEquals(payload,self.queues[self.nextPort].get(),"ArbiterInOrder payload error")
         self.nextPort = (self.nextPort + 1) % 3
-        self.counter += 1
+        self.done.increment()
 
     @cocotb.coroutine
     def run(self):
         for idx in range(0,3):
-            cocotb.fork(StreamRandomizer("arbiterInOrderInputs_" + str(idx), self.onInput ,idx, self.dut, self.dut.clk))
+            StreamRandomizer("arbiterInOrderInputs_" + str(idx), self.onInput ,idx, self.dut, self.dispatcher)
 
-        cocotb.fork(StreamReader("arbiterInOrderOutput", self.onOutput, idx, self.dut, self.dut.clk))
+        StreamReader("arbiterInOrderOutput", self.onOutput, idx, self.dut, self.dispatcher)
 
-        while self.counter < 1000:
-            yield RisingEdge(self.dut.clk)
+        yield self.done.wait()
 
 class ArbiterLowIdPortFirst:
-    def __init__(self,dut):
-        self.queues = [Queue() for i in range(0,3)]
+    def __init__(self,dut,dispatcher):
+        self.queues = [Scoreboard(len(getattr(dut, "arbiterLowIdPortFirstInputs_%d_payload" % i)), "ArbiterLowIdPortFirst input %d" % i, limit=backlogLimit()) for i in range(0,3)]
         self.nextPort = -1
-        self.counter = 0
+        self.done = Completion(soakCount(1000), "ArbiterLowIdPortFirst")
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInput(self,payload,portId):
         self.queues[portId].put(payload)
 
     def onOutput(self,payload,dummy):
         assertEquals(payload,self.queues[self.nextPort].get(),"ArbiterLowIdPortFirst payload error")
-        self.counter += 1
+        self.done.increment()
         self.nextPort = -1
 
-    @cocotb.coroutine
     def arbitration(self):
-        while True:
-            yield FallingEdge(self.dut.clk)
-            if self.nextPort == -1:
-                if int(self.dut.arbiterLowIdPortFirstInputs_0_valid) == 1:
-                    self.nextPort = 0
-                elif int(self.dut.arbiterLowIdPortFirstInputs_1_valid) == 1:
-                    self.nextPort = 1
-                elif int(self.dut.arbiterLowIdPortFirstInputs_2_valid) == 1:
-                    self.nextPort = 2
+        if self.nextPort == -1:
+            if int(self.dut.arbiterLowIdPortFirstInputs_0_valid) == 1:
+                self.nextPort = 0
+            elif int(self.dut.arbiterLowIdPortFirstInputs_1_valid) == 1:
+                self.nextPort = 1
+            elif int(self.dut.arbiterLowIdPortFirstInputs_2_valid) == 1:
+                self.nextPort = 2
 
     @cocotb.coroutine
     def run(self):
         dut = self.dut
         for idx in range(0,3):
-            cocotb.fork(StreamRandomizer("arbiterLowIdPortFirstInputs_" + str(idx), self.onInput ,idx, self.dut, self.dut.clk))
-        cocotb.fork(StreamReader("arbiterLowIdPortFirstOutput", self.onOutput, idx, self.dut, self.dut.clk))
-        cocotb.fork(self.arbitration())
+            StreamRandomizer("arbiterLowIdPortFirstInputs_" + str(idx), self.onInput ,idx, self.dut, self.dispatcher)
+        StreamReader("arbiterLowIdPortFirstOutput", self.onOutput, idx, self.dut, self.dispatcher)
+        self.dispatcher.onFallingEdge(self.arbitration)
 
-        while self.counter < 1000:
-            yield RisingEdge(dut.clk)
+        yield self.done.wait()
 
 class ArbiterRoundRobin:
-    def __init__(self,dut):
-        self.queues = [Queue() for i in range(0,3)]
+    def __init__(self,dut,dispatcher):
+        self.queues = [Scoreboard(len(getattr(dut, "arbiterRoundRobinInputs_%d_payload" % i)), "ArbiterRoundRobin input %d" % i, limit=backlogLimit()) for i in range(0,3)]
         self.nextPort = -1
         self.previousPort = 2
-        self.counter = 0
+        self.done = Completion(soakCount(1000), "ArbiterRoundRobin")
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInput(self,payload,portId):
         self.queues[portId].put(payload)
@@ -218,86 +226,80 @@ class ArbiterRoundRobin:
         if self.queues[self.nextPort].empty():
             raise TestFailure("ArbiterRoundRobin Empty queue")
         assertEquals(payload,self.queues[self.nextPort].get(),"ArbiterRoundRobin payload error")
-        self.counter += 1
+        self.done.increment()
         self.previousPort = self.nextPort
         self.nextPort = -1
 
 
-    @cocotb.coroutine
     def arbitration(self):
-        while True:
-            yield FallingEdge(self.dut.clk)
-            if self.nextPort == -1:
-                if self.previousPort < 1 and int(self.dut.arbiterRoundRobinInputs_1_valid) == 1:
-                    self.nextPort = 1
-                elif self.previousPort < 2 and int(self.dut.arbiterRoundRobinInputs_2_valid) == 1:
-                    self.nextPort = 2
-                elif int(self.dut.arbiterRoundRobinInputs_0_valid) == 1:
-                    self.nextPort = 0
-                elif int(self.dut.arbiterRoundRobinInputs_1_valid) == 1:
-                    self.nextPort = 1
-                elif int(self.dut.arbiterRoundRobinInputs_2_valid) == 1:
-                    self.nextPort = 2
+        if self.nextPort == -1:
+            if self.previousPort < 1 and int(self.dut.arbiterRoundRobinInputs_1_valid) == 1:
+                self.nextPort = 1
+            elif self.previousPort < 2 and int(self.dut.arbiterRoundRobinInputs_2_valid) == 1:
+                self.nextPort = 2
+            elif int(self.dut.arbiterRoundRobinInputs_0_valid) == 1:
+                self.nextPort = 0
+            elif int(self.dut.arbiterRoundRobinInputs_1_valid) == 1:
+                self.nextPort = 1
+            elif int(self.dut.arbiterRoundRobinInputs_2_valid) == 1:
+                self.nextPort = 2
 
     @cocotb.coroutine
     def run(self):
         dut = self.dut
         for idx in range(0,3):
-            cocotb.fork(StreamRandomizer("arbiterRoundRobinInputs_" + str(idx), self.onInput ,idx, self.dut, self.dut.clk))
-        cocotb.fork(StreamReader("arbiterRoundRobinOutput", self.onOutput, idx, self.dut, self.dut.clk))
-        cocotb.fork(self.arbitration())
+            StreamRandomizer("arbiterRoundRobinInputs_" + str(idx), self.onInput ,idx, self.dut, self.dispatcher)
+        StreamReader("arbiterRoundRobinOutput", self.onOutput, idx, self.dut, self.dispatcher)
+        self.dispatcher.onFallingEdge(self.arbitration)
 
-        while self.counter < 1000:
-            yield RisingEdge(dut.clk)
+        yield self.done.wait()
 
 
 class ArbiterLowIdPortNoLockFirst:
-    def __init__(self,dut):
-        self.queues = [Queue() for i in range(0,3)]
+    def __init__(self,dut,dispatcher):
+        self.queues = [Scoreboard(len(getattr(dut, "arbiterLowIdPortFirstNoLockInputs_%d_payload" % i)), "ArbiterLowIdPortNoLockFirst input %d" % i, limit=backlogLimit()) for i in range(0,3)]
         self.nextPort = -1
-        self.counter = 0
+        self.done = Completion(soakCount(1000), "ArbiterLowIdPortNoLockFirst")
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInput(self,payload,portId):
         self.queues[portId].put(payload)
 
     def onOutput(self,payload,portId):
         assertEquals(payload,self.queues[self.nextPort].get(),"ArbiterLowIdPortNoLockFirst payload error")
-        self.counter += 1
+        self.done.increment()
         self.nextPort = -1
 
 
-    @cocotb.coroutine
     def arbitration(self):
-        while True:
-            yield FallingEdge(self.dut.clk)
-            if int(self.dut.arbiterLowIdPortFirstNoLockInputs_0_valid) == 1:
-                self.nextPort = 0
-            elif int(self.dut.arbiterLowIdPortFirstNoLockInputs_1_valid) == 1:
-                self.nextPort = 1
-            elif int(self.dut.arbiterLowIdPortFirstNoLockInputs_2_valid) == 1:
-                self.nextPort = 2
-            else:
-                self.nextPort = -1
+        if int(self.dut.arbiterLowIdPortFirstNoLockInputs_0_valid) == 1:
+            self.nextPort = 0
+        elif int(self.dut.arbiterLowIdPortFirstNoLockInputs_1_valid) == 1:
+            self.nextPort = 1
+        elif int(self.dut.arbiterLowIdPortFirstNoLockInputs_2_valid) == 1:
+            self.nextPort = 2
+        else:
+            self.nextPort = -1
 
     @cocotb.coroutine
     def run(self):
         dut = self.dut
         for idx in range(0,3):
-            cocotb.fork(StreamRandomizer("arbiterLowIdPortFirstNoLockInputs_" + str(idx), self.onInput ,idx, self.dut, self.dut.clk))
-        cocotb.fork(StreamReader("arbiterLowIdPortFirstNoLockOutput", self.onOutput, idx, self.dut, self.dut.clk))
-        cocotb.fork(self.arbitration())
+            StreamRandomizer("arbiterLowIdPortFirstNoLockInputs_" + str(idx), self.onInput ,idx, self.dut, self.dispatcher)
+        StreamReader("arbiterLowIdPortFirstNoLockOutput", self.onOutput, idx, self.dut, self.dispatcher)
+        self.dispatcher.onFallingEdge(self.arbitration)
 
-        while self.counter < 1000:
-            yield RisingEdge(dut.clk)
+        yield self.done.wait()
 
 
 class ArbiterLowIdPortFragmentLockFirst:
-    def __init__(self,dut):
-        self.queues = [Queue() for i in range(0,3)]
+    def __init__(self,dut,dispatcher):
+        self.queues = [Scoreboard(len(getattr(dut, "arbiterLowIdPortFirstFragmentLockInputs_%d_payload_fragment" % i)), "ArbiterLowIdPortFragmentLockFirst input %d" % i, limit=backlogLimit()) for i in range(0,3)]
         self.nextPort = -1
-        self.counter = 0
+        self.done = Completion(soakCount(1000), "ArbiterLowIdPortFragmentLockFirst")
         self.dut = dut
+        self.dispatcher = dispatcher
 
     def onInput(self,payload,portId):
         self.queues[portId].put(payload.fragment)
@@ -306,33 +308,29 @@ class ArbiterLowIdPortFragmentLockFirst:
         if self.queues[self.nextPort].empty():
             raise TestFailure("ArbiterLowIdPortFragmentLockFirst Empty queue")
         assertEquals(payload.fragment,self.queues[self.nextPort].get(),"ArbiterLowIdPortFragmentLockFirst payload error")
-        self.counter += 1
+        self.done.increment()
         if payload.last == 1:
             self.nextPort = -1
 
 
-    @cocotb.coroutine
     def arbitration(self):
-        while True:
-            yield FallingEdge(self.dut.clk)
-            if self.nextPort == -1:
-                if int(self.dut.arbiterLowIdPortFirstFragmentLockInputs_0_valid) == 1:
-                    self.nextPort = 0
-                elif int(self.dut.arbiterLowIdPortFirstFragmentLockInputs_1_valid) == 1:
-                    self.nextPort = 1
-                elif int(self.dut.arbiterLowIdPortFirstFragmentLockInputs_2_valid) == 1:
-                    self.nextPort = 2
+        if self.nextPort == -1:
+            if int(self.dut.arbiterLowIdPortFirstFragmentLockInputs_0_valid) == 1:
+                self.nextPort = 0
+            elif int(self.dut.arbiterLowIdPortFirstFragmentLockInputs_1_valid) == 1:
+                self.nextPort = 1
+            elif int(self.dut.arbiterLowIdPortFirstFragmentLockInputs_2_valid) == 1:
+                self.nextPort = 2
 
     @cocotb.coroutine
     def run(self):
         dut = self.dut
         for idx in range(0,3):
-            cocotb.fork(StreamRandomizer("arbiterLowIdPortFirstFragmentLockInputs_" + str(idx), self.onInput ,idx, self.dut, self.dut.clk))
-        cocotb.fork(StreamReader("arbiterLowIdPortFirstFragmentLockOutput", self.onOutput, idx, self.dut, self.dut.clk))
-        cocotb.fork(self.arbitration())
+            StreamRandomizer("arbiterLowIdPortFirstFragmentLockInputs_" + str(idx), self.onInput ,idx, self.dut, self.dispatcher)
+        StreamReader("arbiterLowIdPortFirstFragmentLockOutput", self.onOutput, idx, self.dut, self.dispatcher)
+        self.dispatcher.onFallingEdge(self.arbitration)
 
-        while self.counter < 1000:
-            yield RisingEdge(dut.clk)
+        yield self.done.wait()
 
 @cocotb.test()
 def test1(dut):
@@ -342,20 +340,18 @@ def test1(dut):
     cocotbXHack()
 
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset))
+    dispatcher = ClockDispatcher(dut.clk)
+    cocotb.fork(dispatcher.run())
 
+    report = SoakReport(dispatcher)
     threads = []
-    threads.append(cocotb.fork(Fifo(dut).run()))
-    threads.append(cocotb.fork(Fork(dut).run()))
-    threads.append(cocotb.fork(DispatcherInOrder(dut).run()))
-    threads.append(cocotb.fork(StreamFlowArbiter(dut).run()))
-    threads.append(cocotb.fork(ArbiterInOrder(dut).run()))
-    threads.append(cocotb.fork(ArbiterLowIdPortFirst(dut).run()))
-    threads.append(cocotb.fork(ArbiterRoundRobin(dut).run()))
-    threads.append(cocotb.fork(ArbiterLowIdPortNoLockFirst(dut).run()))
-    threads.append(cocotb.fork(ArbiterLowIdPortFragmentLockFirst(dut).run()))
+    for tester in [Fifo, Fork, DispatcherInOrder, StreamFlowArbiter, ArbiterInOrder, ArbiterLowIdPortFirst, ArbiterRoundRobin, ArbiterLowIdPortNoLockFirst, ArbiterLowIdPortFragmentLockFirst]:
+        threads.append(cocotb.fork(report.watch(tester.__name__, tester(dut, dispatcher)).run()))
 
     for thread in threads:
         yield thread.join()
+    if soaking():
+        report.report()
 
     #
     #
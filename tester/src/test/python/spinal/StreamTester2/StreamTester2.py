@@ -2,16 +2,22 @@ import random
 
 import cocotb
 from cocotblib.Phase import PhaseManager
-from cocotblib.misc import ClockDomainAsyncReset, simulationSpeedPrinter, randBits
+from cocotblib.misc import ClockDomainAsyncReset
+from spinal.common.Metrics import simulationSpeedRecorder
+from spinal.common.Rng import agentRng
+from spinal.common.Soak import soakCount
+from spinal.common.StreamPerf import StreamPerfMonitor
 
 from cocotblib.Stream import Transaction, Stream, StreamFifoTester
 
 
-def bundleAGen():
-    trans = Transaction()
-    trans.a = randBits(8)
-    trans.b = randBits(1)
-    return trans
+def bundleAGen(rng):
+    def gen():
+        trans = Transaction()
+        trans.a = rng.getrandbits(8)
+        trans.b = rng.getrandbits(1)
+        return trans
+    return gen
 
 @cocotb.test()
 def test1(dut):
@@ -20,14 +26,17 @@ def test1(dut):
     cocotbXHack()
 
     cocotb.fork(ClockDomainAsyncReset(dut.clk, dut.reset))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
 
 
     phaseManager = PhaseManager()
     phaseManager.setWaitTasksEndTime(1000*200)
 
-    StreamFifoTester("fifoA",phaseManager,Stream(dut,"fifoAPush"),Stream(dut,"fifoAPop"),bundleAGen,3000,dut.clk,dut.reset).createInfrastructure()
-    StreamFifoTester("fifoB",phaseManager,Stream(dut,"fifoBPush"),Stream(dut,"fifoBPop"),bundleAGen,3000,dut.clk,dut.reset).createInfrastructure()
+    for name in ["fifoA", "fifoB"]:
+        push = Stream(dut, name + "Push")
+        pop = Stream(dut, name + "Pop")
+        StreamFifoTester(name,phaseManager,push,pop,bundleAGen(agentRng(name)),soakCount(3000),dut.clk,dut.reset).createInfrastructure()
+        StreamPerfMonitor(name, push, pop, dut.clk, dut.reset)
 
 
     yield phaseManager.run()
@@ -4,7 +4,8 @@ from queue import Queue
 import cocotb
 from cocotb.triggers import Edge, RisingEdge, FallingEdge
 
-from cocotblib.misc import assertEquals, ClockDomainAsyncReset, simulationSpeedPrinter
+from cocotblib.misc import assertEquals, ClockDomainAsyncReset
+from spinal.common.Metrics import simulationSpeedRecorder
 
 UartParityType_NONE = 0
 UartParityType_EVEN = 1
@@ -116,7 +117,7 @@ def test1(dut):
     cocotb.fork(sendRandomPackets(dut, queueTx, queueRx))
     cocotb.fork(checkTx(dut,queueTx))
     cocotb.fork(txToRxBypass(dut))
-    cocotb.fork(simulationSpeedPrinter(dut.clk))
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
     yield checkCtrlReadedBytes(dut, queueRx)
 
     dut.log.info("Cocotb test done")
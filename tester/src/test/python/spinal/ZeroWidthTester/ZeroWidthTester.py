@@ -1,131 +1,125 @@
 import cocotb
-from cocotb.result import TestFailure
-from cocotb.triggers import Timer
 
-from cocotblib.misc import randSignal, truncUInt, sint, truncSInt
+import numpy as np
+
+from spinal.common.OperatorTable import Operand, applyOperator
+from spinal.common.Vectors import Sweep, sweepVectors
+
+
+def expectZeroWidth(test):
+    bits8 = test.inputs["bits8"]
+
+    def operand(name):
+        if name == "0":
+            # Zero width operand
+            return np.zeros(test.count, dtype=np.int64), Operand(0)
+        return test.inputs[name], Operand(8, name.startswith("sint"))
+
+    def op(name, a, b):
+        return applyOperator(name, *(operand(a) + operand(b)))
+
+
+    test.expect("bitsShiftLeftInt", 4, 0)
+    test.expect("uintShiftLeftInt", 4, 0)
+    test.expect("sintShiftLeftInt", 4, 0)
+
+
+
+
+    test.expect("uint08ShiftLeftUint", 255, op("shl", "0", "uint8"))
+    test.expect("sint08ShiftLeftUint", 255, op("shl", "0", "uint8"))
+    test.expect("bits08ShiftLeftUint", 255, op("shl", "0", "uint8"))
+
+
+    test.expect("uint08Equals", 1, op("eq", "0", "uint8"))
+    test.expect("uint08NotEquals", 1, op("ne", "0", "uint8"))
+    test.expect("uint08Add", 8, op("add", "0", "uint8"))
+    test.expect("uint08Sub", 8, op("sub", "0", "uint8"))
+    test.expect("uint08Mul", 8, op("mul", "0", "uint8"))
+    test.expect("uint08And", 8, op("and", "0", "uint8"))
+    test.expect("uint08Or", 8, op("or", "0", "uint8"))
+    test.expect("uint08Xor", 8, op("xor", "0", "uint8"))
+    test.expect("uint08Smaller", 1, op("lt", "0", "uint8"))
+    test.expect("uint08SmallerEquals", 1, op("le", "0", "uint8"))
+    test.expect("uint08Bigger", 1, op("gt", "0", "uint8"))
+    test.expect("uint08BiggerEquals", 1, op("ge", "0", "uint8"))
+
+
+    test.expect("sint08Equals", 1, op("eq", "0", "sint8"))
+    test.expect("sint08NotEquals", 1, op("ne", "0", "sint8"))
+    test.expect("sint08Add", 8, op("add", "0", "sint8"))
+    test.expect("sint08Sub", 8, op("sub", "0", "sint8"))
+    test.expect("sint08Mul", 8, op("mul", "0", "sint8"))
+    test.expect("sint08And", 8, op("and", "0", "sint8"))
+    test.expect("sint08Or", 8, op("or", "0", "sint8"))
+    test.expect("sint08Xor", 8, op("xor", "0", "sint8"))
+    test.expect("sint08Smaller", 1, op("lt", "0", "sint8"))
+    test.expect("sint08SmallerEquals", 1, op("le", "0", "sint8"))
+    test.expect("sint08Bigger", 1, op("gt", "0", "sint8"))
+    test.expect("sint08BiggerEquals", 1, op("ge", "0", "sint8"))
+
+    test.expect("bits08Equals", 1, op("eq", "0", "bits8"))
+    test.expect("bits08NotEquals", 1, op("ne", "0", "bits8"))
+    test.expect("bits08And", 8, op("and", "0", "bits8"))
+    test.expect("bits08Or", 8, op("or", "0", "bits8"))
+    test.expect("bits08Xor", 8, op("xor", "0", "bits8"))
+    
+    
+    
+    
+    
+
+    test.expect("uint80ShiftLeftUint", 8, op("shl", "uint8", "0"))
+    test.expect("sint80ShiftLeftUint", 8, op("shl", "sint8", "0"))
+    test.expect("bits80ShiftLeftUint", 8, op("shl", "bits8", "0"))
+
+
+    test.expect("uint80Equals", 1, op("eq", "uint8", "0"))
+    test.expect("uint80NotEquals", 1, op("ne", "uint8", "0"))
+    test.expect("uint80Add", 8, op("add", "uint8", "0"))
+    test.expect("uint80Sub", 8, op("sub", "uint8", "0"))
+    test.expect("uint80Mul", 8, op("mul", "uint8", "0"))
+    test.expect("uint80And", 8, op("and", "uint8", "0"))
+    test.expect("uint80Or", 8, op("or", "uint8", "0"))
+    test.expect("uint80Xor", 8, op("xor", "uint8", "0"))
+    test.expect("uint80Smaller", 1, op("lt", "uint8", "0"))
+    test.expect("uint80SmallerEquals", 1, op("le", "uint8", "0"))
+    test.expect("uint80Bigger", 1, op("gt", "uint8", "0"))
+    test.expect("uint80BiggerEquals", 1, op("ge", "uint8", "0"))
+
+
+    test.expect("sint80Equals", 1, op("eq", "sint8", "0"))
+    test.expect("sint80NotEquals", 1, op("ne", "sint8", "0"))
+    test.expect("sint80Add", 8, op("add", "sint8", "0"))
+    test.expect("sint80Sub", 8, op("sub", "sint8", "0"))
+    test.expect("sint80Mul", 8, op("mul", "sint8", "0"))
+    test.expect("sint80And", 8, op("and", "sint8", "0"))
+    test.expect("sint80Or", 8, op("or", "sint8", "0"))
+    test.expect("sint80Xor", 8, op("xor", "sint8", "0"))
+    test.expect("sint80Smaller", 1, op("lt", "sint8", "0"))
+    test.expect("sint80SmallerEquals", 1, op("le", "sint8", "0"))
+    test.expect("sint80Bigger", 1, op("gt", "sint8", "0"))
+    test.expect("sint80BiggerEquals", 1, op("ge", "sint8", "0"))
+
+    test.expect("bits80Equals", 1, op("eq", "bits8", "0"))
+    test.expect("bits80NotEquals", 1, op("ne", "bits8", "0"))
+    test.expect("bits80And", 8, op("and", "bits8", "0"))
+    test.expect("bits80Or", 8, op("or", "bits8", "0"))
+    test.expect("bits80Xor", 8, op("xor", "bits8", "0"))
+
+    test.expect("bitsResizeBigger",16,0)
+    test.expect("uintResizeBigger",16,0)
+    test.expect("sintResizeBigger",16,0)
+
+    test.expect("bits08Cat", 8, bits8)
+    test.expect("bits80Cat", 8, bits8)
 
 
-def check(signal,bitCount,value):
-    if len(signal) != bitCount or int(signal) != truncUInt(value, bitCount):
-        raise TestFailure("FAIL %s    %d != %d" % (signal._path, int(signal), truncUInt(value, bitCount)))
-
-def checkSigned(signal,bitCount,value):
-    if len(signal) != bitCount or sint(signal) != truncSInt(value,bitCount):
-        raise TestFailure("FAIL %s    %d != %d" % (signal._path, sint(signal), truncSInt(value,bitCount)))
-
 @cocotb.test()
 def test1(dut):
     dut.log.info("Cocotb test boot")
 
-    # itemDir = dut.uint4.__dict__
-    #
-    # for i in itemDir:
-    #     print '{0}  :  {1}'.format(i, itemDir[i])
-
-    for i in range(0,200):
-        randSignal(dut.uint8)
-        randSignal(dut.sint8)
-        randSignal(dut.bits8)
-        yield Timer(1000)
-        uint8 = int(dut.uint8)
-        sint8 = sint(dut.sint8)
-        bits8 = int(dut.bits8)
-
-
-
-        check(dut.bitsShiftLeftInt, 4, 0)
-        check(dut.uintShiftLeftInt, 4, 0)
-        check(dut.sintShiftLeftInt, 4, 0)
-
-
-
-
-        check(dut.uint08ShiftLeftUint  , 255, 0 << uint8)
-        check(dut.sint08ShiftLeftUint  , 255, 0 << uint8)
-        check(dut.bits08ShiftLeftUint  , 255, 0 << uint8)
-
-
-        check(dut.uint08Equals   , 1, 0 == uint8)
-        check(dut.uint08NotEquals, 1, 0 != uint8)
-        check(dut.uint08Add, 8, 0 + uint8)
-        check(dut.uint08Sub, 8, 0 - uint8)
-        check(dut.uint08Mul, 8, 0 * uint8)
-        check(dut.uint08And, 8, 0 & uint8)
-        check(dut.uint08Or , 8, 0 | uint8)
-        check(dut.uint08Xor, 8, 0 ^ uint8)
-        check(dut.uint08Smaller      , 1, 0 < uint8)
-        check(dut.uint08SmallerEquals, 1, 0 <= uint8)
-        check(dut.uint08Bigger       , 1, 0 > uint8)
-        check(dut.uint08BiggerEquals , 1, 0 >= uint8)
-
-
-        check(dut.sint08Equals   , 1, 0 == sint8)
-        check(dut.sint08NotEquals, 1, 0 != sint8)
-        check(dut.sint08Add, 8, 0 + sint8)
-        check(dut.sint08Sub, 8, 0 - sint8)
-        check(dut.sint08Mul, 8, 0 * sint8)
-        check(dut.sint08And, 8, 0 & sint8)
-        check(dut.sint08Or , 8, 0 | sint8)
-        check(dut.sint08Xor, 8, 0 ^ sint8)
-        check(dut.sint08Smaller      , 1, 0 < sint8)
-        check(dut.sint08SmallerEquals, 1, 0 <= sint8)
-        check(dut.sint08Bigger       , 1, 0 > sint8)
-        check(dut.sint08BiggerEquals , 1, 0 >= sint8)
-
-        check(dut.bits08Equals, 1, 0 == bits8)
-        check(dut.bits08NotEquals, 1, 0 != bits8)
-        check(dut.bits08And, 8, 0 & bits8)
-        check(dut.bits08Or, 8, 0 | bits8)
-        check(dut.bits08Xor, 8, 0 ^ bits8)
-        
-        
-        
-        
-        
-
-        check(dut.uint80ShiftLeftUint  , 8, uint8 << 0)
-        check(dut.sint80ShiftLeftUint  , 8, sint8 << 0)
-        check(dut.bits80ShiftLeftUint  , 8, bits8 << 0)
-
-
-        check(dut.uint80Equals   , 1, uint8 == 0)
-        check(dut.uint80NotEquals, 1, uint8 != 0)
-        check(dut.uint80Add, 8, uint8 + 0)
-        check(dut.uint80Sub, 8, uint8 - 0)
-        check(dut.uint80Mul, 8, uint8 * 0)
-        check(dut.uint80And, 8, uint8 & 0)
-        check(dut.uint80Or , 8, uint8 | 0)
-        check(dut.uint80Xor, 8, uint8 ^ 0)
-        check(dut.uint80Smaller      , 1, uint8 < 0)
-        check(dut.uint80SmallerEquals, 1, uint8 <= 0)
-        check(dut.uint80Bigger       , 1, uint8 > 0)
-        check(dut.uint80BiggerEquals , 1, uint8 >= 0)
-
-
-        check(dut.sint80Equals   , 1, sint8 == 0)
-        check(dut.sint80NotEquals, 1, sint8 != 0)
-        check(dut.sint80Add, 8, sint8 + 0)
-        check(dut.sint80Sub, 8, sint8 - 0)
-        check(dut.sint80Mul, 8, sint8 * 0)
-        check(dut.sint80And, 8, sint8 & 0)
-        check(dut.sint80Or , 8, sint8 | 0)
-        check(dut.sint80Xor, 8, sint8 ^ 0)
-        check(dut.sint80Smaller      , 1, sint8 < 0)
-        check(dut.sint80SmallerEquals, 1, sint8 <= 0)
-        check(dut.sint80Bigger       , 1, sint8 > 0)
-        check(dut.sint80BiggerEquals , 1, sint8 >= 0)
-
-        check(dut.bits80Equals, 1, bits8 == 0)
-        check(dut.bits80NotEquals, 1, bits8 != 0)
-        check(dut.bits80And, 8, bits8 & 0)
-        check(dut.bits80Or, 8, bits8 | 0)
-        check(dut.bits80Xor, 8, bits8 ^ 0)
-
-        check(dut.bitsResizeBigger,16,0)
-        check(dut.uintResizeBigger,16,0)
-        check(dut.sintResizeBigger,16,0)
-
-        check(dut.bits08Cat, 8, bits8)
-        check(dut.bits80Cat, 8, bits8)
-
+    # Exhaustive, the 8 bits operands all take every value
+    sweep = Sweep([("value", 8)])
+    yield sweepVectors(dut, sweep, lambda axes: {name : axes["value"] for name in ["uint8", "sint8", "bits8"]}, expectZeroWidth)
     dut.log.info("Cocotb test done")
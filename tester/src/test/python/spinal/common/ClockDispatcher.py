@@ -0,0 +1,61 @@
+"""
+Per clock dispatch of the testbench agents.
+
+Every agent written as a coroutine (while True: yield RisingEdge(clk) ...) costs one scheduler wakeup per clock cycle,
+which dominates the simulation time of the testbenches running tens of agents on the same clock. A ClockDispatcher
+awaits each edge of its clock once, and calls the step functions registered on that edge in registration order.
+
+All the steps of an edge see the signal values of the edge, like the coroutines resumed by the same trigger did. Their
+writes are deferred <= writes, applied together in the ReadWrite phase. dispatcher.widths (see SignalWidths) shares the
+signal widths of the randomized payloads between the steps.
+
+A step raising an exception (TestFailure from a scoreboard, ...) fails the test like a failing coroutine does.
+
+Usage :
+    dispatcher = ClockDispatcher(dut.clk)
+    cocotb.fork(dispatcher.run())
+    dispatcher.onRisingEdge(agent.step)
+    dispatcher.onFallingEdge(arbiter.step)
+"""
+
+import cocotb
+from cocotb.triggers import RisingEdge, FallingEdge
+
+from spinal.common.SignalWidths import SignalWidths
+
+
+class ClockDispatcher:
+    def __init__(self, clk):
+        self.clk = clk
+        self.risingSteps = []
+        self.fallingSteps = []
+        self.widths = SignalWidths()
+        self.cycles = 0
+
+    def onRisingEdge(self, step):
+        self.risingSteps.append(step)
+        return step
+
+    def onFallingEdge(self, step):
+        self.fallingSteps.append(step)
+        return step
+
+    def remove(self, step):
+        """Unregister a step, it may be called from a step of the same edge."""
+        for steps in (self.risingSteps, self.fallingSteps):
+            if step in steps:
+                steps.remove(step)
+
+    @cocotb.coroutine
+    def run(self):
+        rising = RisingEdge(self.clk)
+        falling = FallingEdge(self.clk)
+        while True:
+            yield rising
+            self.cycles += 1
+            for step in tuple(self.risingSteps):
+                step()
+            if self.fallingSteps:
+                yield falling
+                for step in tuple(self.fallingSteps):
+                    step()
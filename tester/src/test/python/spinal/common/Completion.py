@@ -0,0 +1,42 @@
+"""
+Counting completion.
+
+A test agent which is done after a given number of transactions used to poll its counter on every clock edge
+(while self.counter < 1000: yield RisingEdge(clk)), one scheduler wakeup per cycle and per agent for nothing.
+A Completion is incremented by the transaction callbacks instead, and sets a cocotb Event once its target is reached,
+so the waiting coroutine is only resumed once.
+
+Usage :
+    self.done = Completion(1000, "DispatcherInOrder")
+    ...
+    def onOutput(self, payload, portId):
+        ...
+        self.done.increment()
+    ...
+    yield self.done.wait()
+"""
+
+from cocotb.triggers import Event
+
+
+class Completion:
+    __slots__ = ["target", "count", "event"]
+
+    def __init__(self, target, name = None):
+        self.target = target
+        self.count = 0
+        self.event = Event(name)
+        if target <= 0:
+            self.event.set()
+
+    def increment(self, amount = 1):
+        self.count += amount
+        if self.count >= self.target and not self.event.fired:
+            self.event.set()
+
+    def done(self):
+        return self.event.fired
+
+    def wait(self):
+        """Trigger firing once the target is reached, immediately if it already is."""
+        return self.event.wait()
@@ -0,0 +1,129 @@
+"""
+Pre-parsed memory images of Intel HEX files.
+
+Parsing a .hex file in python costs one int(..., 16) per byte, which was paid again by every test loading a program.
+The first time a file is loaded, it is converted into a flat binary image of its contiguous segments, stored in
+SPINAL_HEX_CACHE (<tmp>/spinalHexCache by default) under the hash of its content. Later loads memory-map that image,
+and loads done by the same simulator process (the tests of a TestFactory) don't even touch the disk again as long as
+the file mtime didn't change.
+
+Usage :
+    loadImage("tests/rv32ui-pt-add.hex", self.rom)               # copy into an array('B') / bytearray
+    for address, data in hexImage(path).segments : ...           # data is a memoryview of bytes
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+MAGIC = b"SPXIMG1\0"
+HEADER = struct.Struct("<8sI")
+SEGMENT = struct.Struct("<QQQ")
+
+
+def readIHex(path, linearAddress = True):
+    """Parse an Intel HEX file into a list of (address, bytearray) contiguous segments.
+
+    Without linearAddress, the extended linear address records (type 4) are ignored, like the RiscvTester loader did.
+    """
+    segments = []
+    with open(path) as f:
+        offset = 0
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            assert line[0] == ':'
+            byteCount = int(line[1:3], 16)
+            address = int(line[3:7], 16) + offset
+            key = int(line[7:9], 16)
+            if key == 0:
+                data = bytes.fromhex(line[9:9 + byteCount * 2])
+                if segments and segments[-1][0] + len(segments[-1][1]) == address:
+                    segments[-1][1].extend(data)
+                else:
+                    segments.append((address, bytearray(data)))
+            elif key == 2:
+                offset = int(line[9:13], 16) << 4
+            elif key == 4 and linearAddress:
+                offset = int(line[9:13], 16) << 16
+    return segments
+
+
+class HexImage:
+    def __init__(self, segments, buffer = None):
+        self.segments = segments
+        self.buffer = buffer
+
+    def size(self):
+        return sum(len(data) for _, data in self.segments)
+
+
+def writeImage(path, segments):
+    tmp = path + ".%d.%d.tmp" % (os.getpid(), threading.get_ident())
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(segments)))
+        offset = HEADER.size + SEGMENT.size * len(segments)
+        for address, data in segments:
+            f.write(SEGMENT.pack(address, offset, len(data)))
+            offset += len(data)
+        for _, data in segments:
+            f.write(data)
+    os.replace(tmp, path)
+
+
+def mapImage(path):
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    magic, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("%s isn't a memory image" % path)
+    segments = []
+    for i in range(count):
+        address, offset, length = SEGMENT.unpack_from(buffer, HEADER.size + i * SEGMENT.size)
+        segments.append((address, view[offset:offset + length]))
+    return HexImage(segments, buffer)
+
+
+def cachePath():
+    return os.getenv("SPINAL_HEX_CACHE", os.path.join(tempfile.gettempdir(), "spinalHexCache"))
+
+
+imagesByFile = {}
+
+
+def hexImage(path, linearAddress = True):
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    memoKey = (path, stat.st_mtime_ns, stat.st_size, linearAddress)
+    image = imagesByFile.get(memoKey)
+    if image is not None:
+        return image
+
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(b"linear" if linearAddress else b"segment")
+    imagePath = os.path.join(cachePath(), digest.hexdigest() + ".img")
+    try:
+        image = mapImage(imagePath)
+    except (OSError, ValueError, struct.error):
+        segments = readIHex(path, linearAddress)
+        try:
+            os.makedirs(cachePath(), exist_ok=True)
+            writeImage(imagePath, segments)
+        except OSError:
+            pass
+        image = HexImage([(address, memoryview(data)) for address, data in segments])
+    imagesByFile[memoKey] = image
+    return image
+
+
+def loadImage(path, array, linearAddress = True):
+    """Copy the content of an Intel HEX file into a byte array (array('B') or bytearray)."""
+    target = memoryview(array).cast("B")
+    for address, data in hexImage(path, linearAddress).segments:
+        target[address:address + len(data)] = data
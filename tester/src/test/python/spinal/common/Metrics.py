@@ -0,0 +1,178 @@
+"""
+Simulation throughput metrics.
+
+simulationSpeedRecorder is a drop-in replacement of cocotblib.misc.simulationSpeedPrinter. It still logs the simulation
+speed, but also records a time series of cycles/second per clock domain and of coroutine wakeups per cycle, plus the wall
+time spent in the phases declared by the testbench. Each test writes <MODULE>.<test>.metrics.csv and .json into
+SPINAL_METRICS_DIR (the current directory by default), so runs of different commits can be aggregated and compared.
+
+Usage :
+    cocotb.fork(simulationSpeedRecorder(dut.clk))
+    with testMetrics().phase("boot"):
+        yield loadIHex(...)
+"""
+
+import atexit
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import cocotb
+from cocotb.triggers import RisingEdge
+from cocotb.utils import get_sim_time
+
+CSV_COLUMNS = ["wallTime", "simTimeNs", "domain", "cycles", "cyclesPerSecond", "wakeupsPerCycle"]
+
+
+class WakeupCounter:
+    """Count the coroutine resumes done by the cocotb scheduler."""
+    def __init__(self):
+        self.count = 0
+        self.installed = False
+
+    def install(self):
+        scheduler = getattr(cocotb, "scheduler", None)
+        # The resume method became private in cocotb 1.5
+        method = "_schedule" if hasattr(scheduler, "_schedule") else "schedule"
+        if self.installed or scheduler is None or not hasattr(scheduler, method):
+            return
+        schedule = getattr(scheduler, method)
+
+        def countingSchedule(*args, **kwargs):
+            self.count += 1
+            return schedule(*args, **kwargs)
+
+        setattr(scheduler, method, countingSchedule)
+        self.installed = True
+
+
+wakeupCounter = WakeupCounter()
+
+
+def currentTestName():
+    manager = getattr(cocotb, "regression_manager", None)
+    for attribute in ("_running_test", "_test_task"):
+        name = getattr(getattr(manager, attribute, None), "funcname", None)
+        if name:
+            return name
+    return getattr(getattr(manager, "_test", None), "__qualname__", "test")
+
+
+class ClockDomainMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.cycles = 0
+        self.wallStart = time.time()
+        self.lastCycles = 0
+        self.lastWall = self.wallStart
+        self.lastWakeups = wakeupCounter.count
+
+
+class SimulationMetrics:
+    def __init__(self, testName, path = None):
+        self.module = os.getenv("MODULE", "cocotb").split(",")[-1]
+        self.testName = testName
+        self.path = path or os.getenv("SPINAL_METRICS_DIR", ".")
+        self.wallStart = time.time()
+        self.domains = {}
+        self.phases = []
+        self.simTimeNs = 0
+        self.csvFile = None
+        self.csvWriter = None
+        wakeupCounter.install()
+        atexit.register(self.dump)
+
+    def filePath(self, extension):
+        return os.path.join(self.path, "%s.%s.metrics.%s" % (self.module, self.testName, extension))
+
+    def domain(self, name):
+        if name not in self.domains:
+            self.domains[name] = ClockDomainMetrics(name)
+        return self.domains[name]
+
+    def sample(self, domain):
+        now = time.time()
+        self.simTimeNs = get_sim_time("ns")
+        cycles = domain.cycles - domain.lastCycles
+        wakeups = wakeupCounter.count - domain.lastWakeups
+        row = [round(now - self.wallStart, 3), self.simTimeNs, domain.name, domain.cycles,
+               round(cycles / max(now - domain.lastWall, 1e-9), 1),
+               round(wakeups / cycles, 2) if cycles and wakeupCounter.installed else ""]
+        domain.lastCycles = domain.cycles
+        domain.lastWall = now
+        domain.lastWakeups = wakeupCounter.count
+        if self.csvWriter is None:
+            os.makedirs(self.path, exist_ok=True)
+            self.csvFile = open(self.filePath("csv"), "w", newline="")
+            self.csvWriter = csv.writer(self.csvFile)
+            self.csvWriter.writerow(CSV_COLUMNS)
+        self.csvWriter.writerow(row)
+        self.csvFile.flush()
+        return row
+
+    @contextmanager
+    def phase(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.wallStart, time.time() - start))
+
+    def summary(self):
+        now = time.time()
+        domains = {}
+        for domain in self.domains.values():
+            wallTime = now - domain.wallStart
+            domains[domain.name] = {
+                "cycles" : domain.cycles,
+                "wallTime" : round(wallTime, 3),
+                "cyclesPerSecond" : round(domain.cycles / max(wallTime, 1e-9), 1)
+            }
+        return {
+            "module" : self.module,
+            "test" : self.testName,
+            "wallTime" : round(now - self.wallStart, 3),
+            "simTimeNs" : self.simTimeNs,
+            "wakeups" : wakeupCounter.count if wakeupCounter.installed else None,
+            "domains" : domains,
+            "phases" : [{"name" : name, "start" : round(start, 3), "wallTime" : round(duration, 3)} for name, start, duration in self.phases]
+        }
+
+    def dump(self):
+        # Also called at exit, when the simulator can't be queried anymore
+        if not self.domains and not self.phases:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.filePath("json"), "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        if self.csvFile:
+            self.csvFile.flush()
+
+
+metricsByTest = {}
+
+
+def testMetrics():
+    """Return the metrics collector of the running test, shared by all its clock domains and phases."""
+    name = currentTestName()
+    if name not in metricsByTest:
+        metricsByTest[name] = SimulationMetrics(name)
+    return metricsByTest[name]
+
+
+@cocotb.coroutine
+def simulationSpeedRecorder(clk, name = None, period = 1.0):
+    metrics = testMetrics()
+    domain = metrics.domain(name or clk._name)
+    try:
+        while True:
+            yield RisingEdge(clk)
+            domain.cycles += 1
+            if time.time() - domain.lastWall >= period:
+                row = metrics.sample(domain)
+                cocotb.log.info("Sim speed %s : %f khz" % (domain.name, row[4] / 1000.0))
+    finally:
+        metrics.simTimeNs = get_sim_time("ns")
+        metrics.dump()
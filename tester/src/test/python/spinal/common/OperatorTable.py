@@ -0,0 +1,90 @@
+"""
+Reference model of the SpinalHDL binary operators, with lookup tables for narrow operands.
+
+The semantics of each operator (signed interpretation of SInt operands, python floor division and remainder, boolean
+comparisons) are defined once here. When both operands are narrow enough, the whole result space of an operator is
+computed once per process into a table indexed by the raw operand values, and each vectorized check is then a single
+table read. Wider operands are evaluated directly with the same definition.
+
+Results aren't truncated, VectorTest.expect truncates them to the output width.
+
+Usage :
+    applyOperator("add", uint4, Operand(4), sint8, Operand(8, signed=True))
+"""
+
+import numpy as np
+
+# Operand pairs up to this many bits (2^16 entries per table) are tabulated
+MAX_TABLE_BITS = 16
+
+
+def divide(a, b):
+    return np.floor_divide(a, np.where(b == 0, 1, b)) * (b != 0)
+
+
+def remainder(a, b):
+    return np.remainder(a, np.where(b == 0, 1, b)) * (b != 0)
+
+
+OPERATORS = {
+    "add" : np.add,
+    "sub" : np.subtract,
+    "mul" : np.multiply,
+    "div" : divide,
+    "rem" : remainder,
+    "and" : np.bitwise_and,
+    "or"  : np.bitwise_or,
+    "xor" : np.bitwise_xor,
+    "shl" : np.left_shift,
+    "shr" : np.right_shift,
+    "eq"  : np.equal,
+    "ne"  : np.not_equal,
+    "lt"  : np.less,
+    "le"  : np.less_equal,
+    "gt"  : np.greater,
+    "ge"  : np.greater_equal,
+}
+
+
+class Operand:
+    def __init__(self, width, signed = False):
+        self.width = width
+        self.signed = signed
+
+    def key(self):
+        return (self.width, self.signed)
+
+    def interpret(self, raw):
+        """Value of raw unsigned bits, as an int64 array."""
+        raw = np.asarray(raw, dtype=np.int64)
+        if self.width == 0:
+            return np.zeros_like(raw)
+        if not self.signed:
+            return raw
+        sign = 1 << (self.width - 1)
+        return (raw ^ sign) - sign
+
+
+def evaluate(name, a, operandA, b, operandB):
+    return np.asarray(OPERATORS[name](operandA.interpret(a), operandB.interpret(b)), dtype=np.int64)
+
+
+tables = {}
+
+
+def operatorTable(name, operandA, operandB):
+    """Results of the operator for every pair of raw operand values, built once per process."""
+    key = (name, operandA.key(), operandB.key())
+    table = tables.get(key)
+    if table is None:
+        a = np.arange(1 << operandA.width, dtype=np.int64)[:, None]
+        b = np.arange(1 << operandB.width, dtype=np.int64)[None, :]
+        table = tables[key] = evaluate(name, a, operandA, b, operandB)
+    return table
+
+
+def applyOperator(name, a, operandA, b, operandB):
+    """Apply the operator on arrays of raw operand values."""
+    if operandA.width + operandB.width <= MAX_TABLE_BITS:
+        return operatorTable(name, operandA, operandB)[a, b]
+    return evaluate(name, a, operandA, b, operandB)
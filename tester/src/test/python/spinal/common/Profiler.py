@@ -0,0 +1,127 @@
+"""
+Coroutine hot path profiler for the cocotb testbenches.
+
+Enabled by running a tester with SPINAL_PROFILE=1 (see common/Makefile.sim), which loads this module in front of the
+tester MODULE. Every python call of the simulation is then timed with sys.setprofile, and attributed to its stack of
+testbench frames : the forked coroutines (each resume of a coroutine counts as one call) and everything they call,
+including the callbacks given to StreamDriverMaster, StreamMonitor and the other cocotblib agents. Frames of the
+installed packages (cocotb, queue, random, ...) are folded into a single [package] frame.
+
+At exit the profile is written into SPINAL_METRICS_DIR (the current directory by default) as :
+- <MODULE>.profile.collapsed : collapsed stacks with their self time in microseconds, for flamegraph.pl or speedscope
+- <MODULE>.profile.txt : per function call count, self and total wall time
+"""
+
+import atexit
+import os
+import sys
+import time
+
+pythonPath = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+
+class StackEntry:
+    __slots__ = ["frame", "label", "path", "start", "childTime"]
+
+    def __init__(self, frame, label, path, start):
+        self.frame = frame
+        self.label = label
+        self.path = path
+        self.start = start
+        self.childTime = 0.0
+
+
+class CoroutineProfiler:
+    def __init__(self):
+        self.stack = []
+        self.labels = {}
+        self.selfTimes = {}
+        self.functions = {}
+        self.enabled = False
+
+    def frameLabel(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            fileName = os.path.realpath(code.co_filename)
+            if fileName.startswith(pythonPath + os.sep):
+                name = getattr(code, "co_qualname", code.co_name)
+                label = "%s:%s" % (os.path.splitext(os.path.basename(fileName))[0], name)
+            else:
+                label = "[%s]" % self.packageName(fileName)
+            self.labels[code] = label
+        return label
+
+    def packageName(self, fileName):
+        for path in sorted(sys.path, key=len, reverse=True):
+            if path and fileName.startswith(path + os.sep):
+                return fileName[len(path) + 1:].split(os.sep)[0].split(".")[0]
+        return os.path.splitext(os.path.basename(fileName))[0]
+
+    def onEvent(self, frame, event, arg):
+        if event == "call":
+            now = time.perf_counter()
+            label = self.frameLabel(frame.f_code)
+            if self.stack:
+                parent = self.stack[-1]
+                # Consecutive frames of the same installed package are folded together
+                path = parent.path if label == parent.label and label[0] == "[" else parent.path + ";" + label
+            else:
+                path = label
+            self.stack.append(StackEntry(frame, label, path, now))
+        elif event == "return":
+            stack = self.stack
+            if not stack or stack[-1].frame is not frame and not any(entry.frame is frame for entry in stack):
+                # Frame entered before the profiler was enabled
+                return
+            now = time.perf_counter()
+            while stack:
+                entry = stack.pop()
+                elapsed = now - entry.start
+                self.selfTimes[entry.path] = self.selfTimes.get(entry.path, 0.0) + elapsed - entry.childTime
+                stats = self.functions.get(entry.label)
+                if stats is None:
+                    stats = self.functions[entry.label] = [0, 0.0, 0.0]
+                stats[0] += 1
+                stats[1] += elapsed - entry.childTime
+                stats[2] += elapsed
+                if stack:
+                    stack[-1].childTime += elapsed
+                if entry.frame is frame:
+                    break
+
+    def enable(self):
+        if not self.enabled:
+            self.enabled = True
+            sys.setprofile(self.onEvent)
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            sys.setprofile(None)
+
+    def dump(self, path, module):
+        self.disable()
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, module + ".profile.collapsed"), "w") as f:
+            for stack, selfTime in sorted(self.selfTimes.items()):
+                microseconds = int(selfTime * 1e6)
+                if microseconds > 0:
+                    f.write("%s %d\n" % (stack, microseconds))
+        with open(os.path.join(path, module + ".profile.txt"), "w") as f:
+            f.write("%12s %12s %12s  %s\n" % ("calls", "self (s)", "total (s)", "function"))
+            for label, (calls, selfTime, totalTime) in sorted(self.functions.items(), key=lambda e: -e[1][1]):
+                f.write("%12d %12.3f %12.3f  %s\n" % (calls, selfTime, totalTime, label))
+
+
+profiler = CoroutineProfiler()
+
+
+def install():
+    module = [m for m in os.getenv("MODULE", "cocotb").split(",") if m and m != __name__]
+    path = os.getenv("SPINAL_METRICS_DIR", ".")
+    atexit.register(profiler.dump, path, module[-1] if module else "cocotb")
+    profiler.enable()
+
+
+if os.getenv("SPINAL_PROFILE"):
+    install()
@@ -0,0 +1,343 @@
+"""
+Parallel regression runner for the cocotb testers.
+
+Every tester directory whose Makefile includes common/Makefile.sim is run for each of its languages in a
+bounded pool of make processes. Each job gets its own SIM_BUILD directory and results file, so the verilog and vhdl
+runs of the same tester never share build products, and all the results.xml files are merged into a single report.
+
+Jobs whose inputs did not change since a previous run replay their cached results (see RegressionCache), and the
+compiled toplevels are shared between jobs and runs (see SimCache). A failing cache operation only disables the caching
+of its job, and any other error of the runner fails its job only, with the traceback in the job log.
+
+Testers which support it (see Shard) can be split into several simulator processes with --shards, their results are
+merged into the same report.
+
+Usage (from tester/src/test/python) :
+    python -m spinal.common.Regression -j 32 --lang verilog StreamTester Axi4
+"""
+
+import argparse
+import copy
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from spinal.common.RegressionCache import ResultCache, jobFingerprint
+from spinal.common.SimCache import SimCache, compileFingerprint, compileArtifacts
+
+spinalPath = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+LANGUAGES = ["verilog", "vhdl"]
+
+
+class Tester:
+    def __init__(self, name, path, languages, shardable = False):
+        self.name = name
+        self.path = path
+        self.languages = languages
+        self.shardable = shardable
+
+    def __repr__(self):
+        return "%s(%s)%s" % (self.name, ",".join(self.languages), " shardable" if self.shardable else "")
+
+
+class Job:
+    def __init__(self, tester, lang, workspace, shard = None):
+        self.tester = tester
+        self.lang = lang
+        self.shard = shard
+        self.name = tester.name + "." + lang
+        self.buildDir = os.path.join(workspace, tester.name, lang)
+        if shard:
+            index, count = shard
+            self.name += ".shard%dof%d" % (index, count)
+            self.buildDir = os.path.join(self.buildDir, "shard%d" % index)
+        self.resultsFile = os.path.join(self.buildDir, "results.xml")
+        self.logFile = os.path.join(self.buildDir, "make.log")
+        self.env = {"SPINAL_METRICS_DIR" : self.buildDir}
+        if shard:
+            self.env["SPINAL_SHARD"] = "%d/%d" % shard
+        self.variables = None
+        self.returnCode = None
+        self.maxRss = 0
+        self.duration = 0.0
+        self.suite = None
+        self.hasResults = False
+        self.cached = False
+        self.cacheErrors = []
+
+    def makeArgs(self):
+        return ["make", "-C", self.tester.path,
+                "TOPLEVEL_LANG=" + self.lang,
+                "SIM_BUILD=" + self.buildDir,
+                "COCOTB_RESULTS_FILE=" + self.resultsFile]
+
+
+def discoverTesters(root = spinalPath):
+    testers = []
+    for dirPath, dirNames, fileNames in os.walk(root):
+        dirNames[:] = sorted(d for d in dirNames if d not in ("common", "__pycache__", "sim_build"))
+        if "Makefile" not in fileNames:
+            continue
+        with open(os.path.join(dirPath, "Makefile")) as f:
+            makefile = f.read()
+        if not re.search(r"common/Makefile\.sim|default\.mk", makefile):
+            continue
+        languages = []
+        if "VERILOG_SOURCES" in makefile or "default.mk" in makefile:
+            languages.append("verilog")
+        if "VHDL_SOURCES" in makefile:
+            languages.append("vhdl")
+        shardable = re.search(r"^SPINAL_SHARDABLE\s*:?=\s*1", makefile, re.MULTILINE) is not None
+        testers.append(Tester(os.path.relpath(dirPath, root).replace(os.sep, "/"), dirPath, languages, shardable))
+    return testers
+
+
+def selectTesters(testers, filters):
+    if not filters:
+        return testers
+    return [t for t in testers if any(f in t.name for f in filters)]
+
+
+def createJobs(testers, languages, workspace, shards = 1):
+    jobs = []
+    for tester in testers:
+        for lang in tester.languages:
+            if lang not in languages:
+                continue
+            if tester.shardable and shards > 1:
+                jobs.extend(Job(tester, lang, workspace, (index, shards)) for index in range(shards))
+            else:
+                jobs.append(Job(tester, lang, workspace))
+    return jobs
+
+
+def waitProcess(process, timeout = None):
+    """Wait for the process like Popen.wait, but also return its resource usage, which includes the simulator."""
+    deadline = None if timeout is None else time.time() + timeout
+    while True:
+        pid, status, rusage = os.wait4(process.pid, 0 if deadline is None else os.WNOHANG)
+        if pid:
+            process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+            return process.returncode, rusage
+        if time.time() > deadline:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+        time.sleep(0.1)
+
+
+def jobEnvironment(job):
+    """The runner environment updated with job.env, where a None value removes the variable."""
+    env = dict(os.environ)
+    env.update(job.env)
+    return {key : value for key, value in env.items() if value is not None}
+
+
+def cacheStep(job, description, function, *args):
+    """Run a cache operation of the job, a failure only disables the caching of this job."""
+    try:
+        return function(*args)
+    except Exception:
+        job.cacheErrors.append("*** %s failed, caching disabled for this job\n%s" % (description, traceback.format_exc()))
+        return None
+
+
+def writeCacheErrors(job, log):
+    for error in job.cacheErrors:
+        log.write(error)
+    job.cacheErrors = []
+
+
+def executeJob(job, timeout, cache, simCache):
+    key = None
+    if cache:
+        key = cacheStep(job, "result fingerprint", jobFingerprint, job)
+        suite = cacheStep(job, "result cache load", cache.load, key) if key else None
+        if suite is not None:
+            job.suite = suite
+            job.cached = True
+            return job
+
+    os.makedirs(job.buildDir, exist_ok=True)
+    compileKey = None
+    compileRestored = False
+    if simCache:
+        compileKey = cacheStep(job, "compile fingerprint", compileFingerprint, job)
+        if compileKey:
+            compileRestored = cacheStep(job, "sim cache restore", simCache.restore, compileKey, job.buildDir)
+    if os.path.exists(job.resultsFile):
+        os.remove(job.resultsFile)
+    env = jobEnvironment(job)
+    start = time.time()
+    with open(job.logFile, "w") as log:
+        writeCacheErrors(job, log)
+        log.flush()
+        # In its own process group, so a timeout also kills the simulator started by make
+        process = subprocess.Popen(job.makeArgs(), stdout=log, stderr=subprocess.STDOUT, env=env, start_new_session=True)
+        try:
+            job.returnCode, rusage = waitProcess(process, timeout)
+            job.maxRss = rusage.ru_maxrss
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.wait()
+            log.write("\n*** Killed by the regression runner after %d seconds\n" % timeout)
+            job.returnCode = -1
+    job.duration = time.time() - start
+    job.suite = loadSuite(job)
+    if compileKey and not compileRestored and job.hasResults:
+        cacheStep(job, "sim cache store", simCache.store, compileKey, job.buildDir, compileArtifacts(job))
+    if key and job.hasResults and job.returnCode != -1:
+        cacheStep(job, "result cache store", cache.store, key, copy.deepcopy(job.suite))
+    if job.cacheErrors:
+        with open(job.logFile, "a") as log:
+            writeCacheErrors(job, log)
+    return job
+
+
+def runJob(job, timeout = None, cache = None, simCache = None):
+    """Run one job, an error of the runner itself fails this job only and is written to its log."""
+    try:
+        return executeJob(job, timeout, cache, simCache)
+    except Exception:
+        error = traceback.format_exc()
+        try:
+            os.makedirs(job.buildDir, exist_ok=True)
+            with open(job.logFile, "a") as log:
+                writeCacheErrors(job, log)
+                log.write("\n*** Regression runner error\n" + error)
+        except OSError:
+            pass
+        if job.returnCode is None:
+            job.returnCode = -1
+        job.cached = False
+        job.suite = ET.Element("testsuite", name=job.name)
+        testcase = ET.SubElement(job.suite, "testcase", classname=job.name, name="runner", time="%.2f" % job.duration)
+        ET.SubElement(testcase, "error", message="regression runner error").text = error
+        return job
+
+
+def logTail(path, lineCount = 30):
+    try:
+        with open(path, errors="replace") as f:
+            return "".join(f.readlines()[-lineCount:])
+    except IOError:
+        return ""
+
+
+def loadSuite(job):
+    suite = ET.Element("testsuite", name=job.name)
+    if os.path.exists(job.resultsFile):
+        try:
+            root = ET.parse(job.resultsFile).getroot()
+            job.hasResults = True
+            for testcase in root.iter("testcase"):
+                testcase.set("classname", job.name + "." + testcase.get("classname", ""))
+                suite.append(testcase)
+        except ET.ParseError as e:
+            testcase = ET.SubElement(suite, "testcase", classname=job.name, name="results")
+            ET.SubElement(testcase, "error", message=str(e))
+    # A shard may get no test at all when there are more shards than tests, it is empty, not failed
+    emptyShard = job.shard and job.returnCode == 0 and job.hasResults
+    if (len(suite) == 0 and not emptyShard) or (job.returnCode != 0 and not jobFailed(suite)):
+        testcase = ET.SubElement(suite, "testcase", classname=job.name, name="make", time="%.2f" % job.duration)
+        error = ET.SubElement(testcase, "error", message="make exited with %s" % job.returnCode)
+        error.text = logTail(job.logFile)
+    return suite
+
+
+def testcaseFailed(testcase):
+    return any(child.tag in ("failure", "error") for child in testcase)
+
+
+def testcaseSkipped(testcase):
+    return not testcaseFailed(testcase) and any(child.tag == "skipped" for child in testcase)
+
+
+def jobFailed(suite):
+    return any(testcaseFailed(testcase) for testcase in suite.iter("testcase"))
+
+
+def mergeReports(jobs, path):
+    root = ET.Element("testsuites", name="spinal")
+    for job in jobs:
+        suite = job.suite
+        testcases = list(suite.iter("testcase"))
+        suite.set("tests", str(len(testcases)))
+        suite.set("failures", str(sum(1 for t in testcases if testcaseFailed(t))))
+        suite.set("skipped", str(sum(1 for t in testcases if testcaseSkipped(t))))
+        suite.set("time", "%.2f" % job.duration)
+        root.append(suite)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    ET.ElementTree(root).write(path, encoding="UTF-8", xml_declaration=True)
+    return root
+
+
+def runJobs(jobs, workers, timeout = None, onDone = None, cache = None, simCache = None):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(runJob, job, timeout, cache, simCache) for job in jobs]
+        for future in as_completed(futures):
+            job = future.result()
+            if onDone:
+                onDone(job)
+    return jobs
+
+
+def printJob(job):
+    status = "FAIL" if jobFailed(job.suite) else "PASS"
+    print("[%s] %-50s %7.1fs%s" % (status, job.name, job.duration, " (cached)" if job.cached else ""))
+    sys.stdout.flush()
+
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(description="Run the cocotb testers in parallel")
+    parser.add_argument("filters", nargs="*", help="only run testers whose path contains one of these strings")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of simulations run at once")
+    parser.add_argument("--lang", action="append", choices=LANGUAGES, help="language to run, can be repeated, all by default")
+    parser.add_argument("--workspace", default=os.path.join(os.getcwd(), "regressionWorkspace"), help="root of the per job SIM_BUILD directories")
+    parser.add_argument("--report", default=None, help="merged JUnit report, <workspace>/results.xml by default")
+    parser.add_argument("--shards", type=int, default=1, help="split the testers which support it into this many simulations")
+    parser.add_argument("--timeout", type=float, default=None, help="kill a simulation after this many seconds")
+    parser.add_argument("--cache", default=None, help="result cache directory, <workspace>/resultCache by default")
+    parser.add_argument("--no-cache", action="store_true", help="always run the simulations")
+    parser.add_argument("--sim-cache", default=None, help="compiled simulator cache directory, <workspace>/simCache by default")
+    parser.add_argument("--sim-cache-size", type=int, default=8192, help="size cap of the compiled simulator cache in MB")
+    parser.add_argument("--no-sim-cache", action="store_true", help="always compile the toplevels")
+    parser.add_argument("--list", action="store_true", help="only print the discovered testers")
+    return parser.parse_args(argv)
+
+
+def main(argv = None):
+    args = parseArgs(argv)
+    workspace = os.path.abspath(args.workspace)
+    testers = selectTesters(discoverTesters(), args.filters)
+    if args.list:
+        for tester in testers:
+            print(tester)
+        return 0
+
+    jobs = createJobs(testers, args.lang or LANGUAGES, workspace, args.shards)
+    cache = None if args.no_cache else ResultCache(os.path.abspath(args.cache or os.path.join(workspace, "resultCache")))
+    simCache = None if args.no_sim_cache else SimCache(os.path.abspath(args.sim_cache or os.path.join(workspace, "simCache")), args.sim_cache_size << 20)
+    start = time.time()
+    runJobs(jobs, args.jobs, args.timeout, printJob, cache, simCache)
+    report = args.report or os.path.join(workspace, "results.xml")
+    mergeReports(jobs, report)
+
+    failed = [job for job in jobs if jobFailed(job.suite)]
+    cached = sum(1 for job in jobs if job.cached)
+    print("%d jobs (%d cached), %d failed, %.1fs wall time, report : %s" % (len(jobs), cached, len(failed), time.time() - start, report))
+    for job in failed:
+        print("  FAIL %s (log : %s)" % (job.name, job.logFile))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Result cache of the regression runner.
+
+A job is fingerprinted by the content of its RTL sources (VERILOG_SOURCES/VHDL_SOURCES), of the data files read by
+its tests (SPINAL_DATA_FILES), of its MODULE files and of their transitive cocotblib.* / spinal.* imports, by TOPLEVEL,
+SIM, RANDOM_SEED, the simulator arguments and timescale, and by the SPINAL_* environment variables changing what the
+tests do. When a job with the same fingerprint already ran, its results are replayed instead of launching the simulator.
+"""
+
+import ast
+import hashlib
+import os
+import subprocess
+import threading
+import xml.etree.ElementTree as ET
+
+pythonPath = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+# Make variables printed by the regression-inputs target of common/Makefile.sim
+INPUT_VARIABLES = ["TOPLEVEL", "MODULE", "VERILOG_SOURCES", "VHDL_SOURCES", "SPINAL_DATA_FILES", "SIM", "RANDOM_SEED", "EXTRA_ARGS", "COMPILE_ARGS", "SIM_ARGS", "PLUSARGS", "TESTCASE",
+                   "COCOTB_HDL_TIMEUNIT", "COCOTB_HDL_TIMEPRECISION"]
+
+# SPINAL_* environment variables which only tell where to write metrics and caches, or turn the profiler on. All the
+# others (SPINAL_SEED, SPINAL_SOAK, SPINAL_SWEEP, SPINAL_PRELOAD, SPINAL_SHARD, ...) are part of the fingerprint.
+IGNORED_ENVIRONMENT = ["SPINAL_METRICS_DIR", "SPINAL_PROFILE", "SPINAL_HEX_CACHE", "SPINAL_WAVE_CACHE", "SPINAL_WAVE_CACHE_SIZE"]
+
+# Only these packages are followed when walking the imports of a MODULE, everything else is considered as installed
+FOLLOWED_PACKAGES = ("spinal", "cocotblib")
+
+
+def hashFile(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def makeVariables(job):
+    if job.variables is not None:
+        return job.variables
+    args = ["make", "-s", "--no-print-directory", "-C", job.tester.path, "TOPLEVEL_LANG=" + job.lang, "regression-inputs"]
+    env = dict(os.environ)
+    env.update(job.env)
+    output = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, universal_newlines=True, check=True).stdout
+    variables = {}
+    for line in output.splitlines():
+        key, sep, value = line.partition("=")
+        if sep and key in INPUT_VARIABLES:
+            variables[key] = value.strip()
+    job.variables = variables
+    return variables
+
+
+def findModule(name, searchPaths):
+    relative = name.replace(".", os.sep)
+    for path in searchPaths:
+        for candidate in (os.path.join(path, relative + ".py"), os.path.join(path, relative, "__init__.py")):
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def importedModules(path, moduleName):
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    package = moduleName if path.endswith("__init__.py") else moduleName.rpartition(".")[0]
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                parts = parts[:len(parts) - node.level + 1]
+                base = ".".join(parts + ([base] if base else []))
+            names.append(base)
+            names.extend(base + "." + alias.name for alias in node.names if alias.name != "*")
+    return names
+
+
+def moduleDependencies(modules, searchPaths):
+    """Return the files of the given modules and of everything they import from the followed packages."""
+    files = {}
+    pending = list(modules)
+    visited = set()
+    while pending:
+        name = pending.pop()
+        if not name or name in visited:
+            continue
+        visited.add(name)
+        parts = name.split(".")
+        local = name in modules
+        if not local and parts[0] not in FOLLOWED_PACKAGES and findModule(parts[0], searchPaths[:1]) is None:
+            continue
+        # Parent packages are imported first, their __init__ is part of the dependencies
+        for i in range(1, len(parts)):
+            pending.append(".".join(parts[:i]))
+        path = findModule(name, searchPaths)
+        if path is None:
+            continue
+        files[name] = path
+        pending.extend(importedModules(path, name))
+    return files
+
+
+def sourceInputs(job):
+    variables = makeVariables(job)
+    inputs = []
+    for key in ("VERILOG_SOURCES", "VHDL_SOURCES"):
+        for source in variables.get(key, "").split():
+            inputs.append(("file", source, hashFile(os.path.join(job.tester.path, source))))
+    return inputs
+
+
+def dataInputs(job):
+    inputs = []
+    for data in makeVariables(job).get("SPINAL_DATA_FILES", "").split():
+        path = os.path.join(job.tester.path, data)
+        inputs.append(("data", data, hashFile(path) if os.path.exists(path) else "missing"))
+    return inputs
+
+
+def environmentInputs(job):
+    env = dict(os.environ)
+    env.update(job.env)
+    return [("env", key, value) for key, value in env.items() if key.startswith("SPINAL_") and key not in IGNORED_ENVIRONMENT and value is not None]
+
+
+def jobInputs(job):
+    """Return a sorted list of (kind, name, digest) describing everything the simulation result depends on."""
+    variables = makeVariables(job)
+    inputs = [("var", key, variables.get(key, "")) for key in INPUT_VARIABLES]
+    inputs.extend(environmentInputs(job))
+    inputs.append(("file", "Makefile", hashFile(os.path.join(job.tester.path, "Makefile"))))
+    inputs.extend(sourceInputs(job))
+    inputs.extend(dataInputs(job))
+    modules = [m for m in variables.get("MODULE", "").split(",") if m]
+    for name, path in sorted(moduleDependencies(modules, [job.tester.path, pythonPath]).items()):
+        inputs.append(("module", name, hashFile(path)))
+    return sorted(inputs)
+
+
+def fingerprint(inputs):
+    digest = hashlib.sha256()
+    for kind, name, value in inputs:
+        digest.update(("%s %s %s\n" % (kind, name, value)).encode())
+    return digest.hexdigest()
+
+
+def jobFingerprint(job):
+    return fingerprint(jobInputs(job))
+
+
+class ResultCache:
+    def __init__(self, path):
+        self.path = path
+
+    def entryPath(self, key):
+        return os.path.join(self.path, key[:2], key + ".xml")
+
+    def load(self, key):
+        path = self.entryPath(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            suite = ET.parse(path).getroot()
+        except ET.ParseError:
+            return None
+        os.utime(path)
+        return suite
+
+    def store(self, key, suite):
+        path = self.entryPath(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so that concurrent runners never read a partial entry
+        tmp = path + ".%d.%d.tmp" % (os.getpid(), threading.get_ident())
+        ET.ElementTree(suite).write(tmp, encoding="UTF-8", xml_declaration=True)
+        os.replace(tmp, path)
@@ -0,0 +1,58 @@
+"""
+Per agent random streams.
+
+The testers used to call random.seed(0) and let every agent draw from the module random generator, so adding an agent,
+or changing the order in which the agents wake up, shifted the stimulus of all the others. agentRng(name) instead
+returns a random.Random seeded from the master seed and the agent name only : the stimulus of an agent can be replayed
+alone, and stays the same when the test is split into shards or other agents are added.
+
+The master seed is cocotb's RANDOM_SEED, the one the vectors and the module random generator follow, so replaying a
+failure with RANDOM_SEED=<seed> also replays the agents. SPINAL_SEED, when set, wins over it and only reseeds the agents.
+
+BoolRandomizer is cocotblib.misc.BoolRandomizer (a valid/ready probability which changes every 100 draws), drawing
+from its own generator instead of the module one.
+
+Usage :
+    rng = agentRng("Axi4WriteMasterDriver0")
+    address = rng.getrandbits(12)
+    idle = BoolRandomizer(agentRng("Axi4WriteMasterDriver0.idle"))
+"""
+
+import hashlib
+import os
+import random
+import types
+
+import cocotb
+from cocotblib import misc
+
+
+def masterSeed():
+    seed = os.getenv("SPINAL_SEED")
+    if seed:
+        return int(seed, 0)
+    # Set by cocotb from RANDOM_SEED (or from the time) before the tests are loaded
+    seed = getattr(cocotb, "RANDOM_SEED", None)
+    if seed is None:
+        return int(os.getenv("RANDOM_SEED", "0"), 0)
+    return seed
+
+
+def agentSeed(name, seed = None):
+    key = "%d/%s" % (masterSeed() if seed is None else seed, name)
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "little")
+
+
+def agentRng(name, seed = None):
+    return random.Random(agentSeed(name, seed))
+
+
+class BoolRandomizer(misc.BoolRandomizer):
+    def __init__(self, rng):
+        misc.BoolRandomizer.__init__(self)
+        self.rng = rng
+        # The cocotblib get() itself, with its random global bound to rng
+        self.draw = types.FunctionType(misc.BoolRandomizer.get.__code__, dict(vars(misc), random=rng))
+
+    def get(self):
+        return self.draw(self)
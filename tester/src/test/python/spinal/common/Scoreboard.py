@@ -0,0 +1,110 @@
+"""
+Single threaded scoreboards.
+
+queue.Queue takes its lock on every put and get, although all the testbench coroutines run in the simulator thread.
+A Scoreboard keeps the expected payloads as unsigned integers in a ring buffer (an array of 64 bits words, which grows
+by doubling), so a transaction costs two index updates and no object allocation. Payloads made of several fields are
+packed into a single integer with a Packing. Payloads wider than 64 bits are kept in a collections.deque instead.
+
+The deepest backlog is tracked as highWater. With a limit, a put beyond it raises a TestFailure, so a DUT which keeps
+accepting stimulus without delivering it can't make a long run grow its memory (see Soak).
+
+put, get, empty and qsize behave like the queue.Queue ones, except that get on an empty scoreboard raises a
+TestFailure, where queue.Queue would block the simulator thread forever.
+
+Usage :
+    packing = Packing([len(dut.io_payload_a), len(dut.io_payload_b)])
+    scoreboard = Scoreboard(packing.width)
+    scoreboard.put(packing.pack(a, b))
+    a, b = packing.unpack(scoreboard.get())
+"""
+
+from array import array
+from collections import deque
+
+from cocotb.result import TestFailure
+
+WORD_WIDTH = 64
+
+
+class Packing:
+    """Fixed layout of a multi field payload, the first field in the low bits."""
+    def __init__(self, widths):
+        self.widths = widths
+        self.shifts = []
+        self.width = 0
+        for width in widths:
+            self.shifts.append(self.width)
+            self.width += width
+
+    def pack(self, *values):
+        packed = 0
+        for value, shift, width in zip(values, self.shifts, self.widths):
+            packed |= (int(value) & ((1 << width) - 1)) << shift
+        return packed
+
+    def unpack(self, packed):
+        return [(packed >> shift) & ((1 << width) - 1) for shift, width in zip(self.shifts, self.widths)]
+
+
+class Scoreboard:
+    __slots__ = ["name", "words", "mask", "head", "count", "wide", "limit", "highWater"]
+
+    def __init__(self, width = WORD_WIDTH, name = "scoreboard", capacity = 64, limit = None):
+        self.name = name
+        self.head = 0
+        self.count = 0
+        self.limit = limit
+        self.highWater = 0
+        self.wide = deque() if width > WORD_WIDTH else None
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.words = array("Q", bytes(8 * size))
+        self.mask = size - 1
+
+    def put(self, value):
+        if self.wide is not None:
+            self.wide.append(int(value))
+            self.filled(len(self.wide))
+            return
+        if self.count > self.mask:
+            self.grow()
+        self.words[(self.head + self.count) & self.mask] = int(value)
+        self.count += 1
+        if self.count > self.highWater:
+            self.filled(self.count)
+
+    def filled(self, count):
+        if count > self.highWater:
+            self.highWater = count
+            if self.limit is not None and count > self.limit:
+                raise TestFailure("%s : more than %d expected payloads pending" % (self.name, self.limit))
+
+    def get(self):
+        if self.wide is not None:
+            if not self.wide:
+                raise TestFailure("%s : no expected payload left" % self.name)
+            return self.wide.popleft()
+        if self.count == 0:
+            raise TestFailure("%s : no expected payload left" % self.name)
+        value = self.words[self.head]
+        self.head = (self.head + 1) & self.mask
+        self.count -= 1
+        return value
+
+    def grow(self):
+        # Only called when full, the oldest payload is at head
+        size = len(self.words)
+        self.words = self.words[self.head:] + self.words[:self.head] + array("Q", bytes(8 * size))
+        self.mask = 2 * size - 1
+        self.head = 0
+
+    def qsize(self):
+        return len(self.wide) if self.wide is not None else self.count
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def __len__(self):
+        return self.qsize()
@@ -0,0 +1,27 @@
+"""
+Test sharding.
+
+A tester whose tests are generated from a list (TestFactory options) can split that list across several simulator
+processes. The regression runner (--shards N) launches one job per shard with SPINAL_SHARD=<index>/<count>, each with
+its own SIM_BUILD directory, and each simulator only generates its own part of the tests. The shards results are merged
+back into the regression report.
+
+Testers opt in by setting SPINAL_SHARDABLE := 1 in their Makefile. With more shards than tests, some shards have no
+test at all, the runner reports them as empty instead of failed.
+"""
+
+import os
+
+
+def shardIndex():
+    value = os.getenv("SPINAL_SHARD")
+    if not value:
+        return 0, 1
+    index, count = value.split("/")
+    return int(index), int(count)
+
+
+def shardTests(tests):
+    """Return the part of the tests run by the current shard, round robin so slow neighbouring tests are spread."""
+    index, count = shardIndex()
+    return tests[index::count]
@@ -0,0 +1,33 @@
+"""
+Cached signal widths of the randomized stimulus.
+
+randSignal asks the simulator for the signal width at every call. SignalWidths.rand resolves each width once and draws
+the random value the same way, so seeded runs keep the same stimulus. The value is written with a plain deferred <=,
+cocotb already applies those together from its ReadWrite callback.
+
+Usage :
+    widths = SignalWidths()
+    while True:
+        yield RisingEdge(dut.clk)
+        dut.io_valid <= 1
+        widths.rand(dut.io_payload)
+"""
+
+import random
+
+
+class SignalWidths:
+    def __init__(self):
+        self.widths = {}
+
+    def width(self, handle):
+        width = self.widths.get(handle)
+        if width is None:
+            width = self.widths[handle] = len(handle)
+        return width
+
+    def rand(self, handle, rng = random):
+        """Same as randSignal, with the same consumption of the random generator."""
+        value = rng.getrandbits(self.width(handle))
+        handle <= value
+        return value
@@ -0,0 +1,141 @@
+"""
+Compiled simulator cache of the regression runner.
+
+The outputs of the simulator compilation step (the icarus sim.vvp, the ghdl work library) are stored on disk, keyed by
+the content of the RTL sources, TOPLEVEL, SIM, the compile arguments, the timescale and the simulator version. Before a
+job runs, a matching entry is copied into its SIM_BUILD directory with a fresh timestamp, so make considers the
+toplevel as up to date and the simulation starts immediately. ghdl always reruns its analyse step, but with the
+restored library it only checks that the units are up to date. Testers sharing the same RTL (the Pinsec ones for
+instance) share the same entry.
+
+Entries are evicted in least recently used order once the cache grows beyond its size cap.
+"""
+
+import fnmatch
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+from spinal.common.RegressionCache import makeVariables, sourceInputs, fingerprint
+
+# Files produced by the compilation step of each simulator, relative to SIM_BUILD
+ARTIFACTS = {
+    "icarus" : ["sim.vvp", "cmds.f"],
+    "ghdl"   : ["*.cf", "*.o", "*.lst"],
+}
+
+# Command printing the version of each simulator, a toolchain upgrade must not reuse the old compiled images
+VERSION_COMMANDS = {
+    "icarus" : ["iverilog", "-V"],
+    "ghdl"   : ["ghdl", "--version"],
+}
+
+versions = {}
+versionsLock = threading.Lock()
+
+
+def simulatorVersion(sim):
+    with versionsLock:
+        if sim not in versions:
+            # iverilog -V exits with an error as no source is given, only its output matters
+            output = subprocess.run(VERSION_COMMANDS[sim], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True).stdout
+            if not output.strip():
+                raise OSError("no version printed by " + " ".join(VERSION_COMMANDS[sim]))
+            versions[sim] = output.strip().splitlines()[0]
+        return versions[sim]
+
+
+def compileFingerprint(job):
+    variables = makeVariables(job)
+    sim = variables.get("SIM", "")
+    if sim not in ARTIFACTS:
+        return None
+    keys = ("SIM", "TOPLEVEL", "EXTRA_ARGS", "COMPILE_ARGS", "COCOTB_HDL_TIMEUNIT", "COCOTB_HDL_TIMEPRECISION")
+    inputs = [("var", key, variables.get(key, "")) for key in keys]
+    inputs.append(("var", "TOPLEVEL_LANG", job.lang))
+    inputs.append(("var", "SIM_VERSION", simulatorVersion(sim)))
+    inputs.extend(sourceInputs(job))
+    return fingerprint(sorted(inputs))
+
+
+def compileArtifacts(job):
+    variables = makeVariables(job)
+    sim = variables.get("SIM", "")
+    patterns = list(ARTIFACTS.get(sim, []))
+    if sim == "ghdl":
+        # Elaborated executable of the gcc and llvm backends
+        patterns.append(variables.get("TOPLEVEL", "").lower())
+    return patterns
+
+
+def directorySize(path):
+    size = 0
+    for dirPath, dirNames, fileNames in os.walk(path):
+        for fileName in fileNames:
+            try:
+                size += os.path.getsize(os.path.join(dirPath, fileName))
+            except OSError:
+                pass
+    return size
+
+
+class SimCache:
+    def __init__(self, path, maxSize):
+        self.path = path
+        self.maxSize = maxSize
+        self.lock = threading.Lock()
+
+    def entryPath(self, key):
+        return os.path.join(self.path, key)
+
+    def restore(self, key, buildDir):
+        entry = self.entryPath(key)
+        if not os.path.isdir(entry):
+            return False
+        os.makedirs(buildDir, exist_ok=True)
+        now = time.time()
+        try:
+            for fileName in os.listdir(entry):
+                target = os.path.join(buildDir, fileName)
+                shutil.copy(os.path.join(entry, fileName), target)
+                # Newer than any source, so the compile rule of cocotb is skipped
+                os.utime(target, (now, now))
+            os.utime(entry)
+        except OSError:
+            return False
+        return True
+
+    def store(self, key, buildDir, patterns):
+        entry = self.entryPath(key)
+        if os.path.isdir(entry):
+            return
+        fileNames = [f for f in os.listdir(buildDir) if any(fnmatch.fnmatch(f, pattern) for pattern in patterns if pattern)]
+        if not fileNames:
+            return
+        tmp = entry + ".%d.%d.tmp" % (os.getpid(), threading.get_ident())
+        os.makedirs(tmp)
+        for fileName in fileNames:
+            shutil.copy(os.path.join(buildDir, fileName), os.path.join(tmp, fileName))
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Another runner stored the same entry meanwhile
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        with self.lock:
+            entries = []
+            for name in os.listdir(self.path):
+                entry = os.path.join(self.path, name)
+                if name.endswith(".tmp") or not os.path.isdir(entry):
+                    continue
+                entries.append((os.path.getmtime(entry), directorySize(entry), entry))
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries):
+                if total <= self.maxSize:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
@@ -0,0 +1,48 @@
+"""
+Batched signal sampling.
+
+A SignalSnapshot resolves a declared set of signal handles once, and reads all of them in one go into a compact record
+(a __slots__ object), instead of letting the testbench call int(dut.x) several times per cycle for the same signal,
+each call being a dictionary lookup plus a VPI round trip.
+
+Split the signals into groups by when they are needed, so the payloads are only read when they are used, which also
+keeps undefined (X) payloads from being converted :
+    control = SignalSnapshot(dut, ["io_cmd_valid", "io_cmd_ready"])
+    payload = SignalSnapshot(dut, ["io_cmd_payload_address", "io_cmd_payload_data"])
+    while True:
+        yield RisingEdge(dut.clk)
+        c = control.sample()
+        if c.io_cmd_valid and c.io_cmd_ready:
+            p = payload.sample()
+            ... p.io_cmd_payload_address ...
+"""
+
+recordClasses = {}
+
+
+def recordClass(names):
+    names = tuple(names)
+    cls = recordClasses.get(names)
+    if cls is None:
+        cls = recordClasses[names] = type("SignalRecord", (object,), {
+            "__slots__" : names,
+            "__repr__" : lambda self: "SignalRecord(%s)" % ", ".join("%s=%s" % (n, getattr(self, n)) for n in names)
+        })
+    return cls
+
+
+class SignalSnapshot:
+    def __init__(self, dut, names):
+        self.names = list(names)
+        self.handles = [getattr(dut, name) for name in self.names]
+        self.record = recordClass(self.names)
+
+    def sample(self):
+        """Read every signal once, as an int. A signal with X/Z bits raises like int(handle) does."""
+        record = self.record.__new__(self.record)
+        for name, handle in zip(self.names, self.handles):
+            setattr(record, name, int(handle))
+        return record
+
+    def values(self):
+        return tuple(int(handle) for handle in self.handles)
@@ -0,0 +1,86 @@
+"""
+Long duration stress runs.
+
+The testers size their runs with soakCount(1000) instead of a hard wired number of transactions, and SPINAL_SOAK
+multiplies all of them : SPINAL_SOAK=1000 turns the 1000 transactions sub tests into 1M transactions ones. Without it
+the counts are the usual ones and nothing else changes.
+
+During a soak run :
+- the scoreboards are created with backlogLimit() (SPINAL_SOAK_BACKLOG, 4096 payloads by default), so a DUT which
+  accepts stimulus without delivering it fails instead of making the run grow its memory for hours.
+- a SoakReport logs every SPINAL_SOAK_PERIOD wall seconds (60 by default) the progress and throughput of each agent,
+  and the backlog and backlog high water mark of its scoreboards.
+
+Usage :
+    make SPINAL_SOAK=1000
+"""
+
+import os
+import time
+
+import cocotb
+
+from spinal.common.Completion import Completion
+from spinal.common.Scoreboard import Scoreboard
+
+
+def soakScale():
+    return float(os.getenv("SPINAL_SOAK", "1"))
+
+
+def soaking():
+    return soakScale() != 1
+
+
+def soakCount(count):
+    return max(1, int(round(count * soakScale())))
+
+
+def backlogLimit():
+    return int(os.getenv("SPINAL_SOAK_BACKLOG", "4096")) if soaking() else None
+
+
+def agentStats(agent, types):
+    """Instances of types held by the agent attributes, directly or in lists."""
+    found = []
+    for value in vars(agent).values():
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, types):
+                found.append(item)
+    return found
+
+
+class SoakReport:
+    def __init__(self, dispatcher, period = None):
+        self.dispatcher = dispatcher
+        self.period = period if period is not None else float(os.getenv("SPINAL_SOAK_PERIOD", "60"))
+        self.agents = []
+        self.start = time.time()
+        self.last = self.start
+        self.lastCounts = {}
+        if soaking():
+            dispatcher.onRisingEdge(self.step)
+
+    def watch(self, name, agent):
+        """Report the Completion and Scoreboard attributes of the agent."""
+        self.agents.append((name, agentStats(agent, Completion), agentStats(agent, Scoreboard)))
+        return agent
+
+    def step(self):
+        # Only look at the wall clock once in a while
+        if self.dispatcher.cycles & 0x3FF == 0 and time.time() - self.last >= self.period:
+            self.report()
+
+    def report(self):
+        now = time.time()
+        elapsed = now - self.last
+        cocotb.log.info("Soak %.0fs, %d cycles" % (now - self.start, self.dispatcher.cycles))
+        for name, completions, scoreboards in self.agents:
+            progress = []
+            for completion in completions:
+                done = completion.count - self.lastCounts.get(completion, 0)
+                self.lastCounts[completion] = completion.count
+                progress.append("%d/%d (%.0f/s)" % (completion.count, completion.target, done / max(elapsed, 1e-9)))
+            backlog = ["%s %d (high %d)" % (scoreboard.name, scoreboard.qsize(), scoreboard.highWater) for scoreboard in scoreboards]
+            cocotb.log.info("  %-36s %s%s" % (name, " ".join(progress), ", backlog : " + ", ".join(backlog) if backlog else ""))
+        self.last = now
@@ -0,0 +1,117 @@
+"""
+Stream agents stepped by a ClockDispatcher.
+
+Same constructor arguments and callbacks as the StreamRandomizer, FlowRandomizer and StreamReader coroutines of
+cocotblib.misc, except that the last argument is the ClockDispatcher of the clock instead of the clock itself, and that
+they register themselves on its rising edge instead of being forked.
+
+The payload given to the callbacks is an int for a <name>_payload signal, or a record of ints with one attribute per
+<name>_payload_<field> signal (payload.fragment, payload.last, ...). The randomizers give the values they drove, so
+they don't have to wait for the simulator to read them back.
+
+Each agent draws its handshakes and payloads from its own generator, agentRng(<stream name>) (see Rng).
+
+Usage :
+    dispatcher = ClockDispatcher(dut.clk)
+    cocotb.fork(dispatcher.run())
+    StreamRandomizer("cmd", onCmd, None, dut, dispatcher)
+    StreamReader("rsp", onRsp, None, dut, dispatcher)
+"""
+
+from spinal.common.Rng import BoolRandomizer, agentRng
+from spinal.common.Snapshot import recordClass
+
+
+class Payload:
+    """The payload signals of a stream or of a flow."""
+    def __init__(self, dut, name):
+        handles = sorted((h for h in dut if h._name == name or h._name.startswith(name + "_")), key=lambda h: h._name)
+        self.handles = handles
+        self.single = len(handles) == 1 and handles[0]._name == name
+        self.record = None if self.single else recordClass([h._name[len(name) + 1:] for h in handles])
+
+    def make(self, values):
+        if self.single:
+            return values[0]
+        record = self.record.__new__(self.record)
+        for field, value in zip(self.record.__slots__, values):
+            setattr(record, field, value)
+        return record
+
+    def randomize(self, widths, rng):
+        return self.make([widths.rand(handle, rng) for handle in self.handles])
+
+    def read(self):
+        return self.make([int(handle) for handle in self.handles])
+
+
+class StreamRandomizer:
+    def __init__(self, streamName, onNew, handle, dut, dispatcher):
+        self.valid = getattr(dut, streamName + "_valid")
+        self.ready = getattr(dut, streamName + "_ready")
+        self.payload = Payload(dut, streamName + "_payload")
+        self.onNew = onNew
+        self.handle = handle
+        self.widths = dispatcher.widths
+        self.rng = agentRng(streamName)
+        self.validRandomizer = BoolRandomizer(self.rng)
+        self.validValue = 0
+        self.valid <= 0
+        dispatcher.onRisingEdge(self.step)
+
+    def step(self):
+        ready = int(self.ready)
+        idle = not self.validValue
+        if ready:
+            self.validValue = 0
+            self.valid <= 0
+        if idle or ready:
+            if self.validRandomizer.get():
+                self.validValue = 1
+                self.valid <= 1
+                payload = self.payload.randomize(self.widths, self.rng)
+                if self.onNew:
+                    self.onNew(payload, self.handle)
+
+
+class FlowRandomizer:
+    def __init__(self, flowName, onNew, handle, dut, dispatcher):
+        self.valid = getattr(dut, flowName + "_valid")
+        self.payload = Payload(dut, flowName + "_payload")
+        self.onNew = onNew
+        self.handle = handle
+        self.widths = dispatcher.widths
+        self.rng = agentRng(flowName)
+        self.validRandomizer = BoolRandomizer(self.rng)
+        self.valid <= 0
+        dispatcher.onRisingEdge(self.step)
+
+    def step(self):
+        if self.validRandomizer.get():
+            self.valid <= 1
+            payload = self.payload.randomize(self.widths, self.rng)
+            if self.onNew:
+                self.onNew(payload, self.handle)
+        else:
+            self.valid <= 0
+
+
+class StreamReader:
+    def __init__(self, streamName, onTransaction, handle, dut, dispatcher):
+        self.valid = getattr(dut, streamName + "_valid")
+        self.ready = getattr(dut, streamName + "_ready")
+        self.payload = Payload(dut, streamName + "_payload")
+        self.onTransaction = onTransaction
+        self.handle = handle
+        self.readyRandomizer = BoolRandomizer(agentRng(streamName))
+        self.readyValue = 0
+        self.ready <= 0
+        dispatcher.onRisingEdge(self.step)
+
+    def step(self):
+        # The ready value of the edge is the one driven at the previous step
+        fire = self.readyValue and int(self.valid) == 1
+        self.readyValue = 1 if self.readyRandomizer.get() else 0
+        self.ready <= self.readyValue
+        if fire:
+            self.onTransaction(self.payload.read(), self.handle)
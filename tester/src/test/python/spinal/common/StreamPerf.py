@@ -0,0 +1,208 @@
+"""
+Passive performance monitor of ready/valid streams.
+
+A StreamPerfMonitor watches an input stream and optionally the output stream of the same block (any object with valid
+and ready handles, like cocotblib.Stream.Stream), and measures on every clock cycle :
+- utilization : the fraction of cycles with a transaction (valid and ready), and the stall (valid without ready) and
+  idle cycles of each stream
+- the stall cycles of each transaction, from its first valid cycle to its handshake
+- the latency of each transaction from its input handshake to its output handshake. Transactions are matched in order,
+  or by the id returned by idOf(stream) when the block may reorder them.
+
+All distributions are kept as Log2Histogram (one bucket per power of two), so the memory stays constant however long
+the test runs. The monitor dumps <MODULE>.<test>.<name>.streamperf.json into SPINAL_METRICS_DIR (the current directory
+by default) and logs a summary when the test ends.
+
+Usage :
+    StreamPerfMonitor("fifoA", Stream(dut, "fifoAPush"), Stream(dut, "fifoAPop"), dut.clk, dut.reset)
+    StreamPerfMonitor("ar", axi.ar, None, dispatcher, idOf=lambda s: int(s.payload.hid))
+
+The clock may also be a ClockDispatcher, the monitor then is one of its steps instead of a coroutine.
+"""
+
+import atexit
+import json
+import logging
+import os
+from collections import deque
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+from spinal.common.Metrics import currentTestName
+
+BUCKETS = 64
+
+
+class Log2Histogram:
+    """Bucket i holds the values v with v.bit_length() == i : 0, 1, 2-3, 4-7, ..."""
+    __slots__ = ["buckets", "count", "total", "min", "max"]
+
+    def __init__(self):
+        self.buckets = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.buckets[min(value.bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of the values."""
+        threshold = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= threshold:
+                return min((1 << index) - 1, self.max)
+        return 0
+
+    def summary(self):
+        return {
+            "count" : self.count,
+            "mean" : round(self.mean(), 3),
+            "min" : self.min,
+            "max" : self.max,
+            "p50" : self.percentile(0.5),
+            "p99" : self.percentile(0.99),
+            "buckets" : {"%d-%d" % ((1 << index) >> 1, (1 << index) - 1) : count for index, count in enumerate(self.buckets) if count}
+        }
+
+
+class StreamActivity:
+    """Handshake statistics of one stream."""
+    def __init__(self, stream):
+        self.valid = stream.valid
+        self.ready = stream.ready
+        self.fires = 0
+        self.stalls = 0
+        self.waiting = 0
+        self.transactionStalls = Log2Histogram()
+
+    def sample(self):
+        """Return True when the stream does a transaction this cycle."""
+        try:
+            valid = int(self.valid)
+            ready = int(self.ready) if valid else 0
+        except ValueError:
+            # Undefined handshake signals
+            return False
+        if not valid:
+            return False
+        if not ready:
+            self.stalls += 1
+            self.waiting += 1
+            return False
+        self.fires += 1
+        self.transactionStalls.add(self.waiting)
+        self.waiting = 0
+        return True
+
+    def summary(self, cycles):
+        return {
+            "transactions" : self.fires,
+            "utilization" : round(self.fires / cycles, 4) if cycles else 0.0,
+            "stallCycles" : self.stalls,
+            "idleCycles" : cycles - self.fires - self.stalls,
+            "stallsPerTransaction" : self.transactionStalls.summary()
+        }
+
+
+class StreamPerfMonitor:
+    def __init__(self, name, input, output, clk, reset = None, idOf = None, path = None):
+        self.name = name
+        self.input = StreamActivity(input)
+        self.output = StreamActivity(output) if output is not None else None
+        self.inputStream = input
+        self.outputStream = output
+        self.reset = reset
+        self.idOf = idOf
+        self.path = path or os.getenv("SPINAL_METRICS_DIR", ".")
+        self.module = os.getenv("MODULE", "cocotb").split(",")[-1]
+        self.testName = currentTestName()
+        self.cycles = 0
+        self.pending = {}
+        self.latency = Log2Histogram()
+        self.unmatched = 0
+        self.dumpedCycles = 0
+        atexit.register(self.dump)
+        if hasattr(clk, "onRisingEdge"):
+            clk.onRisingEdge(self.step)
+        else:
+            cocotb.fork(self.run(clk))
+
+    @cocotb.coroutine
+    def run(self, clk):
+        try:
+            while True:
+                yield RisingEdge(clk)
+                self.step()
+        finally:
+            self.dump()
+
+    def inReset(self):
+        try:
+            return self.reset is not None and int(self.reset) == 1
+        except ValueError:
+            return True
+
+    def step(self):
+        if self.inReset():
+            self.pending.clear()
+            return
+        self.cycles += 1
+        if self.input.sample() and self.output is not None:
+            key = self.idOf(self.inputStream) if self.idOf else None
+            queue = self.pending.get(key)
+            if queue is None:
+                queue = self.pending[key] = deque()
+            queue.append(self.cycles)
+        if self.output is not None and self.output.sample():
+            key = self.idOf(self.outputStream) if self.idOf else None
+            queue = self.pending.get(key)
+            if queue:
+                # The output of a combinatorial path fires in the same cycle as its input
+                self.latency.add(self.cycles - queue.popleft())
+            else:
+                self.unmatched += 1
+
+    def summary(self):
+        summary = {
+            "name" : self.name,
+            "module" : self.module,
+            "test" : self.testName,
+            "cycles" : self.cycles,
+            "input" : self.input.summary(self.cycles)
+        }
+        if self.output is not None:
+            summary["output"] = self.output.summary(self.cycles)
+            summary["latency"] = self.latency.summary()
+            summary["inFlight"] = sum(len(queue) for queue in self.pending.values())
+            summary["unmatchedOutputs"] = self.unmatched
+        return summary
+
+    def dump(self):
+        # Called at the end of the coroutine and at exit
+        if self.cycles == self.dumpedCycles:
+            return
+        self.dumpedCycles = self.cycles
+        summary = self.summary()
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, "%s.%s.%s.streamperf.json" % (self.module, self.testName, self.name)), "w") as f:
+            json.dump(summary, f, indent=2)
+        line = "%s : %d cycles, input utilization %.3f, %d stalls" % (self.name, self.cycles, summary["input"]["utilization"], self.input.stalls)
+        if self.output is not None:
+            line += ", output utilization %.3f, latency mean %.1f p99 %d max %s" % (
+                summary["output"]["utilization"], self.latency.mean(), self.latency.percentile(0.99), self.latency.max)
+        # The logger behind cocotb.log, which is also usable at exit once the simulation is gone
+        logging.getLogger("cocotb").info(line)
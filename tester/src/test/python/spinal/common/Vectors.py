@@ -0,0 +1,164 @@
+"""
+Vectorized stimulus and reference checking for the combinational testers.
+
+All the input vectors of a test are generated up front with NumPy, and the expected outputs are computed as whole
+arrays with the same expressions the scalar references used (masked add/sub/mul/shift/compare at the output width).
+The vectors are then streamed through the DUT, one settle delay per vector, only collecting the raw output values, and
+everything is checked in bulk at the end. The first mismatching vector is reported with its inputs.
+
+Values are carried as raw unsigned int64 arrays, signed(values, width) gives their two's complement interpretation.
+Outputs wider than 62 bits are carried as python integers.
+
+Narrow input spaces can be covered exhaustively with a Sweep, which enumerates the cartesian product of its axes in
+chunks, each chunk being run and checked as one VectorTest, and reports the failing chunk.
+
+Usage :
+    test = VectorTest(dut, randomInputs(vectorRng(), dut, ["a", "b"], 2000))
+    a = test.inputs["a"]
+    test.expect("aPlusB", 8, a + test.inputs["b"])
+    yield test.run()
+    test.verify()
+
+    yield sweepVectors(dut, Sweep([("a", 4), ("b", 8)]), lambda axes: {"a" : axes["a"], "b" : axes["b"]}, expectations)
+"""
+
+import random
+
+import numpy as np
+
+import cocotb
+from cocotb.result import TestFailure
+from cocotb.triggers import Timer
+
+
+MAX_INT_WIDTH = 62
+
+
+def vectorRng():
+    """NumPy generator derived from the python one, so the vectors follow RANDOM_SEED."""
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def randomBits(rng, width, count):
+    if width == 0:
+        return np.zeros(count, dtype=np.int64)
+    assert width <= MAX_INT_WIDTH
+    return rng.integers(0, 1 << width, size=count, dtype=np.int64)
+
+
+def randomInputs(rng, dut, names, count):
+    return {name : randomBits(rng, len(getattr(dut, name)), count) for name in names}
+
+
+def notZero(values):
+    return np.where(values == 0, 1, values)
+
+
+def signed(values, width):
+    sign = 1 << (width - 1)
+    return (values ^ sign) - sign
+
+
+def truncate(values, width):
+    if width > MAX_INT_WIDTH:
+        return np.asarray(values).astype(object) & ((1 << width) - 1)
+    return np.asarray(values, dtype=np.int64) & ((1 << width) - 1)
+
+
+class Expectation:
+    def __init__(self, name, width, values, valid):
+        self.name = name
+        self.width = width
+        self.values = values
+        self.valid = valid
+
+
+class VectorTest:
+    def __init__(self, dut, inputs, settle = 1000):
+        self.dut = dut
+        self.inputs = inputs
+        self.count = len(next(iter(inputs.values())))
+        self.settle = settle
+        self.expectations = []
+        self.outputs = {}
+
+    def expect(self, name, width, values, valid = None):
+        """Expect output name to be values truncated to width bits, or exactly values when width is None.
+
+        The width is also checked against the signal. valid is an optional boolean array of the vectors to check.
+        """
+        if width is not None:
+            if len(getattr(self.dut, name)) != width:
+                raise TestFailure("FAIL %s is %d bits instead of %d" % (name, len(getattr(self.dut, name)), width))
+            values = truncate(values, width)
+        values = np.broadcast_to(np.asarray(values, dtype=object if width and width > MAX_INT_WIDTH else np.int64), (self.count,))
+        self.expectations.append(Expectation(name, width, values, None if valid is None else np.broadcast_to(valid, (self.count,))))
+
+    @cocotb.coroutine
+    def run(self):
+        inputs = [(getattr(self.dut, name), values.tolist()) for name, values in self.inputs.items()]
+        names = sorted(set(e.name for e in self.expectations))
+        handles = [getattr(self.dut, name) for name in names]
+        columns = [[0] * self.count for name in names]
+        for i in range(self.count):
+            for handle, values in inputs:
+                handle <= values[i]
+            yield Timer(self.settle)
+            for column, handle in zip(columns, handles):
+                column[i] = int(handle)
+        for name, column in zip(names, columns):
+            self.outputs[name] = np.array(column, dtype=object if len(getattr(self.dut, name)) > MAX_INT_WIDTH else np.int64)
+
+    def mismatches(self, expectation):
+        wrong = np.asarray(self.outputs[expectation.name] != expectation.values, dtype=bool)
+        if expectation.valid is not None:
+            wrong &= expectation.valid
+        return wrong
+
+    def verify(self):
+        for expectation in self.expectations:
+            wrong = self.mismatches(expectation)
+            if wrong.any():
+                i = int(np.argmax(wrong))
+                raise TestFailure("FAIL %s vector %d/%d : %d != %d with %s" % (
+                    expectation.name, i, self.count, self.outputs[expectation.name][i], expectation.values[i], self.vectorInputs(i)))
+
+    def vectorInputs(self, i):
+        return ", ".join("%s=%d" % (name, values[i]) for name, values in self.inputs.items())
+
+
+class Sweep:
+    """Cartesian product of (name, width) axes, the first axis varying the fastest."""
+    def __init__(self, axes, chunkSize = 4096):
+        self.axes = axes
+        self.chunkSize = chunkSize
+        self.count = 1 << sum(width for _, width in axes)
+
+    def chunkCount(self):
+        return (self.count + self.chunkSize - 1) // self.chunkSize
+
+    def chunk(self, index):
+        """Values of every axis for the vectors of the chunk."""
+        indexes = np.arange(index * self.chunkSize, min((index + 1) * self.chunkSize, self.count), dtype=np.int64)
+        values = {}
+        shift = 0
+        for name, width in self.axes:
+            values[name] = (indexes >> shift) & ((1 << width) - 1)
+            shift += width
+        return values
+
+
+@cocotb.coroutine
+def sweepVectors(dut, sweep, makeInputs, expectations, settle = 1000):
+    """Run the whole sweep, makeInputs maps the axes values of a chunk to the DUT inputs, expectations(test) fills
+    the expected outputs of a chunk."""
+    for index in range(sweep.chunkCount()):
+        test = VectorTest(dut, makeInputs(sweep.chunk(index)), settle)
+        expectations(test)
+        yield test.run()
+        try:
+            test.verify()
+        except TestFailure as e:
+            start = index * sweep.chunkSize
+            raise TestFailure("Sweep chunk %d/%d (vectors %d to %d of %d) : %s" % (
+                index, sweep.chunkCount(), start, start + test.count - 1, sweep.count, e))